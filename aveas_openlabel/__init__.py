@@ -35,6 +35,9 @@ Writing a populated OpenLABEL dataclass structure to a JSON file is similarly si
 >>> with open("path/to/file.json", "w") as f:
 ...     json.dump(content, f)
 
+Large recordings can be written frame by frame without building the whole document in memory,
+see `aveas_openlabel.serialization.writer.StreamingWriter`.
+
 Obtaining a JSON schema file
 ----------------------------
 
@@ -151,7 +154,7 @@ Dynamic Attributes
     `Lights__HighBeam`                              **—**            **O**             **O**         **O**         **—**                     **O**                    **O**                **O**                 **—**                      **O**                 **O**             **O**           **O**
     `OpenDrive__RoadId`                             **O**            **O**             **O**         **O**         **O**                     **O**                    **O**                **O**                 **O**                      **O**                 **O**             **O**           **O**
     `OpenDrive__LaneId`                             **O**            **O**             **O**         **O**         **O**                     **O**                    **O**                **O**                 **O**                      **O**                 **O**             **O**           **O**
-    `OpenDrive__LanePosition`                       **O**            **O**             **O**         **O**         **O**                     **O**                    **O**                **O**                 **O**                      **O**                 **O**             **O**           **O**    
+    `OpenDrive__LanePosition`                       **O**            **O**             **O**         **O**         **O**                     **O**                    **O**                **O**                 **O**                      **O**                 **O**             **O**           **O**
     `OpenDrive__LocalRoadCoordinates`               **M**            **M**             **M**         **M**         **M**                     **M**                    **M**                **M**                 **M**                      **M**                 **M**             **M**           **M**
     `OpenDrive__LocalRoadCoordinates__UStdDev`      **O**            **O**             **O**         **O**         **O**                     **O**                    **O**                **O**                 **O**                      **O**                 **O**             **O**           **O**
     `Traffic__Density`                              **—**            **O**             **O**         **O**         **—**                     **O**                    **O**                **O**                 **—**                      **O**                 **—**             **O**           **O**
@@ -197,10 +200,20 @@ Dynamic Attributes
 # LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+from typing import TYPE_CHECKING
+
+from aveas_openlabel.lazy_imports import lazy_imports
 
-# noinspection PyProtectedMember
-from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+if TYPE_CHECKING:
+    # noinspection PyProtectedMember
+    from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+
+_LAZY_IMPORTS = {
+    "AveasOpenLabel": "aveas_openlabel.aveas_openlabel",
+}
 
 __all__ = [
     "AveasOpenLabel",
 ]
+
+__getattr__, __dir__ = lazy_imports(__name__, _LAZY_IMPORTS)
@@ -1,6 +1,4 @@
-"""A subclass of Attributes that allows for specifying optional and required attributes
-
-"""
+"""A subclass of Attributes that allows for specifying optional and required attributes"""
 
 # Copyright © 2024 understandAI GmbH
 #
@@ -17,8 +15,16 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 
+from contextlib import AbstractContextManager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Callable, Iterable, Optional
+
+VALIDATION_PHASE: ContextVar[Optional[Callable[[], AbstractContextManager[None]]]] = ContextVar(
+    "validation_phase", default=None
+)
+"""Opens the ``validate`` phase of the active `aveas_openlabel.serialization.profiling.Profiler`, if any,
+around the checks of every `EachAttributeOnlyOnceEnforcer`."""
 
 
 class AttributeTypesNotUniqueError(Exception):
@@ -45,6 +51,14 @@ class EachAttributeOnlyOnceEnforcer:
         return attribute_type_list
 
     def __post_init__(self) -> None:
+        validation_phase = VALIDATION_PHASE.get()
+        if validation_phase is None:
+            self._check_attribute_types()
+            return
+        with validation_phase():
+            self._check_attribute_types()
+
+    def _check_attribute_types(self) -> None:
         attribute_type_list = self._attribute_type_list()
         attribute_type_set = set(attribute_type_list)
 
@@ -13,3 +13,339 @@
 # MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
 # LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import TYPE_CHECKING
+
+from aveas_openlabel.lazy_imports import lazy_imports
+
+if TYPE_CHECKING:
+    from aveas_openlabel.attributes.dimension import (
+        Dimensions__CenterOfGravity,
+        Dimensions__CenterOfGravity__UStdDev,
+        Dimensions__Size,
+        Dimensions__Size__UStdDev,
+    )
+    from aveas_openlabel.attributes.general import (
+        Acceleration,
+        Acceleration__UStdDev,
+        AttachedTo,
+        BestDetectedPoint,
+        BestDetectedSide,
+        BestDetectedSideValue,
+        BoundingBox,
+        BoundingBox__UStdDev,
+        Classification__Uncertainties,
+        IsRecorder,
+        Velocity,
+        Velocity__UStdDev,
+    )
+    from aveas_openlabel.attributes.hmi_feedback import (
+        HmiFeedback__Acoustic,
+        HmiFeedback__Other,
+        HmiFeedback__Visual,
+    )
+    from aveas_openlabel.attributes.impact import (
+        Impact__Frame,
+        Impact__gTTC__ObjectIds,
+        Impact__gTTC__Values,
+        Impact__Point,
+        Impact__Point__UStdDev,
+        Impact__PrET__ObjectIds,
+        Impact__PrET__Values,
+        Impact__THW__ObjectIds,
+        Impact__THW__Values,
+        Impact__Velocity,
+        Impact__Velocity__UStdDev,
+    )
+    from aveas_openlabel.attributes.interior import (
+        Interior__AcceleratorPedal,
+        Interior__AutomatedControl__Lateral,
+        Interior__AutomatedControl__Longitudinal,
+        Interior__BrakePedal,
+        Interior__Gear,
+        Interior__HasRider,
+        Interior__SteeringAngle,
+        Interior__SteeringAngle__UStdDev,
+        Interior__Wiper,
+    )
+    from aveas_openlabel.attributes.lights import (
+        Lights__Brake,
+        Lights__Daytime,
+        Lights__Front,
+        Lights__HighBeam,
+        Lights__Indicator__Left,
+        Lights__Indicator__Right,
+    )
+    from aveas_openlabel.attributes.open_drive import (
+        OpenDrive__LaneId,
+        OpenDrive__LanePosition,
+        OpenDrive__LocalRoadCoordinates,
+        OpenDrive__LocalRoadCoordinates__UStdDev,
+        OpenDrive__RoadId,
+    )
+    from aveas_openlabel.attributes.operator import (
+        Operator__Age,
+        Operator__BodyHeight,
+        Operator__FocussedObject,
+        Operator__FocussedObject__Id,
+        Operator__FocussedObject__Uncertainties,
+        Operator__FocussedObjectValue,
+        Operator__FocussedPoint,
+        Operator__FocussedPoint__UStdDev,
+        Operator__Gender,
+        Operator__GenderValue,
+        Operator__HandInteractionArea,
+        Operator__HandInteractionAreaValue,
+        Operator__HeadRotation,
+        Operator__HeadRotation__UStdDev,
+        Operator__Personality,
+        Operator__Pupil,
+        Operator__Pupil__UStdDev,
+        Operator__SixDoFRotationAndAcceleration,
+        Operator__ViewingAngle,
+    )
+    from aveas_openlabel.attributes.road import (
+        Road__Classification,
+        Road__ClassificationValue,
+        Road__NumberLanes__Left__Legal,
+        Road__NumberLanes__Left__Physical,
+        Road__NumberLanes__Right__Legal,
+        Road__NumberLanes__Right__Physical,
+        Road__SpeedLimit,
+    )
+    from aveas_openlabel.attributes.summary import (
+        Summary__Accel__Max,
+        Summary__Accel__Max__UStdDev,
+        Summary__Accel__Min,
+        Summary__Accel__Min__UStdDev,
+        Summary__Coordinates__ScenarioEnd,
+        Summary__Coordinates__ScenarioEnd__UStdDev,
+        Summary__Coordinates__ScenarioStart,
+        Summary__Coordinates__ScenarioStart__UStdDev,
+        Summary__Speed__Max,
+        Summary__Speed__Max__UStdDev,
+        Summary__Speed__Min,
+        Summary__Speed__Min__UStdDev,
+        Summary__SteeringAngle__Max,
+        Summary__SteeringAngle__Max__UStdDev,
+        Summary__SteeringAngle__Min,
+        Summary__SteeringAngle__Min__UStdDev,
+        Summary__SteeringWheelAngle__Max,
+        Summary__SteeringWheelAngle__Max__UStdDev,
+        Summary__SteeringWheelAngle__Min,
+        Summary__SteeringWheelAngle__Min__UStdDev,
+    )
+    from aveas_openlabel.attributes.traffic import (
+        Traffic__Density,
+        Traffic__Density__UStdDev,
+        Traffic__Volume,
+        Traffic__Volume__UStdDev,
+    )
+
+_LAZY_IMPORTS = {
+    "Dimensions__CenterOfGravity": "aveas_openlabel.attributes.dimension",
+    "Dimensions__CenterOfGravity__UStdDev": "aveas_openlabel.attributes.dimension",
+    "Dimensions__Size": "aveas_openlabel.attributes.dimension",
+    "Dimensions__Size__UStdDev": "aveas_openlabel.attributes.dimension",
+    "Acceleration": "aveas_openlabel.attributes.general",
+    "Acceleration__UStdDev": "aveas_openlabel.attributes.general",
+    "AttachedTo": "aveas_openlabel.attributes.general",
+    "BestDetectedPoint": "aveas_openlabel.attributes.general",
+    "BestDetectedSide": "aveas_openlabel.attributes.general",
+    "BestDetectedSideValue": "aveas_openlabel.attributes.general",
+    "BoundingBox": "aveas_openlabel.attributes.general",
+    "BoundingBox__UStdDev": "aveas_openlabel.attributes.general",
+    "Classification__Uncertainties": "aveas_openlabel.attributes.general",
+    "IsRecorder": "aveas_openlabel.attributes.general",
+    "Velocity": "aveas_openlabel.attributes.general",
+    "Velocity__UStdDev": "aveas_openlabel.attributes.general",
+    "HmiFeedback__Acoustic": "aveas_openlabel.attributes.hmi_feedback",
+    "HmiFeedback__Other": "aveas_openlabel.attributes.hmi_feedback",
+    "HmiFeedback__Visual": "aveas_openlabel.attributes.hmi_feedback",
+    "Impact__Frame": "aveas_openlabel.attributes.impact",
+    "Impact__gTTC__ObjectIds": "aveas_openlabel.attributes.impact",
+    "Impact__gTTC__Values": "aveas_openlabel.attributes.impact",
+    "Impact__Point": "aveas_openlabel.attributes.impact",
+    "Impact__Point__UStdDev": "aveas_openlabel.attributes.impact",
+    "Impact__PrET__ObjectIds": "aveas_openlabel.attributes.impact",
+    "Impact__PrET__Values": "aveas_openlabel.attributes.impact",
+    "Impact__THW__ObjectIds": "aveas_openlabel.attributes.impact",
+    "Impact__THW__Values": "aveas_openlabel.attributes.impact",
+    "Impact__Velocity": "aveas_openlabel.attributes.impact",
+    "Impact__Velocity__UStdDev": "aveas_openlabel.attributes.impact",
+    "Interior__AcceleratorPedal": "aveas_openlabel.attributes.interior",
+    "Interior__AutomatedControl__Lateral": "aveas_openlabel.attributes.interior",
+    "Interior__AutomatedControl__Longitudinal": "aveas_openlabel.attributes.interior",
+    "Interior__BrakePedal": "aveas_openlabel.attributes.interior",
+    "Interior__Gear": "aveas_openlabel.attributes.interior",
+    "Interior__HasRider": "aveas_openlabel.attributes.interior",
+    "Interior__SteeringAngle": "aveas_openlabel.attributes.interior",
+    "Interior__SteeringAngle__UStdDev": "aveas_openlabel.attributes.interior",
+    "Interior__Wiper": "aveas_openlabel.attributes.interior",
+    "Lights__Brake": "aveas_openlabel.attributes.lights",
+    "Lights__Daytime": "aveas_openlabel.attributes.lights",
+    "Lights__Front": "aveas_openlabel.attributes.lights",
+    "Lights__HighBeam": "aveas_openlabel.attributes.lights",
+    "Lights__Indicator__Left": "aveas_openlabel.attributes.lights",
+    "Lights__Indicator__Right": "aveas_openlabel.attributes.lights",
+    "OpenDrive__LaneId": "aveas_openlabel.attributes.open_drive",
+    "OpenDrive__LanePosition": "aveas_openlabel.attributes.open_drive",
+    "OpenDrive__LocalRoadCoordinates": "aveas_openlabel.attributes.open_drive",
+    "OpenDrive__LocalRoadCoordinates__UStdDev": "aveas_openlabel.attributes.open_drive",
+    "OpenDrive__RoadId": "aveas_openlabel.attributes.open_drive",
+    "Operator__Age": "aveas_openlabel.attributes.operator",
+    "Operator__BodyHeight": "aveas_openlabel.attributes.operator",
+    "Operator__FocussedObject": "aveas_openlabel.attributes.operator",
+    "Operator__FocussedObject__Id": "aveas_openlabel.attributes.operator",
+    "Operator__FocussedObject__Uncertainties": "aveas_openlabel.attributes.operator",
+    "Operator__FocussedObjectValue": "aveas_openlabel.attributes.operator",
+    "Operator__FocussedPoint": "aveas_openlabel.attributes.operator",
+    "Operator__FocussedPoint__UStdDev": "aveas_openlabel.attributes.operator",
+    "Operator__Gender": "aveas_openlabel.attributes.operator",
+    "Operator__GenderValue": "aveas_openlabel.attributes.operator",
+    "Operator__HandInteractionArea": "aveas_openlabel.attributes.operator",
+    "Operator__HandInteractionAreaValue": "aveas_openlabel.attributes.operator",
+    "Operator__HeadRotation": "aveas_openlabel.attributes.operator",
+    "Operator__HeadRotation__UStdDev": "aveas_openlabel.attributes.operator",
+    "Operator__Personality": "aveas_openlabel.attributes.operator",
+    "Operator__Pupil": "aveas_openlabel.attributes.operator",
+    "Operator__Pupil__UStdDev": "aveas_openlabel.attributes.operator",
+    "Operator__SixDoFRotationAndAcceleration": "aveas_openlabel.attributes.operator",
+    "Operator__ViewingAngle": "aveas_openlabel.attributes.operator",
+    "Road__Classification": "aveas_openlabel.attributes.road",
+    "Road__ClassificationValue": "aveas_openlabel.attributes.road",
+    "Road__NumberLanes__Left__Legal": "aveas_openlabel.attributes.road",
+    "Road__NumberLanes__Left__Physical": "aveas_openlabel.attributes.road",
+    "Road__NumberLanes__Right__Legal": "aveas_openlabel.attributes.road",
+    "Road__NumberLanes__Right__Physical": "aveas_openlabel.attributes.road",
+    "Road__SpeedLimit": "aveas_openlabel.attributes.road",
+    "Summary__Accel__Max": "aveas_openlabel.attributes.summary",
+    "Summary__Accel__Max__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__Accel__Min": "aveas_openlabel.attributes.summary",
+    "Summary__Accel__Min__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__Coordinates__ScenarioEnd": "aveas_openlabel.attributes.summary",
+    "Summary__Coordinates__ScenarioEnd__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__Coordinates__ScenarioStart": "aveas_openlabel.attributes.summary",
+    "Summary__Coordinates__ScenarioStart__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__Speed__Max": "aveas_openlabel.attributes.summary",
+    "Summary__Speed__Max__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__Speed__Min": "aveas_openlabel.attributes.summary",
+    "Summary__Speed__Min__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringAngle__Max": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringAngle__Max__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringAngle__Min": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringAngle__Min__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringWheelAngle__Max": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringWheelAngle__Max__UStdDev": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringWheelAngle__Min": "aveas_openlabel.attributes.summary",
+    "Summary__SteeringWheelAngle__Min__UStdDev": "aveas_openlabel.attributes.summary",
+    "Traffic__Density": "aveas_openlabel.attributes.traffic",
+    "Traffic__Density__UStdDev": "aveas_openlabel.attributes.traffic",
+    "Traffic__Volume": "aveas_openlabel.attributes.traffic",
+    "Traffic__Volume__UStdDev": "aveas_openlabel.attributes.traffic",
+}
+
+__all__ = [
+    "Acceleration",
+    "Acceleration__UStdDev",
+    "AttachedTo",
+    "BestDetectedPoint",
+    "BestDetectedSide",
+    "BestDetectedSideValue",
+    "BoundingBox",
+    "BoundingBox__UStdDev",
+    "Classification__Uncertainties",
+    "Dimensions__CenterOfGravity",
+    "Dimensions__CenterOfGravity__UStdDev",
+    "Dimensions__Size",
+    "Dimensions__Size__UStdDev",
+    "HmiFeedback__Acoustic",
+    "HmiFeedback__Other",
+    "HmiFeedback__Visual",
+    "Impact__Frame",
+    "Impact__Point",
+    "Impact__Point__UStdDev",
+    "Impact__PrET__ObjectIds",
+    "Impact__PrET__Values",
+    "Impact__THW__ObjectIds",
+    "Impact__THW__Values",
+    "Impact__Velocity",
+    "Impact__Velocity__UStdDev",
+    "Impact__gTTC__ObjectIds",
+    "Impact__gTTC__Values",
+    "Interior__AcceleratorPedal",
+    "Interior__AutomatedControl__Lateral",
+    "Interior__AutomatedControl__Longitudinal",
+    "Interior__BrakePedal",
+    "Interior__Gear",
+    "Interior__HasRider",
+    "Interior__SteeringAngle",
+    "Interior__SteeringAngle__UStdDev",
+    "Interior__Wiper",
+    "IsRecorder",
+    "Lights__Brake",
+    "Lights__Daytime",
+    "Lights__Front",
+    "Lights__HighBeam",
+    "Lights__Indicator__Left",
+    "Lights__Indicator__Right",
+    "OpenDrive__LaneId",
+    "OpenDrive__LanePosition",
+    "OpenDrive__LocalRoadCoordinates",
+    "OpenDrive__LocalRoadCoordinates__UStdDev",
+    "OpenDrive__RoadId",
+    "Operator__Age",
+    "Operator__BodyHeight",
+    "Operator__FocussedObject",
+    "Operator__FocussedObjectValue",
+    "Operator__FocussedObject__Id",
+    "Operator__FocussedObject__Uncertainties",
+    "Operator__FocussedPoint",
+    "Operator__FocussedPoint__UStdDev",
+    "Operator__Gender",
+    "Operator__GenderValue",
+    "Operator__HandInteractionArea",
+    "Operator__HandInteractionAreaValue",
+    "Operator__HeadRotation",
+    "Operator__HeadRotation__UStdDev",
+    "Operator__Personality",
+    "Operator__Pupil",
+    "Operator__Pupil__UStdDev",
+    "Operator__SixDoFRotationAndAcceleration",
+    "Operator__ViewingAngle",
+    "Road__Classification",
+    "Road__ClassificationValue",
+    "Road__NumberLanes__Left__Legal",
+    "Road__NumberLanes__Left__Physical",
+    "Road__NumberLanes__Right__Legal",
+    "Road__NumberLanes__Right__Physical",
+    "Road__SpeedLimit",
+    "Summary__Accel__Max",
+    "Summary__Accel__Max__UStdDev",
+    "Summary__Accel__Min",
+    "Summary__Accel__Min__UStdDev",
+    "Summary__Coordinates__ScenarioEnd",
+    "Summary__Coordinates__ScenarioEnd__UStdDev",
+    "Summary__Coordinates__ScenarioStart",
+    "Summary__Coordinates__ScenarioStart__UStdDev",
+    "Summary__Speed__Max",
+    "Summary__Speed__Max__UStdDev",
+    "Summary__Speed__Min",
+    "Summary__Speed__Min__UStdDev",
+    "Summary__SteeringAngle__Max",
+    "Summary__SteeringAngle__Max__UStdDev",
+    "Summary__SteeringAngle__Min",
+    "Summary__SteeringAngle__Min__UStdDev",
+    "Summary__SteeringWheelAngle__Max",
+    "Summary__SteeringWheelAngle__Max__UStdDev",
+    "Summary__SteeringWheelAngle__Min",
+    "Summary__SteeringWheelAngle__Min__UStdDev",
+    "Traffic__Density",
+    "Traffic__Density__UStdDev",
+    "Traffic__Volume",
+    "Traffic__Volume__UStdDev",
+    "Velocity",
+    "Velocity__UStdDev",
+]
+
+__getattr__, __dir__ = lazy_imports(__name__, _LAZY_IMPORTS)
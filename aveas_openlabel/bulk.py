@@ -0,0 +1,256 @@
+"""Construction of the frames of a recording from arrays of attribute values
+
+Producers that hold their tracking results as arrays, e.g. one array of bounding boxes of shape
+``(frames, objects, 9)``, can build all frames at once with a `FrameBuilder` instead of creating the
+attribute, object data, object and frame dataclasses one by one:
+
+>>> from aveas_openlabel.attributes.general import BoundingBox, Velocity
+>>> from aveas_openlabel.bulk import FrameBuilder
+>>> from aveas_openlabel.classifications.car import Car
+>>> from aveas_openlabel.classifications.human_pedestrian import HumanPedestrian
+>>> builder = FrameBuilder(
+...     object_uids=[1, 2],
+...     classifications=[Car, HumanPedestrian],
+...     attributes={BoundingBox: boxes, Velocity: velocities},  # shapes (frames, 2, 9) and (frames, 2, 6)
+...     timestamps=timestamps,  # shape (frames,)
+...     present=present,  # shape (frames, 2), whether an object appears in a frame
+... )
+>>> openlabel = builder.build(header)  # or builder.write("path/to/file.json.zst", header)
+
+Arrays can be NumPy arrays or nested sequences. They are converted to lists once, and every frame is assembled
+in its serialized form from templates of the serialized attributes, like `aveas_openlabel.synthetic` does,
+so that `FrameBuilder.write` never creates any dataclasses and `FrameBuilder.build` deserializes each frame once.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+import typing
+from dataclasses import fields
+from typing import Any, Iterator, Mapping, Optional, Sequence, Union
+
+import apischema
+from uai_openlabel import Object, ObjectInFrame, ObjectUid, Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.classifications.registry import (
+    CLASSIFICATIONS,
+    UnknownClassificationError,
+    attribute_classes,
+)
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization.compression import Compression, open_text
+from aveas_openlabel.serialization.sections import (
+    deserialize_frame,
+    frame_intervals_from_uids,
+)
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+_SERIALIZATION_OPTIONS: dict[str, Any] = {"aliaser": apischema.utils.to_snake_case, "additional_properties": True}
+_CLASSIFICATIONS_BY_TYPE = {next(f.default for f in fields(c) if f.name == "type"): c for c in CLASSIFICATIONS}
+
+
+class FrameBuilder:
+    """Builds the frames of a recording from arrays of attribute values, see the module documentation.
+
+    :param object_uids: The uid of each object.
+    :param classifications: The classification of each object, as a class like ``Car`` or a type like ``"vehicle/car"``,
+        see `aveas_openlabel.classifications.registry.CLASSIFICATIONS`. The dynamic attributes of each classification have to
+        include all ``attributes``.
+    :param attributes: The values of attribute classes, e.g. of ``BoundingBox``, indexed by frame and object.
+        The value of an attribute of an object that does not have it in a frame is None.
+        The number of values of vectors is checked for every attribute. `build` and `frames` validate every value
+        with its dataclass, `serialized_frames` and `write` only validate the first value of each attribute class,
+        unless they are called with ``validate=True``.
+    :param frame_uids: The uid of each frame, by default the frame number starting at 0.
+    :param timestamps: The timestamp of each frame in (s), if any.
+    :param present: Whether each object appears in each frame, indexed by frame and object. By default,
+        all objects appear in all frames.
+    :param exclude_none: Whether attributes and sections that are None are left out of the serialized frames.
+    """
+
+    def __init__(
+        self,
+        object_uids: Sequence[Union[str, int]],
+        classifications: Sequence[Union[type[Object], str]],
+        attributes: Mapping[type, Any],
+        *,
+        frame_uids: Optional[Sequence[Union[str, int]]] = None,
+        timestamps: Optional[Any] = None,
+        present: Optional[Any] = None,
+        exclude_none: bool = False,
+    ):
+        if len(object_uids) != len(classifications):
+            raise ValueError(f"{len(object_uids)} object uids but {len(classifications)} classifications were given.")
+        self.object_uids = [ObjectUid(str(uid)) for uid in object_uids]
+        """The uid of each object."""
+        self.exclude_none = exclude_none
+        """Whether attributes and sections that are None are left out of the serialized frames."""
+
+        self._values = [_tolist(values) for values in attributes.values()]
+        self._timestamps = None if timestamps is None else _tolist(timestamps)
+        self._present = None if present is None else _tolist(present)
+        per_frame = {
+            **{attribute_class.__name__: values for attribute_class, values in zip(attributes, self._values)},
+            "timestamps": self._timestamps,
+            "present": self._present,
+        }
+        if frame_uids is None:
+            frame_uids = range(next((len(values) for values in per_frame.values() if values is not None), 0))
+        self.frame_uids = [Uid(str(uid)) for uid in frame_uids]
+        """The uid of each frame."""
+        for name, values in per_frame.items():
+            if values is not None and len(values) != len(self.frame_uids):
+                raise ValueError(f"{name} has {len(values)} frames, expected {len(self.frame_uids)}.")
+
+        in_frame_classes = [CLASSIFICATIONS[_classification(c)] for c in classifications]
+        self._attribute_classes = list(attributes)
+        self._fields: list[str] = []
+        self._templates: list[dict[str, Any]] = []
+        self._lengths: list[Optional[int]] = []
+        for attribute_class, values in zip(attributes, self._values):
+            field_names = set()
+            for in_frame_class in set(in_frame_classes):
+                field_name = dict((c, f) for f, c in attribute_classes(in_frame_class)).get(attribute_class)
+                if field_name is None:
+                    raise ValueError(f"{in_frame_class.__name__} cannot hold {attribute_class.__name__} attributes.")
+                field_names.add(field_name)
+            (field_name,) = field_names
+            sample = next((v for frame in values for v in frame if v is not None), None)
+            if sample is None:
+                raise ValueError(f"{attribute_class.__name__} has no values.")
+            self._fields.append(field_name)
+            self._templates.append(
+                apischema.serialize(
+                    attribute_class, attribute_class(val=sample), exclude_none=exclude_none, **_SERIALIZATION_OPTIONS
+                )
+            )
+            self._lengths.append(_length(attribute_class))
+
+        in_frame = apischema.deserialize(ObjectInFrame, {"object_data": {}}, **_SERIALIZATION_OPTIONS)
+        self._object_template = apischema.serialize(
+            ObjectInFrame, in_frame, exclude_none=exclude_none, **_SERIALIZATION_OPTIONS
+        )
+        self._frame_template = apischema.serialize(Frame, Frame(), exclude_none=exclude_none, **_SERIALIZATION_OPTIONS)
+
+    @property
+    def number_of_frames(self) -> int:
+        """The number of frames."""
+        return len(self.frame_uids)
+
+    def serialized_frames(self, *, validate: bool = False) -> Iterator[tuple[Uid, dict[str, Any]]]:
+        """Generates the frames in their serialized form, as ``AveasOpenLabel.to_dict`` would write them.
+
+        :param validate: Whether every value is validated by the dataclass of its attribute class, which is much slower.
+            Otherwise, only the first value of each attribute class is.
+        """
+        object_data_template = self._object_template["object_data"]
+        attributes = list(zip(self._fields, self._templates, self._lengths, self._attribute_classes))
+        for frame_number, frame_uid in enumerate(self.frame_uids):
+            present = None if self._present is None else self._present[frame_number]
+            frame_values = [values[frame_number] for values in self._values]
+            for template, values in zip(self._templates, frame_values):
+                if len(values) != len(self.object_uids):
+                    raise ValueError(f"{template['name']} has {len(values)} objects in frame {frame_uid}.")
+
+            objects = {}
+            for object_number, object_uid in enumerate(self.object_uids):
+                if present is not None and not present[object_number]:
+                    continue
+                object_data = dict(object_data_template)
+                for (field_name, template, length, attribute_class), values in zip(attributes, frame_values):
+                    value = values[object_number]
+                    if value is None:
+                        continue
+                    if length is not None and len(value) != length:
+                        raise ValueError(
+                            f"{template['name']} of object {object_uid} in frame {frame_uid} has {len(value)} values."
+                        )
+                    if validate:
+                        attribute_class(val=value)
+                    serialized_attribute = {**template, "val": value}
+                    field_attributes = object_data.get(field_name)
+                    if field_attributes is None:
+                        object_data[field_name] = [serialized_attribute]
+                    else:
+                        field_attributes.append(serialized_attribute)
+                objects[object_uid] = {**self._object_template, "object_data": object_data}
+
+            frame = dict(self._frame_template)
+            if self._timestamps is not None:
+                timestamp = self._timestamps[frame_number]
+                frame["frame_properties"] = (
+                    {"timestamp": timestamp}
+                    if self.exclude_none
+                    else {"timestamp": timestamp, "streams": None, "transforms": None}
+                )
+            frame["objects"] = objects
+            yield frame_uid, frame
+
+    def frames(self) -> Iterator[tuple[Uid, Frame]]:
+        """Generates the frames as `Frame` dataclasses."""
+        for frame_uid, serialized_frame in self.serialized_frames():
+            yield frame_uid, deserialize_frame(serialized_frame)
+
+    def build(self, header: AveasOpenLabel) -> AveasOpenLabel:
+        """Sets the frames and frame intervals of ``header``, e.g. of a document with the static objects, and returns it."""
+        header.frames = dict(self.frames())
+        header.frame_intervals = frame_intervals_from_uids(header.frames)
+        return header
+
+    def write(
+        self,
+        path: Union[str, os.PathLike],
+        header: AveasOpenLabel,
+        *,
+        compression: Optional[Compression] = None,
+        level: Optional[int] = None,
+        validate: bool = False,
+    ) -> None:
+        """Writes ``header`` with the frames to a possibly compressed file, one frame at a time.
+
+        :param validate: Whether every value is validated, see `serialized_frames`.
+        """
+        with (
+            open_text(path, "w", compression=compression, level=level) as f,
+            StreamingWriter(f, header, exclude_none=self.exclude_none, compute_frame_intervals=True) as writer,
+        ):
+            for frame_uid, serialized_frame in self.serialized_frames(validate=validate):
+                writer.write_serialized_frame(frame_uid, serialized_frame)
+
+
+def _classification(classification: Union[type[Object], str]) -> type[Object]:
+    if isinstance(classification, str):
+        try:
+            return _CLASSIFICATIONS_BY_TYPE[classification]
+        except KeyError:
+            raise ValueError(f"{classification!r} is not the type of any of {list(_CLASSIFICATIONS_BY_TYPE)}.") from None
+    if classification not in CLASSIFICATIONS:
+        raise UnknownClassificationError(classification)
+    return classification
+
+
+def _length(attribute_class: type) -> Optional[int]:
+    """The number of values of an attribute with a tuple of fixed length as its value, otherwise None."""
+    hint = typing.get_type_hints(attribute_class)["val"]
+    arguments = typing.get_args(hint)
+    if typing.get_origin(hint) is tuple and Ellipsis not in arguments:
+        return len(arguments)
+    return None
+
+
+def _tolist(values: Any) -> Any:
+    """Converts a NumPy array to nested lists of Python values, which is much faster than indexing it element-wise."""
+    return values.tolist() if hasattr(values, "shape") and hasattr(values, "tolist") else values
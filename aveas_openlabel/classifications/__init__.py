@@ -13,3 +13,100 @@
 # MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
 # LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import TYPE_CHECKING
+
+from aveas_openlabel.lazy_imports import lazy_imports
+
+if TYPE_CHECKING:
+    from aveas_openlabel.classifications.animal import Animal, AnimalInFrame
+    from aveas_openlabel.classifications.bicycle import Bicycle, BicycleInFrame
+    from aveas_openlabel.classifications.bus import Bus, BusInFrame
+    from aveas_openlabel.classifications.car import Car, CarInFrame
+    from aveas_openlabel.classifications.human_pedestrian import (
+        HumanPedestrian,
+        HumanPedestrianInFrame,
+    )
+    from aveas_openlabel.classifications.mobility_device import (
+        MobilityDevice,
+        MobilityDeviceInFrame,
+    )
+    from aveas_openlabel.classifications.motorcycle import Motorcycle, MotorcycleInFrame
+    from aveas_openlabel.classifications.other_classification import (
+        OtherObject,
+        OtherObjectInFrame,
+    )
+    from aveas_openlabel.classifications.pushable_pullable import (
+        PushablePullable,
+        PushablePullableInFrame,
+    )
+    from aveas_openlabel.classifications.railvehicle import (
+        RailVehicle,
+        RailVehicleInFrame,
+    )
+    from aveas_openlabel.classifications.registry import UnknownClassificationError
+    from aveas_openlabel.classifications.trailer import Trailer, TrailerInFrame
+    from aveas_openlabel.classifications.truck import Truck, TruckInFrame
+    from aveas_openlabel.classifications.van import Van, VanInFrame
+
+_LAZY_IMPORTS = {
+    "Animal": "aveas_openlabel.classifications.animal",
+    "AnimalInFrame": "aveas_openlabel.classifications.animal",
+    "Bicycle": "aveas_openlabel.classifications.bicycle",
+    "BicycleInFrame": "aveas_openlabel.classifications.bicycle",
+    "Bus": "aveas_openlabel.classifications.bus",
+    "BusInFrame": "aveas_openlabel.classifications.bus",
+    "Car": "aveas_openlabel.classifications.car",
+    "CarInFrame": "aveas_openlabel.classifications.car",
+    "HumanPedestrian": "aveas_openlabel.classifications.human_pedestrian",
+    "HumanPedestrianInFrame": "aveas_openlabel.classifications.human_pedestrian",
+    "MobilityDevice": "aveas_openlabel.classifications.mobility_device",
+    "MobilityDeviceInFrame": "aveas_openlabel.classifications.mobility_device",
+    "Motorcycle": "aveas_openlabel.classifications.motorcycle",
+    "MotorcycleInFrame": "aveas_openlabel.classifications.motorcycle",
+    "OtherObject": "aveas_openlabel.classifications.other_classification",
+    "OtherObjectInFrame": "aveas_openlabel.classifications.other_classification",
+    "PushablePullable": "aveas_openlabel.classifications.pushable_pullable",
+    "PushablePullableInFrame": "aveas_openlabel.classifications.pushable_pullable",
+    "RailVehicle": "aveas_openlabel.classifications.railvehicle",
+    "RailVehicleInFrame": "aveas_openlabel.classifications.railvehicle",
+    "UnknownClassificationError": "aveas_openlabel.classifications.registry",
+    "Trailer": "aveas_openlabel.classifications.trailer",
+    "TrailerInFrame": "aveas_openlabel.classifications.trailer",
+    "Truck": "aveas_openlabel.classifications.truck",
+    "TruckInFrame": "aveas_openlabel.classifications.truck",
+    "Van": "aveas_openlabel.classifications.van",
+    "VanInFrame": "aveas_openlabel.classifications.van",
+}
+
+__all__ = [
+    "Animal",
+    "AnimalInFrame",
+    "Bicycle",
+    "BicycleInFrame",
+    "Bus",
+    "BusInFrame",
+    "Car",
+    "CarInFrame",
+    "HumanPedestrian",
+    "HumanPedestrianInFrame",
+    "MobilityDevice",
+    "MobilityDeviceInFrame",
+    "Motorcycle",
+    "MotorcycleInFrame",
+    "OtherObject",
+    "OtherObjectInFrame",
+    "PushablePullable",
+    "PushablePullableInFrame",
+    "RailVehicle",
+    "RailVehicleInFrame",
+    "Trailer",
+    "TrailerInFrame",
+    "Truck",
+    "TruckInFrame",
+    "UnknownClassificationError",
+    "Van",
+    "VanInFrame",
+]
+
+__getattr__, __dir__ = lazy_imports(__name__, _LAZY_IMPORTS)
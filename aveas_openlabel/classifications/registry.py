@@ -0,0 +1,94 @@
+"""The classifications of objects and the attributes that they can hold
+
+`CLASSIFICATIONS` maps the static class of every classification to the class of its dynamic attributes,
+and `attribute_classes` lists the attribute classes that either of them can hold:
+
+>>> from aveas_openlabel.classifications.car import Car
+>>> from aveas_openlabel.classifications.registry import CLASSIFICATIONS, attribute_classes
+>>> CLASSIFICATIONS[Car]
+<class 'aveas_openlabel.classifications.car.CarInFrame'>
+>>> dict(attribute_classes(CLASSIFICATIONS[Car]))["cuboid"]
+<class 'aveas_openlabel.attributes.general.BoundingBox'>
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import typing
+from typing import Iterator, Union
+
+from uai_openlabel import Object, ObjectInFrame
+
+from aveas_openlabel.classifications import (
+    animal,
+    bicycle,
+    bus,
+    car,
+    human_pedestrian,
+    mobility_device,
+    motorcycle,
+    other_classification,
+    pushable_pullable,
+    railvehicle,
+    trailer,
+    truck,
+    van,
+)
+
+CLASSIFICATIONS: dict[type[Object], type[ObjectInFrame]] = {
+    animal.Animal: animal.AnimalInFrame,
+    bicycle.Bicycle: bicycle.BicycleInFrame,
+    bus.Bus: bus.BusInFrame,
+    car.Car: car.CarInFrame,
+    human_pedestrian.HumanPedestrian: human_pedestrian.HumanPedestrianInFrame,
+    mobility_device.MobilityDevice: mobility_device.MobilityDeviceInFrame,
+    motorcycle.Motorcycle: motorcycle.MotorcycleInFrame,
+    other_classification.OtherObject: other_classification.OtherObjectInFrame,
+    pushable_pullable.PushablePullable: pushable_pullable.PushablePullableInFrame,
+    railvehicle.RailVehicle: railvehicle.RailVehicleInFrame,
+    trailer.Trailer: trailer.TrailerInFrame,
+    truck.Truck: truck.TruckInFrame,
+    van.Van: van.VanInFrame,
+}
+"""The static classes of all classifications and the classes of their dynamic attributes."""
+
+
+class UnknownClassificationError(KeyError):
+    """Exception that is raised when a class that is not in `CLASSIFICATIONS` is requested."""
+
+    def __init__(self, classification: type):
+        super().__init__(f"{classification.__name__} is not one of {[c.__name__ for c in CLASSIFICATIONS]}.")
+
+
+def _object_data_class(cls: type) -> type:
+    object_data_class: type = typing.get_type_hints(cls)["object_data"]
+    return object_data_class
+
+
+def attribute_classes(classification: type) -> Iterator[tuple[str, type]]:
+    """All AVEAS attribute classes that a static or dynamic classification class can hold, with the field that holds them.
+
+    For example, ``attribute_classes(Car)`` yields ``("boolean", IsRecorder)`` and ``attribute_classes(CarInFrame)``
+    yields ``("cuboid", BoundingBox)``.
+    """
+    for field_name, hint in typing.get_type_hints(_object_data_class(classification)).items():
+        if field_name not in ("boolean", "cuboid", "num", "text", "vec"):
+            continue
+        while typing.get_origin(hint) is Union and type(None) in typing.get_args(hint):
+            hint = next(a for a in typing.get_args(hint) if a is not type(None))
+        (element,) = typing.get_args(hint)
+        members = typing.get_args(element) if typing.get_origin(element) is Union else (element,)
+        for member in members:
+            if member.__module__.startswith("aveas_openlabel.attributes"):
+                yield field_name, member
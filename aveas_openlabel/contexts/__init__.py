@@ -1,5 +1,4 @@
-"""The Context objects defined in the AVEAS OpenLABEL format
-"""
+"""The Context objects defined in the AVEAS OpenLABEL format"""
 
 # Copyright © 2024 understandAI GmbH
 #
@@ -14,3 +13,163 @@
 # MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
 # LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import TYPE_CHECKING
+
+from aveas_openlabel.lazy_imports import lazy_imports
+
+if TYPE_CHECKING:
+    from aveas_openlabel.contexts.environment_context import (
+        EnvironmentContext,
+        EnvironmentContextData,
+    )
+    from aveas_openlabel.contexts.environment_context_data import (
+        Environment__CloudCover,
+        Environment__CloudCover__URadius,
+        Environment__LightingConditions,
+        Environment__LightingConditions__Uncertainties,
+        Environment__LightingConditionsValue,
+        Environment__PrecipitationIntensity,
+        Environment__PrecipitationIntensity__UStdDev,
+        Environment__RoadCondition,
+        Environment__RoadCondition__Uncertainties,
+        Environment__RoadConditionValue,
+        Environment__Temperature,
+        Environment__Temperature__UStdDev,
+        Environment__VisibilityRange,
+        Environment__VisibilityRange__UStdDev,
+        Environment__Wind__BeaufortForce,
+        Environment__Wind__BeaufortForce__URadius,
+        Environment__Wind__Heading,
+        Environment__Wind__Heading__UStdDev,
+    )
+    from aveas_openlabel.contexts.scenario_context import (
+        ScenarioContext,
+        ScenarioContextData,
+    )
+    from aveas_openlabel.contexts.scenario_context_data import (
+        Scenario__ContainsHighway,
+        Scenario__ContainsRural,
+        Scenario__ContainsUrban,
+        Scenario__Course,
+        Scenario__End__Coordinates,
+        Scenario__End__Location,
+        Scenario__IsBiased,
+        Scenario__IsSampled,
+        Scenario__IsSampled__ReferenceToSourceScenario,
+        Scenario__IsStaged,
+        Scenario__MaximumVehicleSpeed,
+        Scenario__MaximumVehicleSpeed__Frame,
+        Scenario__MaximumVehicleSpeed__UStdDev,
+        Scenario__MinimumVehicleDistanceS,
+        Scenario__MinimumVehicleDistanceS__Frame,
+        Scenario__MinimumVehicleDistanceS__UStdDev,
+        Scenario__MinimumVehicleSpeed,
+        Scenario__MinimumVehicleSpeed__Frame,
+        Scenario__MinimumVehicleSpeed__UStdDev,
+        Scenario__RatioAverageSpeedToSpeedLimit,
+        Scenario__RatioAverageSpeedToSpeedLimit__UStdDev,
+        Scenario__Start__Coordinates,
+        Scenario__Start__Location,
+        Scenario__WeekdayNumber,
+    )
+
+_LAZY_IMPORTS = {
+    "EnvironmentContext": "aveas_openlabel.contexts.environment_context",
+    "EnvironmentContextData": "aveas_openlabel.contexts.environment_context",
+    "Environment__CloudCover": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__CloudCover__URadius": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__LightingConditions": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__LightingConditions__Uncertainties": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__LightingConditionsValue": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__PrecipitationIntensity": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__PrecipitationIntensity__UStdDev": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__RoadCondition": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__RoadCondition__Uncertainties": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__RoadConditionValue": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__Temperature": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__Temperature__UStdDev": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__VisibilityRange": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__VisibilityRange__UStdDev": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__Wind__BeaufortForce": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__Wind__BeaufortForce__URadius": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__Wind__Heading": "aveas_openlabel.contexts.environment_context_data",
+    "Environment__Wind__Heading__UStdDev": "aveas_openlabel.contexts.environment_context_data",
+    "ScenarioContext": "aveas_openlabel.contexts.scenario_context",
+    "ScenarioContextData": "aveas_openlabel.contexts.scenario_context",
+    "Scenario__ContainsHighway": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__ContainsRural": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__ContainsUrban": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__Course": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__End__Coordinates": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__End__Location": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__IsBiased": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__IsSampled": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__IsSampled__ReferenceToSourceScenario": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__IsStaged": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MaximumVehicleSpeed": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MaximumVehicleSpeed__Frame": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MaximumVehicleSpeed__UStdDev": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MinimumVehicleDistanceS": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MinimumVehicleDistanceS__Frame": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MinimumVehicleDistanceS__UStdDev": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MinimumVehicleSpeed": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MinimumVehicleSpeed__Frame": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__MinimumVehicleSpeed__UStdDev": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__RatioAverageSpeedToSpeedLimit": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__RatioAverageSpeedToSpeedLimit__UStdDev": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__Start__Coordinates": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__Start__Location": "aveas_openlabel.contexts.scenario_context_data",
+    "Scenario__WeekdayNumber": "aveas_openlabel.contexts.scenario_context_data",
+}
+
+__all__ = [
+    "EnvironmentContext",
+    "EnvironmentContextData",
+    "Environment__CloudCover",
+    "Environment__CloudCover__URadius",
+    "Environment__LightingConditions",
+    "Environment__LightingConditionsValue",
+    "Environment__LightingConditions__Uncertainties",
+    "Environment__PrecipitationIntensity",
+    "Environment__PrecipitationIntensity__UStdDev",
+    "Environment__RoadCondition",
+    "Environment__RoadConditionValue",
+    "Environment__RoadCondition__Uncertainties",
+    "Environment__Temperature",
+    "Environment__Temperature__UStdDev",
+    "Environment__VisibilityRange",
+    "Environment__VisibilityRange__UStdDev",
+    "Environment__Wind__BeaufortForce",
+    "Environment__Wind__BeaufortForce__URadius",
+    "Environment__Wind__Heading",
+    "Environment__Wind__Heading__UStdDev",
+    "ScenarioContext",
+    "ScenarioContextData",
+    "Scenario__ContainsHighway",
+    "Scenario__ContainsRural",
+    "Scenario__ContainsUrban",
+    "Scenario__Course",
+    "Scenario__End__Coordinates",
+    "Scenario__End__Location",
+    "Scenario__IsBiased",
+    "Scenario__IsSampled",
+    "Scenario__IsSampled__ReferenceToSourceScenario",
+    "Scenario__IsStaged",
+    "Scenario__MaximumVehicleSpeed",
+    "Scenario__MaximumVehicleSpeed__Frame",
+    "Scenario__MaximumVehicleSpeed__UStdDev",
+    "Scenario__MinimumVehicleDistanceS",
+    "Scenario__MinimumVehicleDistanceS__Frame",
+    "Scenario__MinimumVehicleDistanceS__UStdDev",
+    "Scenario__MinimumVehicleSpeed",
+    "Scenario__MinimumVehicleSpeed__Frame",
+    "Scenario__MinimumVehicleSpeed__UStdDev",
+    "Scenario__RatioAverageSpeedToSpeedLimit",
+    "Scenario__RatioAverageSpeedToSpeedLimit__UStdDev",
+    "Scenario__Start__Coordinates",
+    "Scenario__Start__Location",
+    "Scenario__WeekdayNumber",
+]
+
+__getattr__, __dir__ = lazy_imports(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,310 @@
+"""Reduction of the frame rate of recordings
+
+A `Downsampler` turns the frames of a recording into one frame per window of ``factor`` consecutive frames,
+in a single pass over the frames, e.g. to derive a 1 Hz overview from a 25 Hz recording:
+
+>>> from aveas_openlabel.downsampling import Downsampler, downsample
+>>> overview = downsample(openlabel, 25)  # keeps every 25th frame
+>>> smoothed = downsample(openlabel, 25, aggregate=True)  # averages the attributes of every 25 frames
+
+By default, the first frame of every window is kept as it is. With ``aggregate``, the attributes of each object
+are combined over all frames of the window in which the object appears: continuous numbers and vectors, i.e. those
+whose values are declared as floats, are averaged, booleans are combined with ``any`` or take their last value,
+see ``booleans``, and all other attributes take their last value. These include bounding boxes and texts,
+numbers declared as integers, e.g. lane counts and gears, and the attributes in `LAST_VALUE_ATTRIBUTES`,
+whose special values, e.g. 0 for no speed limit, must not be averaged. Attributes are matched by field and name,
+e.g. ``num`` and ``"velocity"``. The frame properties, e.g. the timestamp, are those of the first frame of the window.
+
+The downsampled frames are numbered from 0, one after the other, so that the frame intervals stay contiguous.
+The ``frame_intervals`` of the document and of its objects describe the downsampled frames, and each event spans
+the windows of all of its frames, so that events that are shorter than a window are kept.
+
+Frames can also be downsampled while they are streamed, e.g. from
+`aveas_openlabel.serialization.sharding.ShardedScenario.iter_frames`, and written one at a time:
+
+>>> downsampler = Downsampler(25, aggregate=True)
+>>> downsampler.write("path/to/overview.json.zst", scenario.header, scenario.iter_frames())
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+from dataclasses import replace
+from functools import lru_cache
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Union,
+    get_args,
+    get_type_hints,
+)
+
+from uai_openlabel import (
+    BooleanData,
+    NumberData,
+    ObjectInFrame,
+    ObjectUid,
+    Uid,
+    VectorData,
+)
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization.compression import Compression, open_text
+from aveas_openlabel.serialization.sections import frame_intervals_from_uids
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+BooleanAggregation = Literal["any", "last"]
+"""How boolean attributes are combined over a window: true if any value is true, or the last value."""
+
+LAST_VALUE_ATTRIBUTES: frozenset[str] = frozenset(
+    {"road/speed_limit", "impact/gttc/values", "impact/pret/values", "impact/thw/values"}
+)
+"""The names of attributes with float values that take their last value instead of being averaged, because some
+of their values have a special meaning, e.g. 0 for no speed limit, or belong to the object uids of another attribute."""
+
+
+class Downsampler:
+    """Downsamples the frames of one recording in a single pass, see the module documentation.
+
+    `frames` yields the downsampled frames and records which window each original frame belongs to and in which
+    windows each object appears. `update_header` then rewrites the frame intervals of a document accordingly.
+    A downsampler is meant for one pass over the frames of one recording.
+
+    :param factor: The number of consecutive frames of a window, in the order in which they are passed to `frames`.
+    :param aggregate: Whether the attributes of each window are combined instead of keeping its first frame.
+    :param booleans: How boolean attributes are combined if ``aggregate`` is set.
+    """
+
+    def __init__(self, factor: int, *, aggregate: bool = False, booleans: BooleanAggregation = "any"):
+        if factor < 1:
+            raise ValueError(f"The factor has to be at least 1, not {factor}.")
+        if booleans not in ("any", "last"):
+            raise ValueError(f"Booleans are combined with 'any' or 'last', not {booleans!r}.")
+        self.factor = factor
+        """The number of consecutive frames of a window."""
+        self.aggregate = aggregate
+        """Whether the attributes of each window are combined instead of keeping its first frame."""
+        self.booleans = booleans
+        """How boolean attributes are combined if `aggregate` is set."""
+
+        self._windows: dict[int, int] = {}
+        self._appearances: dict[str, list[int]] = {}
+        self._frame_count = 0
+
+    @property
+    def window_count(self) -> int:
+        """The number of windows of the frames passed to `frames` so far, i.e. of downsampled frames after a complete pass."""
+        return -(-self._frame_count // self.factor)
+
+    def frames(self, frames: Iterable[tuple[Union[Uid, int, str], Frame]]) -> Iterator[tuple[Uid, Frame]]:
+        """Yields one frame per window of the ``(frame_uid, frame)`` pairs, e.g. of ``openlabel.frames.items()``.
+
+        Frames that are kept are yielded as they are, aggregated frames are new frames that share the attributes
+        that did not change with the original frames.
+        """
+        window: list[Frame] = []
+        for frame_uid, frame in frames:
+            window_number = self._frame_count // self.factor
+            if str(frame_uid).lstrip("-").isdigit():
+                self._windows[int(frame_uid)] = window_number
+            self._frame_count += 1
+            window.append(frame)
+            if len(window) == self.factor:
+                yield self._emit(window_number, window)
+                window = []
+        if window:
+            yield self._emit((self._frame_count - 1) // self.factor, window)
+
+    def update_header(self, header: AveasOpenLabel) -> AveasOpenLabel:
+        """Rewrites the frame intervals of the document, its objects and its events after a pass in place and returns it.
+
+        Objects and events are replaced by copies, so that documents that share them are not changed.
+        Events without any frame of the pass are removed, events without frame intervals are kept as they are.
+        """
+        header.frame_intervals = frame_intervals_from_uids(range(self.window_count))
+        if header.objects is not None:
+            header.objects = {
+                uid: (
+                    obj
+                    if obj.frame_intervals is None
+                    else replace(obj, frame_intervals=frame_intervals_from_uids(self._appearances.get(uid, ())))
+                )
+                for uid, obj in header.objects.items()
+            }
+        if header.events is not None:
+            events = {}
+            for uid, event in header.events.items():
+                if event.frame_intervals is None:
+                    events[uid] = event
+                    continue
+                windows = {
+                    self._windows[frame_number]
+                    for interval in event.frame_intervals
+                    for frame_number in range(int(interval.frame_start), int(interval.frame_end) + 1)
+                    if frame_number in self._windows
+                }
+                if windows:
+                    events[uid] = replace(event, frame_intervals=frame_intervals_from_uids(windows))
+            header.events = events
+        return header
+
+    def write(
+        self,
+        path: Union[str, os.PathLike],
+        header: AveasOpenLabel,
+        frames: Iterable[tuple[Union[Uid, int, str], Frame]],
+        *,
+        compression: Optional[Compression] = None,
+        level: Optional[int] = None,
+        exclude_none: bool = False,
+        exclude_defaults: bool = False,
+    ) -> None:
+        """Writes ``header`` with the downsampled ``frames`` to a possibly compressed file, one frame at a time.
+
+        ``header`` itself is not changed. Its objects and events are written last, after their frame intervals
+        have been rewritten.
+        """
+        output = replace(header, frames=None, frame_intervals=None)
+        with (
+            open_text(path, "w", compression=compression, level=level) as f,
+            StreamingWriter(
+                f,
+                output,
+                deferred_sections=("objects", "events"),
+                exclude_none=exclude_none,
+                exclude_defaults=exclude_defaults,
+            ) as writer,
+        ):
+            writer.write_frames(self.frames(frames))
+            self.update_header(output)
+
+    def _emit(self, window_number: int, window: list[Frame]) -> tuple[Uid, Frame]:
+        frame = _aggregate_frames(window, self.booleans) if self.aggregate and len(window) > 1 else window[0]
+        for object_uid in frame.objects or ():
+            self._appearances.setdefault(object_uid, []).append(window_number)
+        return Uid(str(window_number)), frame
+
+
+def downsample(
+    openlabel: AveasOpenLabel, factor: int, *, aggregate: bool = False, booleans: BooleanAggregation = "any"
+) -> AveasOpenLabel:
+    """A document with one frame per window of ``factor`` frames of ``openlabel``, see the module documentation.
+
+    ``openlabel`` is not changed, but the result shares all parts that are not downsampled with it.
+    """
+    downsampler = Downsampler(factor, aggregate=aggregate, booleans=booleans)
+    result = replace(openlabel, frames=None)
+    if openlabel.frames is None:
+        return result
+    frames = dict(downsampler.frames(openlabel.frames.items()))
+    downsampler.update_header(result)
+    result.frames = frames
+    return result
+
+
+def _aggregate_frames(window: list[Frame], booleans: BooleanAggregation) -> Frame:
+    """A frame with the frame properties of the first frame and the combined objects of all frames of a window."""
+    objects: dict[ObjectUid, list[ObjectInFrame]] = {}
+    for frame in window:
+        for object_uid, object_in_frame in (frame.objects or {}).items():
+            objects.setdefault(object_uid, []).append(object_in_frame)
+    if all(frame.objects is None for frame in window):
+        return window[0]
+    return replace(
+        window[0],
+        objects={object_uid: _aggregate_objects(in_frames, booleans) for object_uid, in_frames in objects.items()},
+    )
+
+
+def _aggregate_objects(in_frames: list[ObjectInFrame], booleans: BooleanAggregation) -> ObjectInFrame:
+    """The last object in frame of a window, with the attributes of all of them combined."""
+    last = in_frames[-1]
+    if len(in_frames) == 1:
+        return last
+    fields: dict[str, dict[tuple[Optional[str], int], list[Any]]] = {}
+    for object_in_frame in in_frames:
+        for field_name, attributes in object_in_frame.object_data.__dict__.items():
+            if not isinstance(attributes, list):
+                continue
+            by_name = fields.setdefault(field_name, {})
+            for position, attribute in enumerate(attributes):
+                # attributes without a name can only be matched by their position
+                key = (attribute.name, 0) if attribute.name is not None else (None, position)
+                by_name.setdefault(key, []).append(attribute)
+    object_data = replace(
+        last.object_data,
+        **{
+            field_name: [_aggregate_attributes(attributes, booleans) for attributes in by_name.values()]
+            for field_name, by_name in fields.items()
+        },
+    )
+    return replace(last, object_data=object_data)
+
+
+def _aggregate_attributes(attributes: list[Any], booleans: BooleanAggregation) -> Any:
+    """The last of the attributes of one name, with the combined value of all of them."""
+    last = attributes[-1]
+    if len(attributes) == 1:
+        return last
+    values = [attribute.val for attribute in attributes]
+    if isinstance(last, BooleanData):
+        return replace(last, val=any(values)) if booleans == "any" else last
+    if not isinstance(last, (NumberData, VectorData)) or last.name in LAST_VALUE_ATTRIBUTES:
+        return last
+    declared_floats = _declared_floats(last.__class__)
+    if declared_floats is False:
+        return last
+    # values that may be integers or floats are only averaged if all of them are floats
+    is_averaged = _is_number if declared_floats else _is_float
+    if isinstance(last, NumberData):
+        if not all(is_averaged(value) for value in values):
+            return last
+        return replace(last, val=sum(values) / len(values))
+    width = len(last.val)
+    if not all(len(value) == width and all(is_averaged(v) for v in value) for value in values):
+        return last
+    means = [sum(column) / len(values) for column in zip(*values)]
+    return replace(last, val=means if isinstance(last.val, list) else tuple(means))
+
+
+@lru_cache(maxsize=None)
+def _declared_floats(attribute_class: type) -> Optional[bool]:
+    """Whether the ``val`` of an attribute class is declared as floats, or None if it may be integers or floats,
+    e.g. for ``uai_openlabel.NumberData`` itself.
+    """
+    leaf_types: set[Any] = set()
+    pending = [get_type_hints(attribute_class)["val"]]
+    while pending:
+        annotation = pending.pop()
+        arguments = get_args(annotation)
+        if arguments:
+            pending.extend(argument for argument in arguments if argument is not Ellipsis)
+        else:
+            leaf_types.add(annotation)
+    if leaf_types == {float}:
+        return True
+    return None if float in leaf_types else False
+
+
+def _is_number(value: Any) -> bool:
+    return value.__class__ is float or value.__class__ is int
+
+
+def _is_float(value: Any) -> bool:
+    return value.__class__ is float
@@ -0,0 +1,74 @@
+"""Lazy imports of the classes of a package from its submodules
+
+Importing all attributes, classifications, contexts and object data defines hundreds of dataclasses, which takes
+a noticeable share of the start-up time of short-lived tools. Their packages therefore export their classes lazily:
+``from aveas_openlabel.classifications import Car`` only imports ``aveas_openlabel.classifications.car`` and the
+modules that it depends on, when ``Car`` is accessed for the first time.
+
+A package declares its exports as imports inside an ``if TYPE_CHECKING:`` block, which type checkers and
+documentation tools see as regular imports, maps the same names to their modules, and installs the module
+``__getattr__`` and ``__dir__`` of `lazy_imports`, which import them on first access:
+
+.. code-block:: python
+
+    from typing import TYPE_CHECKING
+
+    from aveas_openlabel.lazy_imports import lazy_imports
+
+    if TYPE_CHECKING:
+        from aveas_openlabel.classifications.car import Car
+
+    _LAZY_IMPORTS = {
+        "Car": "aveas_openlabel.classifications.car",
+    }
+
+    __all__ = ["Car"]
+
+    __getattr__, __dir__ = lazy_imports(__name__, _LAZY_IMPORTS)
+
+The mapping and the ``TYPE_CHECKING`` imports must list the same names, which the tests check for every package.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import importlib
+import sys
+from typing import Any, Callable, Mapping
+
+
+def lazy_imports(package: str, exports: Mapping[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """The module ``__getattr__`` and ``__dir__`` of a package that imports its exported names on first access.
+
+    Imported names are stored in the package, so that later accesses do not call ``__getattr__`` again.
+
+    :param package: The ``__name__`` of the package.
+    :param exports: The module of each exported name, e.g. ``{"Car": "aveas_openlabel.classifications.car"}``.
+    """
+
+    def module_getattr(name: str) -> Any:
+        if name.startswith("__"):  # e.g. __path__ or __wrapped__ lookups by importlib and inspect
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        try:
+            module_name = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(module_name), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def module_dir() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | exports.keys())
+
+    return module_getattr, module_dir
@@ -13,3 +13,41 @@
 # MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
 # LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import TYPE_CHECKING
+
+from aveas_openlabel.lazy_imports import lazy_imports
+
+if TYPE_CHECKING:
+    from aveas_openlabel.object_data.all import ObjectData__All
+    from aveas_openlabel.object_data.unattached import ObjectData__Unattached
+    from aveas_openlabel.object_data.unsteerable import ObjectData__Unsteerable
+    from aveas_openlabel.object_data.unsteerable_non_operator import (
+        ObjectData__Unsteerable_NonOperator,
+    )
+    from aveas_openlabel.object_data.unsteerable_unattached import (
+        ObjectData__Unsteerable_Unattached,
+    )
+    from aveas_openlabel.object_data.unsteerable_unattached_non_operator import (
+        ObjectData__Unsteerable_Unattached_NonOperator,
+    )
+
+_LAZY_IMPORTS = {
+    "ObjectData__All": "aveas_openlabel.object_data.all",
+    "ObjectData__Unattached": "aveas_openlabel.object_data.unattached",
+    "ObjectData__Unsteerable": "aveas_openlabel.object_data.unsteerable",
+    "ObjectData__Unsteerable_NonOperator": "aveas_openlabel.object_data.unsteerable_non_operator",
+    "ObjectData__Unsteerable_Unattached": "aveas_openlabel.object_data.unsteerable_unattached",
+    "ObjectData__Unsteerable_Unattached_NonOperator": "aveas_openlabel.object_data.unsteerable_unattached_non_operator",
+}
+
+__all__ = [
+    "ObjectData__All",
+    "ObjectData__Unattached",
+    "ObjectData__Unsteerable",
+    "ObjectData__Unsteerable_NonOperator",
+    "ObjectData__Unsteerable_Unattached",
+    "ObjectData__Unsteerable_Unattached_NonOperator",
+]
+
+__getattr__, __dir__ = lazy_imports(__name__, _LAZY_IMPORTS)
@@ -13,3 +13,43 @@
 # MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
 # LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import TYPE_CHECKING
+
+from aveas_openlabel.lazy_imports import lazy_imports
+
+if TYPE_CHECKING:
+    from aveas_openlabel.object_in_frame_data.all import ObjectInFrameData__All
+    from aveas_openlabel.object_in_frame_data.no_rider import ObjectInFrameData__NoRider
+    from aveas_openlabel.object_in_frame_data.non_vehicle import (
+        ObjectInFrameData__NonVehicle,
+    )
+    from aveas_openlabel.object_in_frame_data.non_vehicle_non_operator import (
+        ObjectInFrameData__NonVehicle_NonOperator,
+    )
+    from aveas_openlabel.object_in_frame_data.passive_vehicle_non_operator import (
+        ObjectInFrameData__PassiveVehicle_NonOperator,
+    )
+    from aveas_openlabel.object_in_frame_data.unsteerable import (
+        ObjectInFrameData__Unsteerable,
+    )
+
+_LAZY_IMPORTS = {
+    "ObjectInFrameData__All": "aveas_openlabel.object_in_frame_data.all",
+    "ObjectInFrameData__NoRider": "aveas_openlabel.object_in_frame_data.no_rider",
+    "ObjectInFrameData__NonVehicle": "aveas_openlabel.object_in_frame_data.non_vehicle",
+    "ObjectInFrameData__NonVehicle_NonOperator": "aveas_openlabel.object_in_frame_data.non_vehicle_non_operator",
+    "ObjectInFrameData__PassiveVehicle_NonOperator": "aveas_openlabel.object_in_frame_data.passive_vehicle_non_operator",
+    "ObjectInFrameData__Unsteerable": "aveas_openlabel.object_in_frame_data.unsteerable",
+}
+
+__all__ = [
+    "ObjectInFrameData__All",
+    "ObjectInFrameData__NoRider",
+    "ObjectInFrameData__NonVehicle",
+    "ObjectInFrameData__NonVehicle_NonOperator",
+    "ObjectInFrameData__PassiveVehicle_NonOperator",
+    "ObjectInFrameData__Unsteerable",
+]
+
+__getattr__, __dir__ = lazy_imports(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,205 @@
+"""A binary MessagePack encoding of AVEAS OpenLABEL files
+
+Parsing JSON text and formatting floats takes up a large share of the time spent loading and saving OpenLABEL files.
+`dump_binary` and `load_binary` store the same structure as ``AveasOpenLabel.to_dict`` as MessagePack instead.
+Lists of floats, such as the values of `aveas_openlabel.attributes.general.BoundingBox` or
+`aveas_openlabel.attributes.general.Classification__Uncertainties`, are stored as packed arrays of 64 bit floats.
+
+The encoding is lossless, `json_to_binary` and `binary_to_json` convert between both formats
+without changing the content of the document.
+Binary files can additionally be compressed, see `aveas_openlabel.serialization.compression`.
+This module requires the optional ``msgpack`` package.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import os
+import sys
+from array import array
+from typing import IO, Any, Optional, Union
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.compression import (
+    Compression,
+    MissingCodecError,
+    open_binary,
+    open_text,
+)
+from aveas_openlabel.serialization.delta import expand_delta_frames
+from aveas_openlabel.serialization.interning import StringPool
+from aveas_openlabel.serialization.sections import (
+    ROOT_KEY,
+    SECTIONS,
+    deserialize_document,
+    serialize_frame,
+    serialize_section,
+    unwrap_root,
+)
+
+FLOAT64_ARRAY_EXT_CODE = 1
+"""The MessagePack extension type code of packed little-endian float64 arrays."""
+
+MIN_PACKED_ARRAY_LENGTH = 2
+"""Lists of floats shorter than this are stored as regular MessagePack arrays."""
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack  # type: ignore[import-not-found, import-untyped, unused-ignore]
+    except ImportError as e:
+        raise MissingCodecError(
+            "The binary encoding requires the msgpack package, install it with 'pip install msgpack'."
+        ) from e
+    return msgpack
+
+
+def _pack_float_arrays(value: Any) -> Any:
+    """Replaces all lists that only contain floats with packed float64 arrays."""
+    if isinstance(value, dict):
+        return {k: _pack_float_arrays(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        if len(value) >= MIN_PACKED_ARRAY_LENGTH and all(type(v) is float for v in value):
+            packed = array("d", value)
+            if sys.byteorder == "big":
+                packed.byteswap()
+            return _msgpack().ExtType(FLOAT64_ARRAY_EXT_CODE, packed.tobytes())
+        return [_pack_float_arrays(v) for v in value]
+    return value
+
+
+def _unpack_float_array(code: int, data: bytes) -> Any:
+    if code != FLOAT64_ARRAY_EXT_CODE:
+        return _msgpack().ExtType(code, data)
+    unpacked = array("d")
+    unpacked.frombytes(data)
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+def encode(document: dict[str, Any]) -> bytes:
+    """Encodes a JSON-like OpenLABEL document, e.g. the result of ``AveasOpenLabel.to_dict``, as MessagePack."""
+    packed: bytes = _msgpack().packb(_pack_float_arrays(document), use_bin_type=True)
+    return packed
+
+
+def decode(data: bytes) -> dict[str, Any]:
+    """Decodes MessagePack data written by `encode` or `dump_binary` into a JSON-like document."""
+    document: dict[str, Any] = _msgpack().unpackb(data, raw=False, ext_hook=_unpack_float_array, strict_map_key=False)
+    return document
+
+
+def dump_binary(
+    openlabel: AveasOpenLabel,
+    path: Union[str, os.PathLike],
+    *,
+    compression: Optional[Compression] = Compression.NONE,
+    level: Optional[int] = None,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> None:
+    """Writes ``openlabel`` as a MessagePack file, serializing and packing one frame at a time.
+
+    :param compression: Compression of the file, see `aveas_openlabel.serialization.compression.Compression`.
+        If None, the compression is chosen by the extension of ``path``.
+    """
+    packer = _msgpack().Packer(use_bin_type=True)
+
+    with open_binary(path, "wb", compression=compression, level=level) as f:
+        sections = {
+            section: getattr(openlabel, section)
+            for section in SECTIONS
+            if getattr(openlabel, section) is not None or not (exclude_none or exclude_defaults)
+        }
+        f.write(packer.pack_map_header(1))
+        f.write(packer.pack(ROOT_KEY))
+        f.write(packer.pack_map_header(len(sections)))
+        for section, value in sections.items():
+            f.write(packer.pack(section))
+            if section != "frames" or value is None:
+                with profiling.phase("serialize", section):
+                    serialized = serialize_section(section, value, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+                with profiling.phase("encode", section):
+                    packed = packer.pack(_pack_float_arrays(serialized))
+                with profiling.phase("write", section):
+                    f.write(packed)
+                continue
+            f.write(packer.pack_map_header(len(value)))
+            for frame_uid, frame in value.items():
+                with profiling.phase("serialize", section, str(frame_uid)):
+                    serialized_frame = serialize_frame(frame, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+                with profiling.phase("encode", section, str(frame_uid)):
+                    packed = packer.pack(str(frame_uid)) + packer.pack(_pack_float_arrays(serialized_frame))
+                with profiling.phase("write", section):
+                    f.write(packed)
+
+
+def load_binary(
+    path: Union[str, os.PathLike], *, compression: Optional[Compression] = None, intern_strings: bool = False
+) -> AveasOpenLabel:
+    """Reads a MessagePack file written by `dump_binary`.
+
+    :param compression: Compression of the file. If None, it is detected from the file.
+        The frames of files converted from delta-encoded JSON files with `json_to_binary` are expanded.
+    :param intern_strings: Whether repeated strings and uids share one object, see
+        `aveas_openlabel.serialization.interning`. This saves some memory, but makes loading slower.
+    """
+    document = expand_delta_frames(_read_document(path, compression))
+    if profiling.active_profiler() is None:
+        openlabel = AveasOpenLabel.from_dict(document)
+    else:
+        openlabel = deserialize_document(unwrap_root(document))
+    if not intern_strings:
+        return openlabel
+    with profiling.phase("deserialize"):
+        return StringPool().intern_openlabel(openlabel)
+
+
+def json_to_binary(
+    json_path: Union[str, os.PathLike],
+    binary_path: Union[str, os.PathLike],
+    *,
+    compression: Optional[Compression] = Compression.NONE,
+    level: Optional[int] = None,
+) -> None:
+    """Converts an OpenLABEL JSON file (plain or compressed) to MessagePack without deserializing it into dataclasses."""
+    with open_text(json_path, "r") as f:
+        document = json.load(f)
+    with open_binary(binary_path, "wb", compression=compression, level=level) as f:
+        f.write(encode(document))
+
+
+def binary_to_json(
+    binary_path: Union[str, os.PathLike],
+    json_path: Union[str, os.PathLike],
+    *,
+    compression: Optional[Compression] = Compression.NONE,
+    level: Optional[int] = None,
+) -> None:
+    """Converts a MessagePack file back to OpenLABEL JSON without deserializing it into dataclasses."""
+    document = _read_document(binary_path, None)
+    with open_text(json_path, "w", compression=compression, level=level) as f:
+        json.dump(document, f)
+
+
+def _read_document(path: Union[str, os.PathLike], compression: Optional[Compression]) -> dict[str, Any]:
+    f: IO[bytes]
+    with open_binary(path, "rb", compression=compression) as f:
+        with profiling.phase("read"):
+            data = f.read()
+    with profiling.phase("parse"):
+        return decode(data)
@@ -0,0 +1,235 @@
+"""A disk cache of loaded AVEAS OpenLABEL files
+
+Loading a large OpenLABEL file spends most of its time parsing JSON and constructing dataclasses.
+`OpenLabelCache` stores the loaded `AveasOpenLabel` as a pickle, which loads many times faster, and returns it
+whenever the same file content is loaded again:
+
+>>> from aveas_openlabel.serialization.cache import OpenLabelCache
+>>> cache = OpenLabelCache("path/to/cache", max_bytes=20 * 1024**3)
+>>> openlabel = cache.load("path/to/input.json.zst")  # parses the file and stores the result
+>>> openlabel = cache.load("path/to/input.json.zst")  # unpickles the stored result
+
+Entries are keyed by a hash of the file content and by the versions of this library and of ``uai_openlabel``,
+so changed files and upgrades never return stale results. Renamed or copied files share their entry.
+When the cache grows beyond ``max_bytes``, the least recently used entries are deleted.
+
+Several processes can share a cache directory. Entries are written to temporary files and moved into place
+atomically, so a reader either sees a complete entry or none, and entries that are deleted by another process
+while being read are treated as missing. As entries are pickles, the cache directory must only be writable by trusted users.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.metadata import Metadata
+from aveas_openlabel.serialization.compression import Compression, load
+
+CACHE_DIRECTORY_VARIABLE = "AVEAS_OPENLABEL_CACHE_DIR"
+"""The environment variable that overrides the default cache directory."""
+
+DEFAULT_MAX_BYTES = 10 * 1024**3
+"""The default size limit of a cache directory, 10 GiB."""
+
+ENTRY_SUFFIX = ".pickle"
+"""The suffix of cache entries. Other files in the cache directory are left alone."""
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_STALE_TEMPORARY_FILE_SECONDS = 24 * 60 * 60
+
+
+def default_cache_directory() -> Path:
+    """The directory set by `CACHE_DIRECTORY_VARIABLE`, or ``aveas_openlabel`` in the user's cache directory."""
+    if os.environ.get(CACHE_DIRECTORY_VARIABLE):
+        return Path(os.environ[CACHE_DIRECTORY_VARIABLE])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "aveas_openlabel"
+
+
+def library_version() -> str:
+    """The versions of the libraries that define the cached dataclasses, part of every cache key."""
+    aveas_version = Metadata.__dataclass_fields__["aveas_schema_version"].default
+    try:
+        uai_version = metadata.version("uai_openlabel")
+    except metadata.PackageNotFoundError:
+        uai_version = "unknown"
+    return f"{aveas_version}-{uai_version}-{pickle.HIGHEST_PROTOCOL}"
+
+
+def content_hash(path: Union[str, os.PathLike]) -> str:
+    """The BLAKE2b hash of the content of a file, as it is stored on disk."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OpenLabelCache:
+    """A size-bounded LRU cache of loaded AVEAS OpenLABEL files in a directory, see the module documentation.
+
+    :param directory: The cache directory, by default `default_cache_directory`. It is created if it does not exist.
+    :param max_bytes: The size limit of all entries together. The limit may be exceeded by the most recent entry.
+    """
+
+    def __init__(self, directory: Optional[Union[str, os.PathLike]] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory is not None else default_cache_directory()
+        """The cache directory."""
+        self.max_bytes = max_bytes
+        """The size limit of all entries together."""
+        self.hits = 0
+        """The number of loads that were served from the cache."""
+        self.misses = 0
+        """The number of loads that had to parse the file."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, path: Union[str, os.PathLike]) -> str:
+        """The cache key of a file, from its content and the `library_version`."""
+        return hashlib.blake2b(f"{content_hash(path)}:{library_version()}".encode(), digest_size=20).hexdigest()
+
+    def load(self, path: Union[str, os.PathLike], *, compression: Optional[Compression] = None) -> AveasOpenLabel:
+        """Returns the cached content of a file, or loads it with `aveas_openlabel.serialization.compression.load`
+        and stores it in the cache.
+        """
+        entry = self._entry(self.key(path))
+        openlabel = self._read(entry)
+        if openlabel is not None:
+            self.hits += 1
+            return openlabel
+
+        self.misses += 1
+        openlabel = load(path, compression=compression)
+        self._write(entry, openlabel)
+        self.evict()
+        return openlabel
+
+    def __contains__(self, path: Union[str, os.PathLike]) -> bool:
+        """Whether the content of a file is cached."""
+        return self._entry(self.key(path)).exists()
+
+    @property
+    def size(self) -> int:
+        """The size of all entries together in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> None:
+        """Deletes the least recently used entries until all entries fit into `max_bytes`.
+
+        The most recently used entry is always kept, even if it alone exceeds `max_bytes`.
+        Temporary files that processes which crashed while writing an entry left behind are deleted after a day.
+        """
+        now = time.time()
+        for temporary_file in self.directory.glob(".*.tmp"):
+            try:
+                if now - temporary_file.stat().st_mtime > _STALE_TEMPORARY_FILE_SECONDS:
+                    _remove(temporary_file)
+            except FileNotFoundError:
+                pass
+
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for entry, _, size in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            _remove(entry)
+            total -= size
+
+    def clear(self) -> None:
+        """Deletes all entries."""
+        for entry, _, _ in self._entries():
+            _remove(entry)
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def _entries(self) -> list[tuple[Path, int, int]]:
+        """All entries with the time of their last use and their size."""
+        entries = []
+        for entry in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # deleted by another process
+                continue
+            entries.append((entry, stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    def _read(self, entry: Path) -> Optional[AveasOpenLabel]:
+        try:
+            with open(entry, "rb") as f, _garbage_collection_paused():
+                openlabel = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError):
+            _remove(entry)  # written by an incompatible version or damaged, e.g. by a full disk
+            return None
+        if not isinstance(openlabel, AveasOpenLabel):
+            _remove(entry)
+            return None
+        try:
+            os.utime(entry)  # marks the entry as recently used
+        except FileNotFoundError:
+            pass
+        return openlabel
+
+    def _write(self, entry: Path, openlabel: AveasOpenLabel) -> None:
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=f".{entry.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump(openlabel, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, entry)
+        except BaseException:
+            _remove(Path(temporary_path))
+            raise
+
+
+def load_cached(
+    path: Union[str, os.PathLike],
+    *,
+    compression: Optional[Compression] = None,
+    cache_directory: Optional[Union[str, os.PathLike]] = None,
+) -> AveasOpenLabel:
+    """Loads a file through an `OpenLabelCache` in ``cache_directory``, by default `default_cache_directory`."""
+    return OpenLabelCache(cache_directory).load(path, compression=compression)
+
+
+@contextmanager
+def _garbage_collection_paused() -> Iterator[None]:
+    """Pauses the cyclic garbage collector, which would otherwise repeatedly scan the millions of objects
+    that unpickling a large scenario creates, and which take up most of the time of unpickling."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except (FileNotFoundError, PermissionError):  # deleted by another process, or still open on Windows
+        pass
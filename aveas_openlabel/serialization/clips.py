@@ -0,0 +1,395 @@
+"""Extraction of event-centred clips from a recording
+
+For training data, every event of a recording is cut into a clip of its own, with some frames of padding
+before and after it. `write_clips` writes one valid AVEAS OpenLABEL file per `Clip`, in a single pass over
+the frames of the recording:
+
+>>> from aveas_openlabel.serialization.clips import Clip, event_clips, write_clips
+>>> clips = event_clips(openlabel.events, padding_before=50, padding_after=50)
+>>> clips.append(Clip("overview", frame_start=0, frame_end=249))  # any other frame window
+>>> paths = write_clips(openlabel, clips, "path/to/clips", suffix=".json.zst")
+
+The frames of each clip are numbered from 0, and the frame intervals of the document, of its objects and of its
+events describe the frames of the clip. A clip contains only the objects in its `Clip.object_uids`, by default
+the participants of the event of an event clip, or, if these are None, all objects that appear in its frames.
+Events that overlap a clip are clipped to it, events whose role A participant is not part of the clip are removed.
+Attributes of the scenario context that refer to a frame outside of the clip, e.g. the frame of the minimum
+vehicle speed, are removed together with the attributes that they refer to, the other frame references are remapped.
+
+The recording can also be an `aveas_openlabel.serialization.frame_index.IndexedFile`, in which case only
+the frames within the clips are read from the file:
+
+>>> from aveas_openlabel.serialization.frame_index import IndexedFile
+>>> with IndexedFile("path/to/recording.json") as indexed:
+...     paths = write_clips(indexed, event_clips(indexed.section("events")), "path/to/clips")
+
+Each frame is serialized once and written to all clips that contain it. Only frames with numeric uids can be part
+of a clip.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import os
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import (
+    Any,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from uai_openlabel import EventUid, FrameInterval, Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.event import Event
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.compression import Compression, open_text
+from aveas_openlabel.serialization.frame_index import IndexedFile
+from aveas_openlabel.serialization.sections import (
+    SECTIONS,
+    deserialize_document,
+    frame_intervals_from_uids,
+    merge_frame_intervals,
+    serialize_frame,
+    serialize_section,
+)
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+_ROLE_A_NAME = "event_participant/role_a_id"
+_ROLE_B_NAME = "event_participants/role_b_ids"
+_FRAME_REFERENCE_SUFFIX = "/frame"
+
+
+@dataclass
+class Clip:
+    """A window of frames to extract from a recording into a file of its own."""
+
+    name: str
+    """The name of the clip, which is the name of its file without the suffix."""
+
+    frame_start: int
+    """The first frame of the clip, inclusive."""
+
+    frame_end: int
+    """The last frame of the clip, inclusive."""
+
+    object_uids: Optional[Collection[str]] = None
+    """The uids of the objects of the clip. If None, all objects that appear in the frames of the clip."""
+
+    event_uids: Optional[Collection[str]] = None
+    """The uids of the events of the clip, if they overlap it. If None, all events that overlap the clip."""
+
+
+def event_clips(
+    events: Optional[Mapping[EventUid, Event]],
+    *,
+    padding_before: int = 0,
+    padding_after: int = 0,
+    participants_only: bool = True,
+) -> list[Clip]:
+    """One clip per event, named ``event-<uid>``, from the first to the last frame of the event plus the padding.
+
+    :param participants_only: Whether the clips contain only the role A and role B participants of their event
+        and no other events. Otherwise, they contain all objects and events of their frames.
+    """
+    clips = []
+    for uid, event in (events or {}).items():
+        if not event.frame_intervals:
+            continue
+        participants: Optional[set[str]] = None
+        if participants_only:
+            participants = {text.val for text in event.event_data.text or () if text.name == _ROLE_A_NAME}
+            participants.update(uid for vec in event.event_data.vec or () if vec.name == _ROLE_B_NAME for uid in vec.val)
+        clips.append(
+            Clip(
+                name=f"event-{uid}",
+                frame_start=min(int(interval.frame_start) for interval in event.frame_intervals) - padding_before,
+                frame_end=max(int(interval.frame_end) for interval in event.frame_intervals) + padding_after,
+                object_uids=participants,
+                event_uids=[uid] if participants_only else None,
+            )
+        )
+    return clips
+
+
+def write_clips(
+    recording: Union[AveasOpenLabel, IndexedFile],
+    clips: Sequence[Clip],
+    directory: Union[str, os.PathLike],
+    *,
+    suffix: str = ".json",
+    compression: Optional[Compression] = None,
+    level: Optional[int] = None,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> list[Path]:
+    """Writes each clip of a recording to a file in ``directory``, see the module documentation.
+
+    :param suffix: The suffix of the file names, e.g. ``".json.gz"``, by which the compression is chosen
+        unless ``compression`` is given.
+    :param exclude_none: Whether members that are None are left out. The frames of an `IndexedFile`
+        are copied as they are in the file, only its other sections are written anew.
+    :return: The paths of the files of the clips, in the order of ``clips``.
+    """
+    names = [clip.name for clip in clips]
+    if len(set(names)) != len(names):
+        raise ValueError("The names of the clips have to be unique.")
+    for clip in clips:
+        if clip.frame_end < clip.frame_start:
+            raise ValueError(f"The clip {clip.name} ends before it starts.")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [directory / f"{clip.name}{suffix}" for clip in clips]
+
+    header = _header_sections(recording)
+    pending = sorted(range(len(clips)), key=lambda i: clips[i].frame_start)
+    active: dict[int, _ClipWriter] = {}
+    start = partial(
+        _ClipWriter,
+        header=header,
+        compression=compression,
+        level=level,
+        exclude_none=exclude_none,
+        exclude_defaults=exclude_defaults,
+    )
+    try:
+        frames = _frames(recording, clips, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+        for frame_number, serialized_frame in frames:
+            while pending and clips[pending[0]].frame_start <= frame_number:
+                index = pending.pop(0)
+                active[index] = start(paths[index], clips[index])
+            encoded_frame: Optional[str] = None
+            for index, clip_writer in list(active.items()):
+                if clip_writer.clip.frame_end < frame_number:
+                    active.pop(index).close()
+                elif clip_writer.filters_objects:
+                    clip_writer.write_frame(frame_number, serialized_frame)
+                else:
+                    if encoded_frame is None:
+                        with profiling.phase("encode", "frames", str(frame_number)):
+                            encoded_frame = json.dumps(serialized_frame)
+                    clip_writer.write_encoded_frame(frame_number, serialized_frame, encoded_frame)
+        for index in pending:
+            active[index] = start(paths[index], clips[index])
+        while active:
+            active.popitem()[1].close()
+    finally:
+        for clip_writer in active.values():
+            clip_writer.file.close()
+    return paths
+
+
+class _ClipWriter:
+    """Writes the frames of one clip to its file and, when it is closed, its objects and events."""
+
+    def __init__(
+        self,
+        path: Path,
+        clip: Clip,
+        header: dict[str, Any],
+        *,
+        compression: Optional[Compression],
+        level: Optional[int],
+        exclude_none: bool,
+        exclude_defaults: bool,
+    ) -> None:
+        self.clip = clip
+        self._object_uids = None if clip.object_uids is None else set(clip.object_uids)
+        self._sections = header
+        self._appearances: dict[str, list[int]] = {}
+        self._header = deserialize_document(
+            {
+                **{section: value for section, value in header.items() if section not in ("objects", "events")},
+                "contexts": _clip_contexts(header.get("contexts"), clip),
+            }
+        )
+        self.file = open_text(path, "w", compression=compression, level=level)
+        self._writer = StreamingWriter(
+            self.file,
+            self._header,
+            deferred_sections=("objects", "events"),
+            exclude_none=exclude_none,
+            exclude_defaults=exclude_defaults,
+            compute_frame_intervals=True,
+        )
+        self._writer.start_frames()  # a clip without frames has no frames rather than unknown frames
+
+    @property
+    def filters_objects(self) -> bool:
+        """Whether the frames of the clip contain only some of the objects of the frames of the recording."""
+        return self._object_uids is not None
+
+    def write_frame(self, frame_number: int, serialized_frame: dict[str, Any]) -> None:
+        """Writes a frame of the recording, with only the objects of the clip."""
+        objects = serialized_frame.get("objects")
+        if objects is not None and self._object_uids is not None:
+            object_uids = self._object_uids
+            serialized_frame = {**serialized_frame, "objects": {u: o for u, o in objects.items() if u in object_uids}}
+        self._record(frame_number, serialized_frame)
+        self._writer.write_serialized_frame(frame_number - self.clip.frame_start, serialized_frame)
+
+    def write_encoded_frame(self, frame_number: int, serialized_frame: dict[str, Any], encoded_frame: str) -> None:
+        """Writes a frame of the recording as it is, which has already been encoded as JSON text."""
+        self._record(frame_number, serialized_frame)
+        self._writer.write_encoded_frame(frame_number - self.clip.frame_start, encoded_frame)
+
+    def close(self) -> None:
+        """Writes the objects and events of the clip and the end of the document, and closes the file."""
+        object_uids = self._object_uids if self._object_uids is not None else set(self._appearances)
+        objects = self._sections.get("objects")
+        if objects is not None:
+            clip_objects = {}
+            for uid, obj in objects.items():
+                if uid not in object_uids:
+                    continue
+                if obj.get("frame_intervals") is not None:
+                    intervals = frame_intervals_from_uids(self._appearances.get(uid, ()))
+                    obj = {**obj, "frame_intervals": serialize_section("frame_intervals", intervals)}
+                clip_objects[uid] = obj
+            objects = clip_objects
+        events = self._sections.get("events")
+        if events is not None:
+            events = _clip_events(events, self.clip, set(objects or {}) if objects is not None else object_uids)
+        document = deserialize_document({"metadata": self._sections["metadata"], "objects": objects, "events": events})
+        self._header.objects = document.objects
+        self._header.events = document.events
+        self._writer.close()
+        self.file.close()
+
+    def _record(self, frame_number: int, serialized_frame: dict[str, Any]) -> None:
+        for object_uid in serialized_frame.get("objects") or ():
+            self._appearances.setdefault(object_uid, []).append(frame_number - self.clip.frame_start)
+
+
+def _header_sections(recording: Union[AveasOpenLabel, IndexedFile]) -> dict[str, Any]:
+    """The JSON content of all sections of a recording except ``frames`` and ``frame_intervals``."""
+    sections = [section for section in SECTIONS if section not in ("frames", "frame_intervals")]
+    if isinstance(recording, IndexedFile):
+        return {section: recording.raw_section(section) for section in sections}
+    return {section: serialize_section(section, getattr(recording, section)) for section in sections}
+
+
+def _frames(
+    recording: Union[AveasOpenLabel, IndexedFile], clips: Sequence[Clip], *, exclude_none: bool, exclude_defaults: bool
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """The serialized frames of the recording within any of the clips, in the order of their frame numbers.
+
+    The frames of an `IndexedFile` are yielded as they are in the file.
+    """
+    frame_uids = list(recording.index.frames) if isinstance(recording, IndexedFile) else list(recording.frames or {})
+    by_number = {int(uid): uid for uid in frame_uids if uid.lstrip("-").isdigit()}
+    windows = merge_frame_intervals(FrameInterval(frame_start=c.frame_start, frame_end=c.frame_end) for c in clips)
+    for window in windows:
+        start, end = int(window.frame_start), int(window.frame_end)
+        if end - start < len(by_number):
+            frame_numbers: Iterable[int] = range(start, end + 1)
+        else:
+            frame_numbers = sorted(n for n in by_number if start <= n <= end)
+        for frame_number in frame_numbers:
+            uid = by_number.get(frame_number)
+            if uid is None:
+                continue
+            if isinstance(recording, IndexedFile):
+                yield frame_number, recording.raw_frame(uid)
+                continue
+            with profiling.phase("serialize", "frames", uid):
+                serialized_frame = serialize_frame(
+                    (recording.frames or {})[Uid(uid)], exclude_none=exclude_none, exclude_defaults=exclude_defaults
+                )
+            yield frame_number, serialized_frame
+
+
+def _clip_events(events: dict[str, Any], clip: Clip, object_uids: set[str]) -> dict[str, Any]:
+    """The serialized events that overlap the clip, with their frame intervals clipped to it and remapped.
+
+    Events whose role A participant is not part of the clip are removed, as are role B participants that are not.
+    The role B attribute is kept with an empty list when none of its participants is part of the clip, because
+    `aveas_openlabel.event.EventData` requires it.
+    """
+    clipped = {}
+    for uid, event in events.items():
+        if clip.event_uids is not None and uid not in clip.event_uids:
+            continue
+        intervals = [
+            FrameInterval(
+                frame_start=max(int(interval["frame_start"]), clip.frame_start) - clip.frame_start,
+                frame_end=min(int(interval["frame_end"]), clip.frame_end) - clip.frame_start,
+            )
+            for interval in event.get("frame_intervals") or ()
+            if int(interval["frame_start"]) <= clip.frame_end and int(interval["frame_end"]) >= clip.frame_start
+        ]
+        if not intervals:
+            continue
+        event_data = event.get("event_data") or {}
+        if any(text["val"] not in object_uids for text in event_data.get("text") or () if text.get("name") == _ROLE_A_NAME):
+            continue
+        event_data = {
+            **event_data,
+            "vec": [
+                {**vec, "val": [u for u in vec["val"] if u in object_uids]} if vec.get("name") == _ROLE_B_NAME else vec
+                for vec in event_data.get("vec") or ()
+            ],
+        }
+        frame_intervals = serialize_section("frame_intervals", merge_frame_intervals(intervals))
+        clipped[uid] = {**event, "event_data": event_data, "frame_intervals": frame_intervals}
+    return clipped
+
+
+def _clip_contexts(contexts: Optional[dict[str, Any]], clip: Clip) -> Optional[dict[str, Any]]:
+    """The serialized contexts with the frame references of their text attributes filtered and remapped to the clip.
+
+    An attribute like ``scenario/minimum_vehicle_speed/frame`` that refers to a frame outside of the clip is removed
+    with all attributes that it refers to, e.g. ``scenario/minimum_vehicle_speed`` and its ``/ustddev``.
+    """
+    if contexts is None:
+        return None
+    clipped = {}
+    for uid, context in contexts.items():
+        context_data = context.get("context_data")
+        if not context_data or not context_data.get("text"):
+            clipped[uid] = context
+            continue
+        removed: list[str] = []
+        remapped: dict[str, str] = {}
+        for text in context_data["text"]:
+            name, val = str(text.get("name")), str(text.get("val"))
+            if not name.endswith(_FRAME_REFERENCE_SUFFIX) or not val.lstrip("-").isdigit():
+                continue
+            if clip.frame_start <= int(val) <= clip.frame_end:
+                remapped[name] = str(int(val) - clip.frame_start)
+            else:
+                removed.append(name[: -len(_FRAME_REFERENCE_SUFFIX)])
+
+        def keeps(attribute: dict[str, Any]) -> bool:
+            name = str(attribute.get("name"))
+            return not any(name == prefix or name.startswith(f"{prefix}/") for prefix in removed)
+
+        filtered_data = {
+            field_name: (
+                [{**a, "val": remapped[a["name"]]} if a.get("name") in remapped else a for a in attributes if keeps(a)]
+                if isinstance(attributes, list)
+                else attributes
+            )
+            for field_name, attributes in context_data.items()
+        }
+        clipped[uid] = {**context, "context_data": filtered_data}
+    return clipped
@@ -0,0 +1,244 @@
+"""Reading and writing compressed AVEAS OpenLABEL files
+
+OpenLABEL JSON is very repetitive and typically compresses by a factor of 10 to 20.
+`load` and `dump` transparently handle plain, gzip, xz and zstd compressed files.
+The compression is detected from the magic bytes of an existing file or from the file extension
+(``.gz``, ``.xz``, ``.zst``) of a file to be written.
+
+>>> from aveas_openlabel import AveasOpenLabel
+>>> from aveas_openlabel.serialization.compression import dump, load
+>>> dump(AveasOpenLabel.minimum_example(), "path/to/file.json.zst", level=10)
+>>> openlabel = load("path/to/file.json.zst")
+
+Files are compressed and decompressed with streaming codecs, so no compressed copy of the document is held in memory.
+`load` decompresses the whole text of the document before it is parsed, decompression and parsing do not overlap.
+Writing uses `aveas_openlabel.serialization.writer.StreamingWriter`, which serializes and compresses one frame at a time.
+zstd support requires Python 3.14 or the optional ``zstandard`` package.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import gzip
+import io
+import json
+import lzma
+import mmap
+import os
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Collection, Literal, Optional, TextIO, Union, cast
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.interning import StringPool
+from aveas_openlabel.serialization.sections import deserialize_document, unwrap_root
+from aveas_openlabel.serialization.selection import Selection, parse_selection
+from aveas_openlabel.serialization.tokenizer import parse_sections
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+
+class Compression(str, Enum):
+    """Supported compression formats for OpenLABEL files."""
+
+    NONE = "none"
+    """Plain JSON text."""
+
+    GZIP = "gzip"
+    """gzip (DEFLATE) compression, fast and universally available."""
+
+    XZ = "xz"
+    """xz (LZMA2) compression, the best compression ratio but the slowest."""
+
+    ZSTD = "zstd"
+    """Zstandard compression, a good compression ratio at a high speed."""
+
+
+DEFAULT_LEVELS: dict[Compression, int] = {Compression.GZIP: 6, Compression.XZ: 6, Compression.ZSTD: 3}
+"""The compression levels used by `dump` if no level is given."""
+
+_MAGIC_BYTES: dict[bytes, Compression] = {
+    b"\x1f\x8b": Compression.GZIP,
+    b"\xfd7zXZ\x00": Compression.XZ,
+    b"\x28\xb5\x2f\xfd": Compression.ZSTD,
+}
+
+_EXTENSIONS: dict[str, Compression] = {
+    ".gz": Compression.GZIP,
+    ".gzip": Compression.GZIP,
+    ".xz": Compression.XZ,
+    ".zst": Compression.ZSTD,
+    ".zstd": Compression.ZSTD,
+}
+
+
+class MissingCodecError(ImportError):
+    """Exception that is raised when a compression format needs an optional package that is not installed."""
+
+
+def compression_from_extension(path: Union[str, os.PathLike]) -> Compression:
+    """Determines the compression of a file from its extension, e.g. ``scenario.json.gz``."""
+    return _EXTENSIONS.get(Path(path).suffix.lower(), Compression.NONE)
+
+
+def detect_compression(path: Union[str, os.PathLike]) -> Compression:
+    """Determines the compression of an existing file from its magic bytes, falling back to its extension."""
+    with open(path, "rb") as f:
+        head = f.read(max(len(magic) for magic in _MAGIC_BYTES))
+    for magic, compression in _MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return compression
+    if head:
+        return Compression.NONE
+    return compression_from_extension(path)
+
+
+def open_binary(
+    path: Union[str, os.PathLike],
+    mode: Literal["rb", "wb"],
+    *,
+    compression: Optional[Compression] = None,
+    level: Optional[int] = None,
+) -> IO[bytes]:
+    """Opens a possibly compressed file as a stream of uncompressed bytes.
+
+    If ``compression`` is not given, it is detected with `detect_compression` for reading
+    and with `compression_from_extension` for writing.
+    """
+    if compression is None:
+        compression = detect_compression(path) if mode == "rb" else compression_from_extension(path)
+    if mode == "wb" and level is None:
+        level = DEFAULT_LEVELS.get(compression)
+
+    if compression is Compression.NONE:
+        return open(path, mode)
+    if compression is Compression.GZIP:
+        if mode == "wb":
+            return cast(IO[bytes], gzip.open(path, mode, compresslevel=cast(int, level)))
+        return cast(IO[bytes], gzip.open(path, mode))
+    if compression is Compression.XZ:
+        return cast(IO[bytes], lzma.open(path, mode, preset=level if mode == "wb" else None))
+    return _open_zstd(path, mode, level)
+
+
+def open_text(
+    path: Union[str, os.PathLike],
+    mode: Literal["r", "w"],
+    *,
+    compression: Optional[Compression] = None,
+    level: Optional[int] = None,
+) -> TextIO:
+    """Opens a possibly compressed file as a UTF-8 text stream, see `open_binary`."""
+    binary_mode: Literal["rb", "wb"] = "rb" if mode == "r" else "wb"
+    return io.TextIOWrapper(open_binary(path, binary_mode, compression=compression, level=level), encoding="utf-8")
+
+
+def load(
+    path: Union[str, os.PathLike],
+    *,
+    compression: Optional[Compression] = None,
+    sections: Optional[Collection[str]] = None,
+    selection: Optional[Selection] = None,
+    intern_strings: bool = False,
+) -> AveasOpenLabel:
+    """Reads an AVEAS OpenLABEL file that is plain or compressed with any of the supported `Compression` formats.
+
+    :param sections: The top-level sections to deserialize, e.g. ``["metadata", "contexts", "objects"]``.
+        All other sections are skipped without being parsed and are None, see
+        `aveas_openlabel.serialization.tokenizer.parse_sections`. If None, all sections are deserialized.
+    :param selection: The frames and objects to deserialize, see
+        `aveas_openlabel.serialization.selection.Selection`. If None, all frames and objects are deserialized.
+    :param intern_strings: Whether repeated strings and uids share one object, see
+        `aveas_openlabel.serialization.interning`. This saves some memory, but makes loading slower.
+
+    The frames of delta-encoded files are expanded, see `aveas_openlabel.serialization.delta`.
+    With ``sections`` or ``selection``, reading their frames raises a
+    `aveas_openlabel.serialization.sections.DeltaFramesError`.
+    """
+    openlabel = _load(path, compression, sections, selection)
+    if not intern_strings:
+        return openlabel
+    with profiling.phase("deserialize"):
+        return StringPool().intern_openlabel(openlabel)
+
+
+def _load(
+    path: Union[str, os.PathLike],
+    compression: Optional[Compression],
+    sections: Optional[Collection[str]],
+    selection: Optional[Selection],
+) -> AveasOpenLabel:
+    if sections is not None or selection is not None:
+        with open_binary(path, "rb", compression=compression) as f:
+            if isinstance(f, io.BufferedReader) and os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return _parse_partially(data, sections, selection)
+            with profiling.phase("read"):
+                content = f.read()
+            return _parse_partially(content, sections, selection)
+
+    # imported here, as the delta encoding writes files with this module
+    from aveas_openlabel.serialization.delta import expand_delta_frames
+
+    with open_text(path, "r", compression=compression) as f:
+        with profiling.phase("read"):
+            text = f.read()
+        with profiling.phase("parse"):
+            document = json.loads(text)
+        return deserialize_document(expand_delta_frames(unwrap_root(document)))
+
+
+def dump(
+    openlabel: AveasOpenLabel,
+    path: Union[str, os.PathLike],
+    *,
+    compression: Optional[Compression] = None,
+    level: Optional[int] = None,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> None:
+    """Writes an AVEAS OpenLABEL file, compressed according to ``compression`` or the extension of ``path``.
+
+    :param level: The compression level, or preset for xz. Higher levels compress better but slower.
+        See `DEFAULT_LEVELS` for the defaults.
+    """
+    with open_text(path, "w", compression=compression, level=level) as f:
+        StreamingWriter(f, openlabel, exclude_none=exclude_none, exclude_defaults=exclude_defaults).close()
+
+
+def _parse_partially(data: Any, sections: Optional[Collection[str]], selection: Optional[Selection]) -> AveasOpenLabel:
+    if selection is not None:
+        return parse_selection(data, selection, sections)
+    return parse_sections(data, cast(Collection[str], sections))
+
+
+def _open_zstd(path: Union[str, os.PathLike], mode: Literal["rb", "wb"], level: Optional[int]) -> IO[bytes]:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return cast(IO[bytes], zstd.open(path, mode, level=level if mode == "wb" else None))
+    except ImportError:
+        pass
+
+    try:
+        import zstandard  # type: ignore[import-not-found, unused-ignore]
+    except ImportError as e:
+        raise MissingCodecError(
+            "zstd compression requires the zstandard package, install it with 'pip install zstandard'."
+        ) from e
+
+    file = open(path, mode)
+    if mode == "wb":
+        return cast(IO[bytes], zstandard.ZstdCompressor(level=cast(int, level)).stream_writer(file))
+    return cast(IO[bytes], zstandard.ZstdDecompressor().stream_reader(file))
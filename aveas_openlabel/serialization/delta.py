@@ -0,0 +1,307 @@
+"""Delta encoding of the frames of AVEAS OpenLABEL files
+
+Many dynamic attributes, e.g. `aveas_openlabel.attributes.road.Road__SpeedLimit` or
+`aveas_openlabel.attributes.lights.Lights__Daytime`, rarely change, but every frame repeats them.
+`dump_delta` writes a file in which every frame only holds what changed since the previous frame,
+which makes long recordings much smaller and faster to parse:
+
+>>> from aveas_openlabel.serialization.compression import load
+>>> from aveas_openlabel.serialization.delta import DeltaFile, dump_delta
+>>> dump_delta(openlabel, "path/to/file.json.zst")
+>>> openlabel = load("path/to/file.json.zst")  # expands all frames
+>>> with DeltaFile("path/to/file.json.zst") as delta_file:
+...     frame = delta_file.frame("1234")  # only expands the frames since the preceding keyframe
+
+The delta-encoded frames are written to the private member `DELTA_FRAMES_MEMBER` instead of ``frames``, so that
+readers that do not know the encoding see a document without frames rather than frames with missing attributes.
+`aveas_openlabel.serialization.compression.load`, `aveas_openlabel.serialization.parallel.load_parallel` and
+`aveas_openlabel.serialization.binary.load_binary` expand them. The readers of this package that address single
+frames by their position in the file, e.g. `aveas_openlabel.serialization.frame_index.IndexedFile`,
+`aveas_openlabel.serialization.merge.merge` and `aveas_openlabel.serialization.diff.diff_files`, as well as
+``load`` with ``sections`` or ``selection``, raise a `aveas_openlabel.serialization.sections.DeltaFramesError`.
+
+Every `DEFAULT_KEYFRAME_INTERVAL`-th frame is a keyframe, a regular serialized frame. All other frames are marked by
+the member `DELTA_MARKER` and only differ from regular frames in the ``object_data`` of objects that were also in
+the previous frame: fields that did not change are left out, and in lists of attributes that did change,
+every attribute that is equal to the attribute at the same position in the previous frame is null.
+Streaming producers can combine a `DeltaEncoder` with a `aveas_openlabel.serialization.writer.StreamingWriter`
+whose ``frames_member`` is `DELTA_FRAMES_MEMBER`.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import os
+from dataclasses import replace
+from types import TracebackType
+from typing import Any, Iterator, Optional, Union
+
+from uai_openlabel import Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.compression import Compression, open_text
+from aveas_openlabel.serialization.interning import StringPool
+from aveas_openlabel.serialization.sections import (
+    DELTA_FRAMES_MEMBER,
+    deserialize_document,
+    deserialize_frame,
+    serialize_frame,
+    unwrap_root,
+)
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+DELTA_MARKER = "delta"
+"""The member of frames that are encoded relative to the previous frame, which is always true."""
+
+DEFAULT_KEYFRAME_INTERVAL = 250
+"""The number of frames from one keyframe to the next, e.g. 10 s at 25 Hz."""
+
+
+class DeltaEncodingError(ValueError):
+    """Exception that is raised when a delta-encoded frame does not follow a frame that it can be applied to."""
+
+
+class DeltaEncoder:
+    """Encodes consecutive serialized frames, e.g. of `serialize_frame`, relative to their previous frames.
+
+    :param keyframe_interval: The number of frames from one keyframe to the next. The first frame is always a keyframe.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError(f"keyframe_interval must be positive, got {keyframe_interval}.")
+        self.keyframe_interval = keyframe_interval
+        """The number of frames from one keyframe to the next."""
+        self._count = 0
+        self._previous_objects: dict[str, Any] = {}
+
+    def encode(self, serialized_frame: dict[str, Any]) -> dict[str, Any]:
+        """The encoding of the next frame. The serialized frame is not modified."""
+        keyframe = self._count % self.keyframe_interval == 0
+        self._count += 1
+        objects = serialized_frame.get("objects")
+        previous_objects, self._previous_objects = self._previous_objects, objects or {}
+        if keyframe or not objects:
+            return serialized_frame
+
+        encoded_objects = {}
+        for object_uid, object_in_frame in objects.items():
+            previous = previous_objects.get(object_uid)
+            encoded_objects[object_uid] = object_in_frame if previous is None else _object_delta(previous, object_in_frame)
+        return {**serialized_frame, "objects": encoded_objects, DELTA_MARKER: True}
+
+
+class DeltaDecoder:
+    """Expands consecutive frames encoded by a `DeltaEncoder` into regular serialized frames."""
+
+    def __init__(self) -> None:
+        self._previous_objects: Optional[dict[str, Any]] = None
+
+    def decode(self, encoded_frame: dict[str, Any]) -> dict[str, Any]:
+        """The serialized frame of the next encoded frame. The encoded frame is not modified.
+
+        :raises DeltaEncodingError: If the first decoded frame is not a keyframe.
+        """
+        if not encoded_frame.get(DELTA_MARKER):
+            self._previous_objects = encoded_frame.get("objects") or {}
+            return encoded_frame
+        if self._previous_objects is None:
+            raise DeltaEncodingError("Delta-encoded frames can only be decoded after the preceding keyframe.")
+
+        previous_objects = self._previous_objects
+        objects = {}
+        for object_uid, object_in_frame in (encoded_frame.get("objects") or {}).items():
+            previous = previous_objects.get(object_uid)
+            objects[object_uid] = object_in_frame if previous is None else _apply_object_delta(previous, object_in_frame)
+        self._previous_objects = objects
+        frame = {key: value for key, value in encoded_frame.items() if key != DELTA_MARKER}
+        frame["objects"] = objects
+        return frame
+
+
+def expand_delta_frames(document: dict[str, Any]) -> dict[str, Any]:
+    """Moves the expanded frames of `DELTA_FRAMES_MEMBER` to ``frames`` in place, if the document has any, and returns it.
+
+    The document is the content of a file, with or without the ``openlabel`` root key.
+    """
+    unwrapped = unwrap_root(document)
+    encoded_frames = unwrapped.pop(DELTA_FRAMES_MEMBER, None)
+    if encoded_frames is not None:
+        decoder = DeltaDecoder()
+        with profiling.phase("parse", "frames"):
+            unwrapped["frames"] = {frame_uid: decoder.decode(frame) for frame_uid, frame in encoded_frames.items()}
+    return document
+
+
+def dump_delta(
+    openlabel: AveasOpenLabel,
+    path: Union[str, os.PathLike],
+    *,
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    compression: Optional[Compression] = None,
+    level: Optional[int] = None,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> None:
+    """Writes a delta-encoded AVEAS OpenLABEL file, see `aveas_openlabel.serialization.compression.dump`
+    for the other arguments.
+
+    :param keyframe_interval: The number of frames from one keyframe to the next. Longer intervals make smaller files,
+        shorter intervals make `DeltaFile.frame` faster.
+    """
+    encoder = DeltaEncoder(keyframe_interval)
+    header = replace(openlabel, frames=None if openlabel.frames is None else {})
+    with open_text(path, "w", compression=compression, level=level) as f:
+        writer = StreamingWriter(
+            f, header, exclude_none=exclude_none, exclude_defaults=exclude_defaults, frames_member=DELTA_FRAMES_MEMBER
+        )
+        for frame_uid, frame in (openlabel.frames or {}).items():
+            with profiling.phase("serialize", "frames", str(frame_uid)):
+                serialized_frame = serialize_frame(frame, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+            writer.write_serialized_frame(frame_uid, encoder.encode(serialized_frame))
+        writer.close()
+
+
+class DeltaFile:
+    """Lazy access to the frames of a delta-encoded file, see the module documentation.
+
+    The file is parsed when it is opened, but frames are only expanded and deserialized when they are accessed.
+    A frame is expanded from the preceding keyframe, or from the previously accessed frame when frames are
+    accessed in order. Regular files without delta-encoded frames can be read as well.
+
+    :param intern_strings: Whether repeated strings and uids share one object across all frames and the header,
+        see `aveas_openlabel.serialization.interning`.
+    """
+
+    def __init__(
+        self, path: Union[str, os.PathLike], *, compression: Optional[Compression] = None, intern_strings: bool = False
+    ):
+        with open_text(path, "r", compression=compression) as f, profiling.phase("parse"):
+            document = unwrap_root(json.load(f))
+        self._strings = StringPool() if intern_strings else None
+        encoded_frames = document.pop(DELTA_FRAMES_MEMBER, None)
+        frames = document.pop("frames", None)
+        self._encoded_frames: dict[str, dict[str, Any]] = encoded_frames or frames or {}
+        header = deserialize_document(document)
+        self._header = header if self._strings is None else self._strings.intern_openlabel(header)
+        self._positions = {frame_uid: position for position, frame_uid in enumerate(self._encoded_frames)}
+        self._frames = list(self._encoded_frames.values())
+        self._decoder: Optional[DeltaDecoder] = None
+        self._next_position = 0
+
+    @property
+    def frame_uids(self) -> list[Uid]:
+        """The uids of all frames, in the order of the file."""
+        return [Uid(frame_uid) for frame_uid in self._encoded_frames]
+
+    def header(self) -> AveasOpenLabel:
+        """All sections of the file except the frames."""
+        return self._header
+
+    def frame(self, frame_uid: Union[Uid, int, str]) -> Frame:
+        """Expands and deserializes a single frame.
+
+        :raises KeyError: If the file has no frame ``frame_uid``.
+        """
+        return self._deserialize(self.raw_frame(frame_uid))
+
+    def raw_frame(self, frame_uid: Union[Uid, int, str]) -> dict[str, Any]:
+        """The expanded JSON content of a single frame, without deserializing it."""
+        position = self._positions[str(frame_uid)]
+        keyframe_position = position
+        while keyframe_position > 0 and self._frames[keyframe_position].get(DELTA_MARKER):
+            keyframe_position -= 1
+        if self._decoder is None or not keyframe_position <= self._next_position <= position:
+            self._decoder, self._next_position = DeltaDecoder(), keyframe_position
+        while True:
+            serialized_frame = self._decoder.decode(self._frames[self._next_position])
+            self._next_position += 1
+            if self._next_position > position:
+                return serialized_frame
+
+    def frames(self) -> Iterator[tuple[Uid, Frame]]:
+        """Expands and deserializes all frames, one at a time."""
+        decoder = DeltaDecoder()
+        for frame_uid, encoded_frame in self._encoded_frames.items():
+            yield Uid(frame_uid), self._deserialize(decoder.decode(encoded_frame))
+
+    def load(self) -> AveasOpenLabel:
+        """The whole document with all frames, like `aveas_openlabel.serialization.compression.load`."""
+        return replace(self._header, frames=dict(self.frames()))
+
+    def close(self) -> None:
+        """Releases the encoded frames."""
+        self._encoded_frames, self._frames, self._positions = {}, [], {}
+        self._decoder = None
+
+    def __enter__(self) -> "DeltaFile":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _deserialize(self, serialized_frame: dict[str, Any]) -> Frame:
+        with profiling.phase("deserialize", "frames"):
+            frame = deserialize_frame(serialized_frame)
+            return frame if self._strings is None else self._strings.intern_frame(frame)
+
+
+def _object_delta(previous: dict[str, Any], object_in_frame: dict[str, Any]) -> dict[str, Any]:
+    object_data = object_in_frame.get("object_data")
+    previous_object_data = previous.get("object_data")
+    if not isinstance(object_data, dict) or not isinstance(previous_object_data, dict):
+        return object_in_frame
+
+    delta: dict[str, Any] = {}
+    for field_name, value in object_data.items():
+        previous_value = previous_object_data.get(field_name)
+        if field_name in previous_object_data and value == previous_value:
+            continue
+        if isinstance(value, list) and isinstance(previous_value, list):
+            value = [
+                None if index < len(previous_value) and attribute == previous_value[index] else attribute
+                for index, attribute in enumerate(value)
+            ]
+        delta[field_name] = value
+    for field_name in previous_object_data.keys() - object_data.keys():
+        delta[field_name] = None
+    return {**object_in_frame, "object_data": delta}
+
+
+def _apply_object_delta(previous: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    delta_object_data = delta.get("object_data")
+    previous_object_data = previous.get("object_data")
+    if not isinstance(delta_object_data, dict) or not isinstance(previous_object_data, dict):
+        return delta
+
+    object_data = dict(previous_object_data)
+    for field_name, value in delta_object_data.items():
+        previous_value = previous_object_data.get(field_name)
+        if isinstance(value, list) and isinstance(previous_value, list):
+            try:
+                value = [previous_value[index] if attribute is None else attribute for index, attribute in enumerate(value)]
+            except IndexError:
+                raise DeltaEncodingError(
+                    f"{field_name} refers to an attribute that the previous frame does not have."
+                ) from None
+        object_data[field_name] = value
+    return {**delta, "object_data": object_data}
@@ -0,0 +1,264 @@
+"""Structural comparison of two AVEAS OpenLABEL documents
+
+When a file is delivered again, e.g. after a correction of its annotations, a textual diff of the JSON is of little
+use. `diff` and `diff_files` compare two documents by their structure instead and report every `Change`:
+
+>>> from aveas_openlabel.serialization.diff import diff_files
+>>> for change in diff_files("path/to/old.json.zst", "path/to/new.json.zst", abs_tol=1e-6):
+...     print(change)
+changed frames/12/objects/3/object_data/cuboid/bounding_box
+removed frames/13/objects/4
+added objects/5
+
+Frames, objects and all other members of the sections are aligned by their uid or key, and the attributes in
+the lists of object, event and context data are aligned by their ``name``. Added and removed members and
+attributes are reported as a whole, attributes that differ are reported with their old and new value.
+Numbers are equal if they are close according to ``abs_tol`` and ``rel_tol``, see ``math.isclose``.
+Members that are None count as missing, so documents written with and without ``exclude_none`` are equal.
+
+Frames are compared one at a time. `diff` first compares the serialized frames as a whole and only looks into the
+frames that are not identical. `diff_files` streams the changes of two files: it hashes the JSON text of the frames
+and skips the frames with equal hashes without parsing them. Uncompressed files are memory-mapped,
+compressed files are decompressed into memory, but their frames are only parsed if they changed.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import hashlib
+import io
+import json
+import math
+import mmap
+import os
+from contextlib import ExitStack
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Iterator, Optional, Union
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.compression import Compression, open_binary
+from aveas_openlabel.serialization.sections import (
+    DELTA_FRAMES_MEMBER,
+    SECTIONS,
+    DeltaFramesError,
+    serialize_frame,
+    serialize_section,
+)
+from aveas_openlabel.serialization.tokenizer import ByteRange, scan_document
+
+
+class ChangeKind(str, Enum):
+    """Whether a member or attribute has been added, removed or changed."""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+@dataclass
+class Change:
+    """A difference between two documents."""
+
+    kind: ChangeKind
+    """Whether the member or attribute at `path` has been added, removed or changed."""
+
+    path: tuple[str, ...]
+    """The keys that lead to the member or attribute, e.g. ``("frames", "12", "objects", "3")``.
+    Attributes are identified by their name, which is followed by its occurrence, e.g. ``"velocity[1]"``,
+    if an object has several attributes of one name, or by their position, e.g. ``"[2]"``, if they have no name.
+    """
+
+    old: Any = None
+    """The serialized value in the old document, None if it has been added."""
+
+    new: Any = None
+    """The serialized value in the new document, None if it has been removed."""
+
+    def __str__(self) -> str:
+        return f"{self.kind.value} {'/'.join(self.path)}"
+
+
+def diff(old: AveasOpenLabel, new: AveasOpenLabel, *, abs_tol: float = 0.0, rel_tol: float = 0.0) -> list[Change]:
+    """The changes from one document to another, see the module documentation."""
+    comparison = _Comparison(abs_tol, rel_tol)
+    changes: list[Change] = []
+    for section in SECTIONS:
+        if section == "frames":
+            continue
+        old_value = serialize_section(section, getattr(old, section))
+        new_value = serialize_section(section, getattr(new, section))
+        changes.extend(comparison.values((section,), old_value, new_value))
+
+    old_frames, new_frames = old.frames or {}, new.frames or {}
+    for frame_uid, old_frame in old_frames.items():
+        new_frame = new_frames.get(frame_uid)
+        old_value = serialize_frame(old_frame)
+        if new_frame is None:
+            changes.append(Change(ChangeKind.REMOVED, ("frames", frame_uid), old=old_value))
+            continue
+        new_value = serialize_frame(new_frame)
+        if old_value != new_value:
+            changes.extend(comparison.values(("frames", frame_uid), old_value, new_value))
+    for frame_uid, new_frame in new_frames.items():
+        if frame_uid not in old_frames:
+            changes.append(Change(ChangeKind.ADDED, ("frames", frame_uid), new=serialize_frame(new_frame)))
+    return changes
+
+
+def diff_files(
+    old: Union[str, os.PathLike],
+    new: Union[str, os.PathLike],
+    *,
+    abs_tol: float = 0.0,
+    rel_tol: float = 0.0,
+    old_compression: Optional[Compression] = None,
+    new_compression: Optional[Compression] = None,
+) -> Iterator[Change]:
+    """Yields the changes from one possibly compressed file to another, see the module documentation.
+
+    The changes of the sections are yielded first, then those of the frames in the order of the old file,
+    followed by the frames that have been added.
+
+    :raises DeltaFramesError: If the frames of either file are delta-encoded, see `aveas_openlabel.serialization.delta`.
+    """
+    comparison = _Comparison(abs_tol, rel_tol)
+    with ExitStack() as stack:
+        old_data = _read(stack, old, old_compression)
+        new_data = _read(stack, new, new_compression)
+        with profiling.phase("parse"):
+            old_sections, old_frames = scan_document(old_data)
+            new_sections, new_frames = scan_document(new_data)
+        if DELTA_FRAMES_MEMBER in old_sections or DELTA_FRAMES_MEMBER in new_sections:
+            raise DeltaFramesError()
+
+        for section in SECTIONS:
+            if section == "frames":
+                continue
+            old_value = _parse(old_data, old_sections.get(section))
+            new_value = _parse(new_data, new_sections.get(section))
+            yield from comparison.values((section,), old_value, new_value)
+
+        for frame_uid, old_range in old_frames.items():
+            new_range = new_frames.get(frame_uid)
+            if new_range is None:
+                yield Change(ChangeKind.REMOVED, ("frames", frame_uid), old=_parse(old_data, old_range))
+                continue
+            if _digest(old_data, old_range) == _digest(new_data, new_range):
+                continue
+            with profiling.phase("parse", "frames", frame_uid):
+                old_value, new_value = _parse(old_data, old_range), _parse(new_data, new_range)
+            yield from comparison.values(("frames", frame_uid), old_value, new_value)
+        for frame_uid, new_range in new_frames.items():
+            if frame_uid not in old_frames:
+                yield Change(ChangeKind.ADDED, ("frames", frame_uid), new=_parse(new_data, new_range))
+
+
+class _Comparison:
+    """Compares serialized values with the tolerances of a diff."""
+
+    def __init__(self, abs_tol: float, rel_tol: float):
+        if abs_tol < 0 or rel_tol < 0:
+            raise ValueError("Tolerances cannot be negative.")
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+
+    def values(self, path: tuple[str, ...], old: Any, new: Any) -> Iterator[Change]:
+        """The changes between two serialized values, aligning the members of objects and the attributes of lists."""
+        if old is None and new is None:
+            return
+        if old is None:
+            yield Change(ChangeKind.ADDED, path, new=new)
+        elif new is None:
+            yield Change(ChangeKind.REMOVED, path, old=old)
+        elif isinstance(old, dict) and isinstance(new, dict):
+            for key, value in old.items():
+                yield from self.values((*path, key), value, new.get(key))
+            for key, value in new.items():
+                if key not in old:
+                    yield from self.values((*path, key), None, value)
+        elif isinstance(old, list) and isinstance(new, list) and _are_attributes([*old, *new]):
+            old_attributes, new_attributes = _by_name(old), _by_name(new)
+            for name, attribute in old_attributes.items():
+                new_attribute = new_attributes.get(name)
+                if new_attribute is None:
+                    yield Change(ChangeKind.REMOVED, (*path, name), old=attribute)
+                elif not self.equal(attribute, new_attribute):
+                    yield Change(ChangeKind.CHANGED, (*path, name), old=attribute, new=new_attribute)
+            for name, attribute in new_attributes.items():
+                if name not in old_attributes:
+                    yield Change(ChangeKind.ADDED, (*path, name), new=attribute)
+        elif not self.equal(old, new):
+            yield Change(ChangeKind.CHANGED, path, old=old, new=new)
+
+    def equal(self, old: Any, new: Any) -> bool:
+        """Whether two serialized values are equal, with numbers compared with the tolerances."""
+        if _is_number(old) and _is_number(new):
+            return bool(old == new or math.isclose(old, new, rel_tol=self.rel_tol, abs_tol=self.abs_tol))
+        if isinstance(old, dict) and isinstance(new, dict):
+            keys = {key for key, value in old.items() if value is not None}
+            if keys != {key for key, value in new.items() if value is not None}:
+                return False
+            return all(self.equal(old[key], new[key]) for key in keys)
+        if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+            return len(old) == len(new) and all(self.equal(o, n) for o, n in zip(old, new))
+        return bool(old == new and isinstance(old, bool) == isinstance(new, bool))
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a value is compared with tolerances, which bools are not."""
+    return value.__class__ is int or value.__class__ is float
+
+
+def _are_attributes(values: list[Any]) -> bool:
+    """Whether a list holds attributes, e.g. the ``num`` attributes of object data."""
+    return bool(values) and all(isinstance(value, dict) and "val" in value for value in values)
+
+
+def _by_name(attributes: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Attributes by their name, followed by their occurrence if a name is repeated, or by their position."""
+    by_name: dict[str, dict[str, Any]] = {}
+    occurrences: dict[str, int] = {}
+    for position, attribute in enumerate(attributes):
+        name = attribute.get("name")
+        if name is None:
+            by_name[f"[{position}]"] = attribute
+            continue
+        occurrence = occurrences.get(name, 0)
+        occurrences[name] = occurrence + 1
+        by_name[name if occurrence == 0 else f"{name}[{occurrence}]"] = attribute
+    return by_name
+
+
+def _read(stack: ExitStack, path: Union[str, os.PathLike], compression: Optional[Compression]) -> Any:
+    """The uncompressed content of a file, memory-mapped if it is not compressed."""
+    binary = stack.enter_context(open_binary(path, "rb", compression=compression))
+    if isinstance(binary, io.BufferedReader) and os.fstat(binary.fileno()).st_size > 0:
+        return stack.enter_context(mmap.mmap(binary.fileno(), 0, access=mmap.ACCESS_READ))
+    with profiling.phase("read"):
+        return binary.read()
+
+
+def _parse(data: Any, byte_range: Optional[ByteRange]) -> Any:
+    if byte_range is None:
+        return None
+    start, end = byte_range
+    return json.loads(data[start:end])
+
+
+def _digest(data: Any, byte_range: ByteRange) -> bytes:
+    """The hash of the JSON text of a value."""
+    start, end = byte_range
+    return hashlib.blake2b(data[start:end], digest_size=16).digest()
@@ -0,0 +1,224 @@
+"""Random access to single frames and sections of plain OpenLABEL JSON files
+
+Reading a single frame of an OpenLABEL JSON file normally means parsing the whole file.
+`build_index` scans a file once, without deserializing it, and records the byte ranges of all top-level sections
+and of every frame in the ``frames`` section. `write_index` stores this `FrameIndex` in a compact sidecar file
+next to the JSON file. `IndexedFile` memory-maps the JSON file and deserializes any single `Frame` or section
+by its byte range, without touching the rest of the file.
+
+>>> from aveas_openlabel.serialization.frame_index import IndexedFile, write_index
+>>> write_index("path/to/input.json")  # once, creates path/to/input.json.index.json
+>>> with IndexedFile("path/to/input.json") as indexed:
+...     frame = indexed.frame("1234")
+...     objects = indexed.section("objects")
+
+Only uncompressed files can be indexed, as compressed files cannot be accessed at arbitrary offsets.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import mmap
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Optional, Union
+
+from uai_openlabel import Uid
+
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization.interning import StringPool
+from aveas_openlabel.serialization.sections import (
+    DELTA_FRAMES_MEMBER,
+    DeltaFramesError,
+    deserialize_frame,
+    deserialize_section,
+    section_type,
+)
+from aveas_openlabel.serialization.tokenizer import (
+    ByteRange,
+    MalformedDocumentError,
+    scan_document,
+)
+
+INDEX_SUFFIX = ".index.json"
+"""Suffix of the sidecar file that holds the `FrameIndex` of an OpenLABEL JSON file."""
+
+INDEX_VERSION = 1
+"""Version of the sidecar file format, sidecar files of other versions are rejected."""
+
+
+class FrameIndexError(ValueError):
+    """Exception that is raised when a file cannot be indexed or an index does not match its file."""
+
+
+class FrameNotIndexedError(KeyError):
+    """Exception that is raised when a frame uid is not part of a `FrameIndex`."""
+
+    def __init__(self, frame_uid: str):
+        super().__init__(f"The frame {frame_uid} is not in the index.")
+
+
+@dataclass
+class FrameIndex:
+    """The byte ranges of the top-level sections and of the frames of an OpenLABEL JSON file."""
+
+    file_size: int
+    """The size of the indexed file in bytes, used to detect that a file changed after it has been indexed."""
+
+    sections: dict[str, ByteRange] = field(default_factory=dict)
+    """The byte range of the value of every top-level section in the file, by section name."""
+
+    frames: dict[str, ByteRange] = field(default_factory=dict)
+    """The byte range of the value of every frame in the ``frames`` section, by frame uid."""
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Writes the index to a sidecar file."""
+        content = {
+            "version": INDEX_VERSION,
+            "file_size": self.file_size,
+            "sections": self.sections,
+            "frame_uids": list(self.frames),
+            "frame_offsets": [offset for byte_range in self.frames.values() for offset in byte_range],
+        }
+        with open(path, "w") as f:
+            json.dump(content, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "FrameIndex":
+        """Reads an index from a sidecar file written by `save`."""
+        with open(path) as f:
+            content = json.load(f)
+        if content.get("version") != INDEX_VERSION:
+            raise FrameIndexError(f"{path} is not a frame index of version {INDEX_VERSION}.")
+        offsets = content["frame_offsets"]
+        return cls(
+            file_size=content["file_size"],
+            sections={section: (start, end) for section, (start, end) in content["sections"].items()},
+            frames={uid: (offsets[2 * i], offsets[2 * i + 1]) for i, uid in enumerate(content["frame_uids"])},
+        )
+
+
+def build_index(path: Union[str, os.PathLike]) -> FrameIndex:
+    """Scans an OpenLABEL JSON file and returns the byte ranges of its sections and frames.
+
+    The scan only tokenizes strings and structural characters, values are not decoded,
+    see `aveas_openlabel.serialization.tokenizer.scan_document`.
+
+    :raises DeltaFramesError: If the frames of the file are delta-encoded, see `aveas_openlabel.serialization.delta`.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise FrameIndexError(f"{path} is empty.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                sections, frames = scan_document(data)
+            except MalformedDocumentError as e:
+                raise FrameIndexError(f"{path} cannot be indexed: {e}") from e
+            if DELTA_FRAMES_MEMBER in sections:
+                raise DeltaFramesError()
+            return FrameIndex(file_size=len(data), sections=sections, frames=frames)
+
+
+def write_index(path: Union[str, os.PathLike], index_path: Optional[Union[str, os.PathLike]] = None) -> FrameIndex:
+    """Builds the index of an OpenLABEL JSON file and saves it, by default as a sidecar file with `INDEX_SUFFIX`."""
+    index = build_index(path)
+    index.save(index_path if index_path is not None else f"{path}{INDEX_SUFFIX}")
+    return index
+
+
+class IndexedFile:
+    """Random access to the frames and sections of an OpenLABEL JSON file through a `FrameIndex`.
+
+    The file is memory-mapped, so only the pages of the requested frames and sections are read from disk.
+
+    :param index: The index of the file. If not given, it is read from the sidecar file with `INDEX_SUFFIX`,
+        or built by scanning the file if there is no sidecar file.
+    :param intern_strings: Whether repeated strings and uids of the frames share one object with those of earlier
+        frames, see `aveas_openlabel.serialization.interning`.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], index: Optional[FrameIndex] = None, *, intern_strings: bool = False):
+        self.path = Path(path)
+        """The path of the JSON file."""
+
+        if index is None:
+            index_path = Path(f"{path}{INDEX_SUFFIX}")
+            index = FrameIndex.load(index_path) if index_path.exists() else build_index(path)
+        self.index = index
+        """The index of the JSON file."""
+
+        self._file = open(self.path, "rb")
+        if os.fstat(self._file.fileno()).st_size != index.file_size:
+            self._file.close()
+            raise FrameIndexError(f"{path} has changed since it has been indexed, rebuild the index with write_index.")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._strings = StringPool() if intern_strings else None
+
+    @property
+    def frame_uids(self) -> list[Uid]:
+        """The uids of all frames in the file, in file order."""
+        return [Uid(uid) for uid in self.index.frames]
+
+    def raw_frame(self, frame_uid: Union[Uid, int, str]) -> dict[str, Any]:
+        """The JSON content of a single frame."""
+        byte_range = self.index.frames.get(str(frame_uid))
+        if byte_range is None:
+            raise FrameNotIndexedError(str(frame_uid))
+        raw: dict[str, Any] = self._read(byte_range)
+        return raw
+
+    def frame(self, frame_uid: Union[Uid, int, str]) -> Frame:
+        """Deserializes a single frame."""
+        frame = deserialize_frame(self.raw_frame(frame_uid))
+        return frame if self._strings is None else self._strings.intern_frame(frame)
+
+    def raw_section(self, section: str) -> Any:
+        """The JSON content of a single top-level section, e.g. ``"objects"``. Sections missing in the file are None."""
+        byte_range = self.index.sections.get(section)
+        if byte_range is None:
+            section_type(section)  # raises for unknown sections
+            return None
+        return self._read(byte_range)
+
+    def section(self, section: str) -> Any:
+        """Deserializes a single top-level section, e.g. ``"objects"``. Sections missing in the file are None."""
+        if section == "frames":
+            return {uid: self.frame(uid) for uid in self.frame_uids}
+        if section not in self.index.sections:
+            section_type(section)  # raises for unknown sections
+            return None
+        return deserialize_section(section, self.raw_section(section))
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "IndexedFile":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _read(self, byte_range: ByteRange) -> Any:
+        start, end = byte_range
+        return json.loads(self._data[start:end])
@@ -0,0 +1,125 @@
+"""Sharing of repeated strings between the frames of a loaded AVEAS OpenLABEL file
+
+Every frame repeats the uids of its objects and the names and types of their attributes. ``json.load`` creates
+a new string for every occurrence of a value, and apischema creates a new ``Uid`` for every occurrence of a key,
+so a file with many frames holds millions of copies of the same few hundred strings.
+
+A `StringPool` replaces the strings and uids in a loaded document by one shared object per distinct value:
+
+>>> from aveas_openlabel.serialization.interning import StringPool
+>>> pool = StringPool()
+>>> openlabel = pool.intern_openlabel(openlabel)  # modifies the document in place
+>>> frame = pool.intern_frame(frame)  # e.g. for every frame of a streaming reader
+
+`aveas_openlabel.serialization.compression.load` and the other readers in this package intern the documents and
+frames that they return with a pool per file if they are called with ``intern_strings=True``. Interning is a pass
+over the deserialized document, so it lowers the memory that a loaded document retains, not the peak memory
+of loading it, and it makes loading slower. Shared strings also make dict lookups by uid and comparisons of
+attribute names faster, which compare identical objects without comparing their characters.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from typing import Any, TypeVar
+
+from uai_openlabel import Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+
+T = TypeVar("T")
+
+_NUMBERS = frozenset({int, float, bool, type(None)})
+_ATTRIBUTE_STRING_FIELDS = ("name", "type", "coordinate_system", "val")
+
+
+class StringPool:
+    """Replaces strings and uids by one shared object per distinct value, see the module documentation.
+
+    A pool keeps all strings that it has seen alive, it should live as long as the documents that it interned.
+    """
+
+    def __init__(self) -> None:
+        self._pools: dict[type, dict[Any, Any]] = {str: {}, Uid: {}}
+
+    def __len__(self) -> int:
+        """The number of distinct strings and uids in the pool."""
+        return sum(len(pool) for pool in self._pools.values())
+
+    def intern(self, value: T) -> T:
+        """The shared object equal to a ``str`` or ``Uid``. Other values, e.g. subclasses like enums, are returned as they are."""
+        pool = self._pools.get(value.__class__)
+        if pool is None:
+            return value
+        return pool.setdefault(value, value)  # type: ignore[no-any-return]
+
+    def intern_openlabel(self, openlabel: AveasOpenLabel) -> AveasOpenLabel:
+        """Interns all strings and uids of a document in place and returns it."""
+        frames = openlabel.frames
+        openlabel.frames = None
+        self._walk(openlabel)
+        if frames is not None:
+            uids = self._pools[Uid]
+            openlabel.frames = {uids.setdefault(uid, uid): self.intern_frame(frame) for uid, frame in frames.items()}
+        return openlabel
+
+    def intern_frame(self, frame: Frame) -> Frame:
+        """Interns all strings and uids of a frame in place and returns it."""
+        objects = frame.objects
+        frame.objects = None
+        self._walk(frame)
+        if objects is not None:
+            uids = self._pools[Uid]
+            for object_in_frame in objects.values():
+                object_data = object_in_frame.object_data
+                for attributes in object_data.__dict__.values():
+                    if attributes:
+                        self._intern_attributes(attributes)
+            frame.objects = {uids.setdefault(uid, uid): object_in_frame for uid, object_in_frame in objects.items()}
+        return frame
+
+    def _intern_attributes(self, attributes: list[Any]) -> None:
+        """The fast path for the attributes of frame objects, which make up most of a document."""
+        strings = self._pools[str]
+        for attribute in attributes:
+            values = attribute.__dict__
+            for name in _ATTRIBUTE_STRING_FIELDS:
+                value = values.get(name)
+                if value.__class__ is str:
+                    values[name] = strings.setdefault(value, value)
+
+    def _walk(self, value: Any) -> Any:
+        cls = value.__class__
+        pool = self._pools.get(cls)
+        if pool is not None:
+            return pool.setdefault(value, value)
+        if cls in _NUMBERS:
+            return value
+        if cls is dict:
+            return {self._walk(k): self._walk(v) for k, v in value.items()}
+        if cls is list:
+            if value and value[0].__class__ not in _NUMBERS:
+                value[:] = [self._walk(item) for item in value]
+            return value
+        if cls is tuple:
+            if value and value[0].__class__ not in _NUMBERS:
+                return tuple(self._walk(item) for item in value)
+            return value
+        if hasattr(cls, "__dataclass_fields__"):
+            attributes = value.__dict__
+            for name, attribute in attributes.items():
+                if attribute.__class__ not in _NUMBERS:
+                    attributes[name] = self._walk(attribute)
+        return value
@@ -0,0 +1,335 @@
+"""Merging of consecutive AVEAS OpenLABEL files into one scenario
+
+Long recordings are often split into files of a few minutes each. `merge` stitches such files together
+into a single file, streaming the frames of one input at a time to a `StreamingWriter`:
+
+>>> from aveas_openlabel.serialization.merge import merge
+>>> mappings = merge(["part-1.json.zst", "part-2.json.zst"], "recording.json.zst")
+>>> mappings[1].frame_offset, mappings[1].objects  # how the uids of the second file were changed
+(1500, {'3': '17'})
+
+Uids of a later input that are already used are remapped before its frames are read:
+
+- Frames whose numbers overlap the frames written so far are shifted to follow them, see `UidMapping.frame_offset`.
+  Frames that do not overlap, e.g. of files that continue the numbering of the previous file, keep their uids.
+- Objects with a uid that is already used are treated as the same object if they have the same name and type,
+  e.g. the recording vehicle of every part, unless ``match_objects`` is False. Otherwise, they get a new uid.
+- Events always get a new uid if theirs is already used. Contexts are kept once if they are equal,
+  and get a new uid otherwise.
+
+The frame intervals of the document, its objects and its events are recomputed, and the uids of the objects
+in frames and of the participants of events, as well as frame references of contexts, are remapped.
+The metadata is that of the first input. Of all other sections, the members of all inputs are combined,
+the first member of a key is kept.
+
+Frames whose uids and objects are not remapped are copied as JSON text, without being parsed.
+Only one input is held in memory at a time, uncompressed inputs are memory-mapped instead.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import io
+import json
+import mmap
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Sequence, TextIO, Union
+
+from uai_openlabel import FrameInterval
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.compression import (
+    Compression,
+    open_binary,
+    open_text,
+)
+from aveas_openlabel.serialization.sections import (
+    DELTA_FRAMES_MEMBER,
+    SECTIONS,
+    DeltaFramesError,
+    deserialize_document,
+    merge_frame_intervals,
+    serialize_section,
+)
+from aveas_openlabel.serialization.tokenizer import ByteRange, scan_document
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+_ROLE_A_NAME = "event_participant/role_a_id"
+_ROLE_B_NAME = "event_participants/role_b_ids"
+_MERGED_SECTIONS = ("objects", "events", "contexts")
+_COMBINED_SECTIONS = tuple(s for s in SECTIONS if s not in ("metadata", "frames", "frame_intervals", *_MERGED_SECTIONS))
+
+
+@dataclass
+class UidMapping:
+    """How the uids of one input of `merge` were changed. Uids that were not changed are not listed."""
+
+    frame_offset: int = 0
+    """The number that was added to the numeric frame uids and to the bounds of frame intervals."""
+
+    frames: dict[str, str] = field(default_factory=dict)
+    """The new uids of frames with non-numeric uids, e.g. UUIDs, by their uid in the input."""
+
+    objects: dict[str, str] = field(default_factory=dict)
+    """The new uids of objects by their uid in the input."""
+
+    events: dict[str, str] = field(default_factory=dict)
+    """The new uids of events by their uid in the input."""
+
+    contexts: dict[str, str] = field(default_factory=dict)
+    """The new uids of contexts by their uid in the input."""
+
+    def frame_uid(self, frame_uid: str) -> str:
+        """The uid of a frame of the input in the merged document."""
+        if _is_numeric(frame_uid):
+            return str(int(frame_uid) + self.frame_offset)
+        return self.frames.get(frame_uid, frame_uid)
+
+    def object_uid(self, object_uid: str) -> str:
+        """The uid of an object of the input in the merged document."""
+        return self.objects.get(object_uid, object_uid)
+
+
+def merge(
+    inputs: Sequence[Union[str, os.PathLike]],
+    output: Union[str, os.PathLike],
+    *,
+    match_objects: bool = True,
+    compression: Optional[Compression] = None,
+    level: Optional[int] = None,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> list[UidMapping]:
+    """Merges possibly compressed AVEAS OpenLABEL files into one, in the given order, see the module documentation.
+
+    :param match_objects: Whether objects of different inputs with the same uid, name and type are the same object.
+    :param compression: The compression of ``output``, by default according to its extension.
+        The compression of the inputs is detected.
+    :return: How the uids of each input were changed.
+    :raises DeltaFramesError: If the frames of an input are delta-encoded, see `aveas_openlabel.serialization.delta`.
+    """
+    if not inputs:
+        raise ValueError("At least one input is required.")
+    with open_text(output, "w", compression=compression, level=level) as f:
+        merger = _Merger(f, match_objects, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+        for path in inputs:
+            with open_binary(path, "rb") as binary:
+                if isinstance(binary, io.BufferedReader) and os.fstat(binary.fileno()).st_size > 0:
+                    with mmap.mmap(binary.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        merger.add(data)
+                else:
+                    with profiling.phase("read"):
+                        content = binary.read()
+                    merger.add(content)
+        merger.close()
+    return merger.mappings
+
+
+class _Merger:
+    """The state of a merge: the merged header sections, the uids in use and the mappings of the inputs so far.
+
+    The writer is created with the metadata of the first input, all other sections are written by `close`.
+    """
+
+    def __init__(self, file: TextIO, match_objects: bool, *, exclude_none: bool, exclude_defaults: bool):
+        self.match_objects = match_objects
+        self.sections: dict[str, Any] = {}
+        self.mappings: list[UidMapping] = []
+        self._file = file
+        self._exclude_none = exclude_none
+        self._exclude_defaults = exclude_defaults
+        self._header: Optional[AveasOpenLabel] = None
+        self._writer: Optional[StreamingWriter] = None
+        self._last_frame_number: Optional[int] = None
+        self._frame_uids: set[str] = set()
+
+    def add(self, data: Any) -> None:
+        """Adds the header of an input and writes its frames."""
+        with profiling.phase("parse"):
+            byte_ranges, frame_byte_ranges = scan_document(data)
+            if DELTA_FRAMES_MEMBER in byte_ranges:
+                raise DeltaFramesError()
+            header = {
+                section: json.loads(data[start:end])
+                for section, (start, end) in byte_ranges.items()
+                if section in SECTIONS and section not in ("frames", "frame_intervals")
+            }
+        mapping = self._mapping(header, frame_byte_ranges)
+        self._add_header(header, mapping)
+        self.mappings.append(mapping)
+
+        if self._writer is None:
+            self._header = deserialize_document({"metadata": self.sections["metadata"]})
+            self._writer = StreamingWriter(
+                self._file,
+                self._header,
+                deferred_sections=[s for s in SECTIONS if s != "metadata"],
+                exclude_none=self._exclude_none,
+                exclude_defaults=self._exclude_defaults,
+                compute_frame_intervals=True,
+            )
+        self._write_frames(data, frame_byte_ranges, mapping, self._writer)
+
+    def close(self) -> None:
+        """Writes the merged sections and the end of the document."""
+        assert self._header is not None and self._writer is not None
+        merged = deserialize_document(self.sections)
+        for section in SECTIONS:
+            if section not in ("metadata", "frames", "frame_intervals"):
+                setattr(self._header, section, getattr(merged, section))
+        self._writer.close()
+
+    def _mapping(self, header: dict[str, Any], frame_byte_ranges: dict[str, ByteRange]) -> UidMapping:
+        mapping = UidMapping()
+        frame_numbers = [int(uid) for uid in frame_byte_ranges if _is_numeric(uid)]
+        if frame_numbers and self._last_frame_number is not None and min(frame_numbers) <= self._last_frame_number:
+            mapping.frame_offset = self._last_frame_number + 1 - min(frame_numbers)
+        if frame_numbers:
+            last = max(frame_numbers) + mapping.frame_offset
+            self._last_frame_number = last if self._last_frame_number is None else max(last, self._last_frame_number)
+        for frame_uid in frame_byte_ranges:
+            if not _is_numeric(frame_uid) and frame_uid in self._frame_uids:
+                mapping.frames[frame_uid] = str(uuid.uuid4())
+
+        objects = self.sections.get("objects") or {}
+        for uid, obj in (header.get("objects") or {}).items():
+            if uid not in objects:
+                continue
+            existing = objects[uid]
+            if not (self.match_objects and (existing.get("name"), existing.get("type")) == (obj.get("name"), obj.get("type"))):
+                mapping.objects[uid] = _new_uid(objects, header["objects"], mapping.objects.values())
+        events = self.sections.get("events") or {}
+        for uid in header.get("events") or {}:
+            if uid in events:
+                mapping.events[uid] = _new_uid(events, header["events"], mapping.events.values())
+        contexts = self.sections.get("contexts") or {}
+        for uid, context in (header.get("contexts") or {}).items():
+            if uid in contexts and contexts[uid] != _shift_context(context, mapping.frame_offset):
+                mapping.contexts[uid] = _new_uid(contexts, header["contexts"], mapping.contexts.values())
+        return mapping
+
+    def _add_header(self, header: dict[str, Any], mapping: UidMapping) -> None:
+        offset = mapping.frame_offset
+        if not self.sections:
+            self.sections["metadata"] = header["metadata"]
+
+        if header.get("objects") is not None:
+            objects = self.sections.setdefault("objects", {})
+            for uid, obj in header["objects"].items():
+                new_uid = mapping.object_uid(uid)
+                intervals = _shift_frame_intervals(obj.get("frame_intervals"), offset)
+                if new_uid not in objects:
+                    objects[new_uid] = {**obj, "frame_intervals": intervals}
+                elif intervals is not None:
+                    existing = objects[new_uid]
+                    existing["frame_intervals"] = _merge_frame_intervals((existing.get("frame_intervals") or []) + intervals)
+
+        if header.get("events") is not None:
+            events = self.sections.setdefault("events", {})
+            for uid, event in header["events"].items():
+                event = {**event, "frame_intervals": _shift_frame_intervals(event.get("frame_intervals"), offset)}
+                events[mapping.events.get(uid, uid)] = _remap_participants(event, mapping)
+
+        if header.get("contexts") is not None:
+            contexts = self.sections.setdefault("contexts", {})
+            for uid, context in header["contexts"].items():
+                contexts.setdefault(mapping.contexts.get(uid, uid), _shift_context(context, offset))
+
+        for section in _COMBINED_SECTIONS:
+            if header.get(section) is not None:
+                combined = self.sections.setdefault(section, {} if isinstance(header[section], dict) else [])
+                if isinstance(combined, dict):
+                    for key, value in header[section].items():
+                        combined.setdefault(key, value)
+                else:
+                    combined.extend(value for value in header[section] if value not in combined)
+
+    def _write_frames(
+        self, data: Any, frame_byte_ranges: dict[str, ByteRange], mapping: UidMapping, writer: StreamingWriter
+    ) -> None:
+        for frame_uid, (start, end) in frame_byte_ranges.items():
+            new_uid = mapping.frame_uid(frame_uid)
+            if not _is_numeric(new_uid):
+                self._frame_uids.add(new_uid)
+            if not (mapping.objects or mapping.events or mapping.contexts):
+                with profiling.phase("read", "frames"):
+                    encoded_frame = bytes(data[start:end]).decode("utf-8")
+                writer.write_encoded_frame(new_uid, encoded_frame)
+                continue
+            with profiling.phase("parse", "frames", frame_uid):
+                frame = json.loads(data[start:end])
+            for member, uids in (("objects", mapping.objects), ("events", mapping.events), ("contexts", mapping.contexts)):
+                if uids and frame.get(member) is not None:
+                    frame[member] = {uids.get(uid, uid): value for uid, value in frame[member].items()}
+            writer.write_serialized_frame(new_uid, frame)
+
+
+def _is_numeric(uid: str) -> bool:
+    return uid.lstrip("-").isdigit()
+
+
+def _new_uid(*used: Iterable[str]) -> str:
+    """The next numeric uid after all numeric uids that are used, e.g. by the merged document or by the input."""
+    numbers = [int(uid) for uids in used for uid in uids if _is_numeric(uid)]
+    return str(max(numbers, default=-1) + 1)
+
+
+def _shift_frame_intervals(frame_intervals: Optional[list[dict[str, Any]]], offset: int) -> Optional[list[dict[str, Any]]]:
+    if frame_intervals is None or offset == 0:
+        return frame_intervals
+    return [
+        {**interval, "frame_start": int(interval["frame_start"]) + offset, "frame_end": int(interval["frame_end"]) + offset}
+        for interval in frame_intervals
+    ]
+
+
+def _merge_frame_intervals(frame_intervals: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    intervals = [FrameInterval(frame_start=i["frame_start"], frame_end=i["frame_end"]) for i in frame_intervals]
+    merged: list[dict[str, Any]] = serialize_section("frame_intervals", merge_frame_intervals(intervals))
+    return merged
+
+
+def _remap_participants(event: dict[str, Any], mapping: UidMapping) -> dict[str, Any]:
+    """A copy of a serialized event whose role A and role B participants refer to the merged objects."""
+    if not mapping.objects or not event.get("event_data"):
+        return event
+    event_data = dict(event["event_data"])
+    event_data["text"] = [
+        {**text, "val": mapping.object_uid(text["val"])} if text.get("name") == _ROLE_A_NAME else text
+        for text in event_data.get("text") or []
+    ]
+    event_data["vec"] = [
+        {**vec, "val": [mapping.object_uid(uid) for uid in vec["val"]]} if vec.get("name") == _ROLE_B_NAME else vec
+        for vec in event_data.get("vec") or []
+    ]
+    return {**event, "event_data": event_data}
+
+
+def _shift_context(context: dict[str, Any], offset: int) -> dict[str, Any]:
+    """A copy of a serialized context whose frame references, e.g. ``scenario/minimum_vehicle_speed/frame``, are shifted."""
+    context_data = context.get("context_data")
+    if offset == 0 or not context_data or not context_data.get("text"):
+        return context
+    texts = [
+        (
+            {**text, "val": str(int(text["val"]) + offset)}
+            if str(text.get("name", "")).endswith("/frame") and _is_numeric(str(text.get("val", "")))
+            else text
+        )
+        for text in context_data["text"]
+    ]
+    return {**context, "context_data": {**context_data, "text": texts}}
@@ -0,0 +1,193 @@
+"""Parallel deserialization and serialization of AVEAS OpenLABEL files
+
+``AveasOpenLabel.from_dict`` deserializes all frames in a single thread, which leaves most cores of a conversion host idle.
+`load_parallel` locates the frames with `aveas_openlabel.serialization.tokenizer.scan_document`,
+splits them into chunks of consecutive frames and deserializes the chunks in a ``ProcessPoolExecutor``.
+Each chunk is sent to its worker as a single ``bytes`` object with the offsets of its frames,
+so no intermediate Python objects have to be pickled on the way to the workers.
+
+>>> from aveas_openlabel.serialization.parallel import dump_parallel, load_parallel
+>>> openlabel = load_parallel("path/to/input.json", max_workers=32)
+>>> dump_parallel(openlabel, "path/to/file.json", max_workers=32)
+
+The `Frame` dataclasses still have to be pickled on their way back, which costs about as much as
+unpickling a serialized frame takes in the main process. The speedup is therefore bounded
+by the time in which the main process can unpickle the frames, and is largest for frames with many objects.
+
+`dump_parallel` serializes chunks of frames to JSON text in worker processes and writes the fragments in frame order
+with `aveas_openlabel.serialization.writer.StreamingWriter`. Its output is byte-identical to that of
+`aveas_openlabel.serialization.compression.dump`. Pickling frames to the workers is much cheaper than serializing them,
+so writing scales better with the number of workers than reading.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import io
+import json
+import mmap
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any, Iterable, Optional, Union
+
+from uai_openlabel import Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.compression import (
+    Compression,
+    open_binary,
+    open_text,
+)
+from aveas_openlabel.serialization.delta import expand_delta_frames
+from aveas_openlabel.serialization.interning import StringPool
+from aveas_openlabel.serialization.sections import (
+    DELTA_FRAMES_MEMBER,
+    deserialize_document,
+    deserialize_frame,
+    serialize_frame,
+)
+from aveas_openlabel.serialization.tokenizer import ByteRange, is_null, scan_document
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+DEFAULT_CHUNK_SIZE = 256
+"""The default number of frames that are sent to a worker at once."""
+
+
+def load_parallel(
+    path: Union[str, os.PathLike],
+    *,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compression: Optional[Compression] = None,
+    intern_strings: bool = False,
+) -> AveasOpenLabel:
+    """Reads an AVEAS OpenLABEL file and deserializes its frames in parallel worker processes.
+
+    The result is the same as that of `aveas_openlabel.serialization.compression.load`.
+    All sections except ``frames`` are deserialized in the calling process. The frames of delta-encoded files,
+    see `aveas_openlabel.serialization.delta`, have to be expanded in order and are deserialized in the calling
+    process as well.
+
+    :param max_workers: The number of worker processes, by default the number of CPUs.
+        With ``max_workers=1``, all frames are deserialized in the calling process.
+    :param chunk_size: The number of consecutive frames that are deserialized by a worker at once.
+    :param intern_strings: Whether repeated strings and uids share one object, see
+        `aveas_openlabel.serialization.interning`. This saves some memory, but makes loading slower.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+    with open_binary(path, "rb", compression=compression) as f:
+        if isinstance(f, io.BufferedReader) and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                openlabel = _parse_parallel(data, max_workers, chunk_size)
+        else:
+            openlabel = _parse_parallel(f.read(), max_workers, chunk_size)
+    if not intern_strings:
+        return openlabel
+    with profiling.phase("deserialize"):
+        return StringPool().intern_openlabel(openlabel)
+
+
+def dump_parallel(
+    openlabel: AveasOpenLabel,
+    path: Union[str, os.PathLike],
+    *,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compression: Optional[Compression] = None,
+    level: Optional[int] = None,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> None:
+    """Writes an AVEAS OpenLABEL file, serializing its frames in parallel worker processes.
+
+    The file is byte-identical to the one written by `aveas_openlabel.serialization.compression.dump`
+    with the same arguments.
+
+    :param max_workers: The number of worker processes, by default the number of CPUs.
+        With ``max_workers=1``, all frames are serialized in the calling process.
+    :param chunk_size: The number of consecutive frames that are serialized by a worker at once.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+    frame_items = list((openlabel.frames or {}).items())
+    header = replace(openlabel, frames=None if openlabel.frames is None else {})
+    chunks = [[frame for _, frame in frame_items[i : i + chunk_size]] for i in range(0, len(frame_items), chunk_size)]
+
+    with open_text(path, "w", compression=compression, level=level) as f:
+        writer = StreamingWriter(f, header, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+        if max_workers == 1 or len(chunks) <= 1:
+            encoded_chunks: Iterable[list[str]] = (_serialize_chunk(chunk, exclude_none, exclude_defaults) for chunk in chunks)
+            _write_encoded_chunks(writer, frame_items, encoded_chunks)
+        else:
+            executor: Executor
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                encoded_chunks = executor.map(
+                    _serialize_chunk, chunks, [exclude_none] * len(chunks), [exclude_defaults] * len(chunks)
+                )
+                _write_encoded_chunks(writer, frame_items, encoded_chunks)
+        writer.close()
+
+
+def _parse_parallel(data: Any, max_workers: Optional[int], chunk_size: int) -> AveasOpenLabel:
+    with profiling.phase("parse"):
+        sections, frame_byte_ranges = scan_document(data)
+        values = {section: json.loads(data[start:end]) for section, (start, end) in sections.items() if section != "frames"}
+    if DELTA_FRAMES_MEMBER in values:
+        return deserialize_document(expand_delta_frames(values))
+    openlabel = deserialize_document(values)
+    if "frames" not in sections or is_null(data, sections["frames"]):
+        return openlabel
+
+    frame_uids = list(frame_byte_ranges)
+    byte_ranges = list(frame_byte_ranges.values())
+    chunks = [_chunk(data, byte_ranges[i : i + chunk_size]) for i in range(0, len(byte_ranges), chunk_size)]
+    with profiling.phase("deserialize", "frames"):
+        if max_workers == 1 or len(chunks) <= 1:
+            frames = [frame for chunk in chunks for frame in _deserialize_chunk(*chunk)]
+        else:
+            executor: Executor
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                frames = [frame for chunk_frames in executor.map(_deserialize_chunk, *zip(*chunks)) for frame in chunk_frames]
+
+    openlabel.frames = {Uid(frame_uid): frame for frame_uid, frame in zip(frame_uids, frames)}
+    return openlabel
+
+
+def _chunk(data: Any, byte_ranges: list[ByteRange]) -> tuple[bytes, list[ByteRange]]:
+    """Copies the bytes of consecutive frames into a single object, with the byte ranges relative to it."""
+    offset = byte_ranges[0][0]
+    return bytes(data[offset : byte_ranges[-1][1]]), [(start - offset, end - offset) for start, end in byte_ranges]
+
+
+def _deserialize_chunk(data: bytes, byte_ranges: list[ByteRange]) -> list[Frame]:
+    return [deserialize_frame(json.loads(data[start:end])) for start, end in byte_ranges]
+
+
+def _serialize_chunk(frames: list[Frame], exclude_none: bool, exclude_defaults: bool) -> list[str]:
+    return [
+        json.dumps(serialize_frame(frame, exclude_none=exclude_none, exclude_defaults=exclude_defaults)) for frame in frames
+    ]
+
+
+def _write_encoded_chunks(
+    writer: StreamingWriter, frame_items: list[tuple[Uid, Frame]], encoded_chunks: Iterable[list[str]]
+) -> None:
+    frame_uids = (frame_uid for frame_uid, _ in frame_items)
+    for encoded_chunk in encoded_chunks:
+        for encoded_frame, frame_uid in zip(encoded_chunk, frame_uids):  # stops before taking an extra uid
+            writer.write_encoded_frame(frame_uid, encoded_frame)
@@ -0,0 +1,226 @@
+"""Opt-in profiling of the phases of reading and writing AVEAS OpenLABEL files
+
+A `Profiler` records the wall time and the allocated memory blocks of every phase of the read and write paths,
+per top-level section, and keeps track of the slowest frames. It is enabled for everything that runs inside its
+``with`` block in the same thread or task:
+
+>>> from aveas_openlabel.serialization.compression import load
+>>> from aveas_openlabel.serialization.profiling import Profiler
+>>> with Profiler() as profiler:
+...     openlabel = load("path/to/input.json")
+>>> report = profiler.report()
+>>> print(report.format())
+>>> report.phases["deserialize"].seconds
+
+The phases are:
+
+* ``read``: reading and decompressing the file
+* ``parse``: decoding the JSON text, or locating sections and frames with `aveas_openlabel.serialization.tokenizer`
+* ``deserialize``: converting JSON values into dataclasses, including the resolution of union types,
+  which apischema does while constructing the dataclasses
+* ``validate``: the ``EachAttributeOnlyOnceEnforcer`` checks, which run whenever the classes of
+  `aveas_openlabel.object_data` and `aveas_openlabel.object_in_frame_data` are constructed, as part of the
+  enclosing phase. Loaded documents hold the ``ObjectData`` of uai_openlabel, so loading does not validate
+* ``serialize``: converting dataclasses into JSON values
+* ``encode``: formatting JSON values as text
+* ``write``: writing and compressing the text
+
+Phases nest, the time of a nested phase such as ``validate`` is also part of the enclosing phase.
+Without an active profiler, the instrumentation costs a single context variable lookup per phase.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import heapq
+import sys
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Iterator, Optional
+
+from aveas_openlabel.attribute_enforcer import VALIDATION_PHASE
+
+PHASES = ("read", "parse", "deserialize", "validate", "serialize", "encode", "write")
+"""The phases of the read and write paths, in the order in which they are reported."""
+
+_ACTIVE_PROFILER: ContextVar[Optional["Profiler"]] = ContextVar("active_profiler", default=None)
+_NO_PROFILING: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass
+class PhaseStatistics:
+    """The accumulated cost of all runs of a phase."""
+
+    calls: int = 0
+    """How often the phase ran."""
+
+    seconds: float = 0.0
+    """The total wall time of all runs."""
+
+    allocated_blocks: int = 0
+    """The net number of memory blocks allocated by Python, i.e. the allocated minus the freed blocks.
+
+    This is the number of objects that a phase created and kept alive, e.g. the dataclasses created during deserialization.
+    """
+
+    def add(self, seconds: float, allocated_blocks: int) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.allocated_blocks += allocated_blocks
+
+
+@dataclass(order=True)
+class FrameTiming:
+    """The time that a phase took for a single frame."""
+
+    seconds: float
+    """The wall time of the phase for this frame."""
+
+    phase: str = field(compare=False)
+    """The phase, e.g. ``"deserialize"``."""
+
+    frame_uid: str = field(compare=False)
+    """The uid of the frame."""
+
+
+@dataclass
+class ProfileReport:
+    """The result of a `Profiler`."""
+
+    phases: dict[str, PhaseStatistics] = field(default_factory=dict)
+    """The statistics of every phase that ran, over all sections."""
+
+    sections: dict[str, dict[str, PhaseStatistics]] = field(default_factory=dict)
+    """The statistics of every phase that ran, by top-level section, e.g. ``sections["frames"]["deserialize"]``.
+
+    Phases that did not run for a single section, e.g. decoding a whole document, are only part of `phases`."""
+
+    slowest_frames: list[FrameTiming] = field(default_factory=list)
+    """The slowest frames over all phases, the slowest first."""
+
+    def to_dict(self) -> dict[str, Any]:
+        """The report as JSON-serializable dict, e.g. to compare the profiles of several files."""
+        return {
+            "phases": {phase: vars(statistics) for phase, statistics in self.phases.items()},
+            "sections": {
+                section: {phase: vars(statistics) for phase, statistics in phases.items()}
+                for section, phases in self.sections.items()
+            },
+            "slowest_frames": [vars(timing) for timing in self.slowest_frames],
+        }
+
+    def format(self) -> str:
+        """The report as human-readable text table."""
+        lines = [f"{'phase':<28}{'calls':>10}{'seconds':>12}{'blocks':>14}"]
+        rows = [(phase, statistics) for phase, statistics in self.phases.items()]
+        for section, phases in self.sections.items():
+            rows.extend((f"  {section}/{phase}", statistics) for phase, statistics in phases.items())
+        for name, statistics in rows:
+            lines.append(f"{name:<28}{statistics.calls:>10}{statistics.seconds:>12.4f}{statistics.allocated_blocks:>14}")
+        if self.slowest_frames:
+            lines.append("slowest frames:")
+            lines.extend(f"  {t.frame_uid} ({t.phase}): {t.seconds:.6f} s" for t in self.slowest_frames)
+        return "\n".join(lines)
+
+
+class Profiler:
+    """Records the phases of all reads and writes inside its ``with`` block, see `ProfileReport`.
+
+    A profiler can be entered several times, e.g. to profile a sequence of files, and accumulates over all runs.
+
+    :param slowest_frames: The number of slowest frames to keep.
+    """
+
+    def __init__(self, slowest_frames: int = 10):
+        self._slowest_frames_count = slowest_frames
+        self._phases: dict[str, PhaseStatistics] = {}
+        self._sections: dict[str, dict[str, PhaseStatistics]] = {}
+        self._slowest_frames: list[FrameTiming] = []
+        self._section_stack: list[Optional[str]] = []
+        self._tokens: list[tuple[Token[Optional[Profiler]], Token[Any]]] = []
+
+    @contextmanager
+    def phase(self, name: str, section: Optional[str] = None, frame_uid: Optional[str] = None) -> Iterator[None]:
+        """Records a phase. Nested phases without a section are attributed to the section of the enclosing phase."""
+        if section is None and self._section_stack:
+            section = self._section_stack[-1]
+        self._section_stack.append(section)
+        allocated_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            allocated_blocks = sys.getallocatedblocks() - allocated_blocks
+            self._section_stack.pop()
+            self._phases.setdefault(name, PhaseStatistics()).add(seconds, allocated_blocks)
+            if section is not None:
+                self._sections.setdefault(section, {}).setdefault(name, PhaseStatistics()).add(seconds, allocated_blocks)
+            if frame_uid is not None and self._slowest_frames_count > 0:
+                timing = FrameTiming(seconds, name, frame_uid)
+                if len(self._slowest_frames) < self._slowest_frames_count:
+                    heapq.heappush(self._slowest_frames, timing)
+                elif timing > self._slowest_frames[0]:
+                    heapq.heapreplace(self._slowest_frames, timing)
+
+    def report(self) -> ProfileReport:
+        """The statistics recorded so far, with the phases in the order of `PHASES`."""
+
+        def ordered(phases: dict[str, PhaseStatistics]) -> dict[str, PhaseStatistics]:
+            order = {phase: i for i, phase in enumerate(PHASES)}
+            return {p: PhaseStatistics(**vars(s)) for p, s in sorted(phases.items(), key=lambda i: order.get(i[0], len(order)))}
+
+        return ProfileReport(
+            phases=ordered(self._phases),
+            sections={section: ordered(phases) for section, phases in self._sections.items()},
+            slowest_frames=sorted(self._slowest_frames, reverse=True),
+        )
+
+    def __enter__(self) -> "Profiler":
+        self._tokens.append((_ACTIVE_PROFILER.set(self), VALIDATION_PHASE.set(self._validation_phase)))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        profiler_token, validation_phase_token = self._tokens.pop()
+        VALIDATION_PHASE.reset(validation_phase_token)
+        _ACTIVE_PROFILER.reset(profiler_token)
+
+    def _validation_phase(self) -> AbstractContextManager[None]:
+        return self.phase("validate")
+
+
+def active_profiler() -> Optional[Profiler]:
+    """The profiler of the enclosing ``with Profiler()`` block, if any."""
+    return _ACTIVE_PROFILER.get()
+
+
+def phase(name: str, section: Optional[str] = None, frame_uid: Optional[str] = None) -> AbstractContextManager[None]:
+    """Records a phase with the active profiler, if any, see `Profiler.phase`.
+
+    :param name: One of `PHASES`.
+    :param section: The top-level section that the phase works on, if any.
+    :param frame_uid: The frame that the phase works on, if any. Only phases with a frame uid count for the slowest frames.
+    """
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is None:
+        return _NO_PROFILING
+    return profiler.phase(name, section, frame_uid)
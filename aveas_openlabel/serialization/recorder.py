@@ -0,0 +1,260 @@
+"""Recording of AVEAS OpenLABEL files during live acquisition
+
+`OnlineRecorder` writes an OpenLABEL file while the data is being acquired,
+e.g. for recordings with `aveas_openlabel.metadata.AcquisitionMethod.IN_VEHICLE`.
+Frames are handed over at sensor rate and are serialized and written by a background writer thread,
+so that `OnlineRecorder.record` only has to enqueue them.
+When the recorder is closed, the ``objects`` (including their frame intervals and summary statistics) and the
+``frame_intervals`` of the scenario are written.
+
+If the process dies mid-recording, the partially written file can be completed with `recover`.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Optional, Union
+
+from uai_openlabel import Object, ObjectUid, Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization.sections import (
+    deserialize_section,
+    frame_intervals_from_uids,
+    serialize_frame,
+    serialize_section,
+)
+from aveas_openlabel.serialization.statistics import (
+    ObjectStatistics,
+    add_frame_to_statistics,
+    finalize_objects,
+)
+from aveas_openlabel.serialization.writer import StreamingWriter, WriterStateError
+
+RECOVERY_SUFFIX = ".recovery.json"
+"""Suffix of the sidecar file in which `OnlineRecorder` checkpoints the objects of an unfinished recording."""
+
+
+class RecoveryError(ValueError):
+    """Exception that is raised when a partially written recording cannot be recovered."""
+
+
+class OnlineRecorder:
+    """Records an AVEAS OpenLABEL file frame by frame while the data is being acquired.
+
+    The file at ``path`` is created right away and all sections of ``header`` except ``frames``, ``frame_intervals``
+    and ``objects`` are written. Frames passed to `record` are queued and written by a background thread,
+    which flushes the file at least every ``flush_interval`` seconds.
+    At most ``max_pending_frames`` frames are queued, after which `record` blocks until the writer caught up.
+
+    Objects can be passed in ``header.objects`` or added while recording with `add_object`.
+    They are written on `close`, together with their frame intervals and their summary speed and acceleration
+    attributes, which are computed from the recorded frames.
+    Until then, they are checkpointed in a sidecar file next to ``path`` (see `recover`).
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        header: AveasOpenLabel,
+        *,
+        max_pending_frames: int = 1024,
+        flush_interval: float = 1.0,
+        fsync: bool = False,
+        exclude_none: bool = False,
+    ):
+        self._path = Path(path)
+        self._recovery_path = Path(f"{self._path}{RECOVERY_SUFFIX}")
+        self._header = replace(header, frames=None, objects=None)
+        self._objects: dict[ObjectUid, Object] = dict(header.objects or {})
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+        self._exclude_none = exclude_none
+
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_pending_frames)
+        self._objects_lock = threading.Lock()
+        self._objects_changed = True
+        self._statistics: dict[ObjectUid, ObjectStatistics] = {}
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._file = open(self._path, "w", encoding="utf-8")
+        self._writer = StreamingWriter(
+            self._file, self._header, deferred_sections=("objects",), exclude_none=exclude_none, compute_frame_intervals=True
+        )
+        self._writer.start_frames()  # completes the header line that `recover` expects
+        self._checkpoint_objects()
+        self._thread = threading.Thread(target=self._write_frames, name=f"OnlineRecorder({self._path.name})", daemon=True)
+        self._thread.start()
+
+        for frame_uid, frame in (header.frames or {}).items():
+            self.record(frame_uid, frame)
+
+    @property
+    def path(self) -> Path:
+        """The path of the file being recorded."""
+        return self._path
+
+    def record(self, frame_uid: Union[Uid, int, str], frame: Frame) -> None:
+        """Queues ``frame`` for writing. Blocks only if ``max_pending_frames`` frames are already pending."""
+        if self._closed:
+            raise WriterStateError("Cannot record frames after the recorder has been closed.")
+        self._raise_writer_error()
+        self._queue.put((frame_uid, frame))
+
+    def add_object(self, object_uid: ObjectUid, scenario_object: Object) -> None:
+        """Adds an object, e.g. when a traffic participant is first detected."""
+        with self._objects_lock:
+            self._objects[object_uid] = scenario_object
+            self._objects_changed = True
+
+    def close(self) -> None:
+        """Waits until all queued frames are written and completes the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        try:
+            self._raise_writer_error()
+            with self._objects_lock:
+                self._header.objects = finalize_objects(self._objects, self._statistics)
+            self._writer.close()
+            self._sync()
+        finally:
+            self._file.close()
+        self._recovery_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "OnlineRecorder":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _write_frames(self) -> None:
+        last_flush = time.monotonic()
+        try:
+            while True:
+                timeout = max(0.0, last_flush + self._flush_interval - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is self._STOP:
+                    return
+                if item is not None:
+                    frame_uid, frame = item
+                    serialized_frame = serialize_frame(frame, exclude_none=self._exclude_none)
+                    self._writer.write_serialized_frame(frame_uid, serialized_frame)
+                    add_frame_to_statistics(self._statistics, frame_uid, serialized_frame)
+                if time.monotonic() - last_flush >= self._flush_interval:
+                    self._sync()
+                    self._checkpoint_objects()
+                    last_flush = time.monotonic()
+        except BaseException as e:
+            self._error = e
+            # Keep draining so that producers blocked in `record` do not wait forever
+            while self._queue.get() is not self._STOP:
+                pass
+
+    def _sync(self) -> None:
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def _checkpoint_objects(self) -> None:
+        with self._objects_lock:
+            if not self._objects_changed:
+                return
+            serialized_objects = serialize_section("objects", self._objects, exclude_none=self._exclude_none)
+            self._objects_changed = False
+        temporary_path = Path(f"{self._recovery_path}.tmp")
+        temporary_path.write_text(json.dumps({"objects": serialized_objects}), encoding="utf-8")
+        os.replace(temporary_path, self._recovery_path)
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            raise WriterStateError("The writer thread of the recorder failed.") from self._error
+
+
+def recover(path: Union[str, os.PathLike]) -> int:
+    """Completes a recording of `OnlineRecorder` that was interrupted before `OnlineRecorder.close` was called.
+
+    The file is cut after its last completely written frame, and the frame intervals and the objects checkpointed
+    in the sidecar file are appended, with their summary attributes computed from the recovered frames.
+    Files that are already complete are left unchanged.
+
+    `OnlineRecorder` writes the sidecar file before the first frame. If it is missing nevertheless, e.g. because it
+    was deleted, ``objects`` is written as ``null``: frames only hold the dynamic data of objects, but not their
+    names and types, so the objects cannot be restored from the frames.
+
+    :return: The number of recovered frames.
+    """
+    path = Path(path)
+    recovery_path = Path(f"{path}{RECOVERY_SUFFIX}")
+    frame_uids: list[str] = []
+    statistics: dict[ObjectUid, ObjectStatistics] = {}
+
+    with open(path, "rb+") as f:
+        header_line = f.readline()
+        if not header_line.rstrip(b"\n").endswith(b'"frames": {'):
+            raise RecoveryError(f"{path} does not start with a complete header and cannot be recovered.")
+        end_of_last_frame = len(header_line.rstrip(b"\n"))
+
+        offset = len(header_line)
+        for line in f:
+            if line.startswith(b"}"):
+                return len(frame_uids)  # the file has been completed already
+            body = line.rstrip(b"\n").rstrip(b",")
+            try:
+                ((frame_uid, serialized_frame),) = json.loads(b"{" + body + b"}").items()
+            except ValueError:
+                break
+            frame_uids.append(frame_uid)
+            add_frame_to_statistics(statistics, frame_uid, serialized_frame)
+            end_of_last_frame = offset + len(body)
+            offset += len(line)
+
+        objects = None
+        if recovery_path.exists():
+            checkpoint = json.loads(recovery_path.read_text(encoding="utf-8"))
+            objects = finalize_objects(deserialize_section("objects", checkpoint["objects"]), statistics)
+
+        serialized_frame_intervals = serialize_section("frame_intervals", frame_intervals_from_uids(frame_uids))
+        serialized_objects = serialize_section("objects", objects, exclude_none=True)
+        f.seek(end_of_last_frame)
+        f.truncate()
+        f.write(
+            f"\n}}, {json.dumps('frame_intervals')}: {json.dumps(serialized_frame_intervals)}, "
+            f"{json.dumps('objects')}: {json.dumps(serialized_objects)}}}}}\n".encode()
+        )
+
+    recovery_path.unlink(missing_ok=True)
+    return len(frame_uids)
@@ -0,0 +1,219 @@
+"""A cached JSON schema of AVEAS OpenLABEL and a precompiled validator for it
+
+``apischema.json_schema.deserialization_schema(AveasOpenLabel)`` walks the whole type tree on every call.
+`json_schema` generates the schema once per AVEAS schema version, keeps it in memory and in the cache directory of
+`aveas_openlabel.serialization.cache`, so later processes read it from disk instead of generating it again.
+
+`SchemaValidator` compiles a schema into Python code with ``fastjsonschema`` once and then checks JSON documents
+against it without interpreting the schema again, e.g. to screen files from partners before they are loaded:
+
+>>> from aveas_openlabel.serialization.schema import validator
+>>> error = validator().check_file("path/to/input.json.zst")
+>>> if error is not None:
+...     print(f"{error.path}: {error.message}")
+
+Documents are checked as returned by ``json.load``, with or without the ``openlabel`` root key.
+`SchemaValidator` requires the optional ``fastjsonschema`` package.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import copy
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional, Union
+
+import apischema
+from apischema.json_schema import (
+    JsonSchemaVersion,
+    deserialization_schema,
+    serialization_schema,
+)
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.metadata import Metadata
+from aveas_openlabel.serialization.cache import default_cache_directory
+from aveas_openlabel.serialization.compression import Compression, open_text
+from aveas_openlabel.serialization.sections import unwrap_root
+
+SchemaKind = Literal["deserialization", "serialization"]
+"""The JSON schema of the documents that ``AveasOpenLabel.from_dict`` accepts, or of those that ``to_dict`` produces."""
+
+_NULL_SCHEMA = {"type": "null"}
+
+
+class MissingValidatorError(ImportError):
+    """Exception that is raised when a `SchemaValidator` is created without the optional ``fastjsonschema`` package."""
+
+
+@dataclass
+class SchemaError:
+    """A violation of the schema in a document."""
+
+    path: str
+    """The JSON pointer of the invalid value, e.g. ``/frames/12/objects/3/object_data``."""
+
+    message: str
+    """A description of the violation."""
+
+
+class SchemaValidationError(ValueError):
+    """Exception that is raised when a document does not match the schema."""
+
+    def __init__(self, error: SchemaError):
+        self.error = error
+        """The violation that was found."""
+        super().__init__(f"{error.path or '/'}: {error.message}")
+
+
+def json_schema(
+    kind: SchemaKind = "deserialization", *, cache_directory: Optional[Union[str, os.PathLike]] = None
+) -> dict[str, Any]:
+    """The JSON schema of `AveasOpenLabel`, as generated by apischema with the aliases of ``AveasOpenLabel.to_dict``.
+
+    The schema follows JSON Schema draft 7, the latest draft that ``fastjsonschema`` implements completely.
+    It is generated once per ``aveas_schema_version`` of ``aveas_openlabel.metadata.Metadata`` and stored in memory
+    and in ``cache_directory``, by default `aveas_openlabel.serialization.cache.default_cache_directory`.
+    Every call returns a new copy that may be modified.
+
+    apischema restricts optional fields with a literal type, e.g. ``BooleanData.type``, with a ``const`` or ``enum``
+    that excludes ``null``, although their default is None and ``to_dict`` writes them as ``null``.
+    ``null`` is added to these ``const`` and ``enum`` keywords, so that the documents written by this library are valid.
+    """
+    directory = Path(cache_directory) if cache_directory is not None else default_cache_directory()
+    schema: dict[str, Any] = json.loads(_schema_text(kind, str(directory), _schema_version()))
+    return schema
+
+
+class SchemaValidator:
+    """Checks JSON documents against a JSON schema that has been compiled once, see the module documentation.
+
+    Checking stops at the first violation, so at most one violation is reported per document.
+
+    :param schema: The schema, by default the deserialization schema of `json_schema`.
+    """
+
+    def __init__(self, schema: Optional[dict[str, Any]] = None):
+        fastjsonschema = _fastjsonschema()
+        self.schema = schema if schema is not None else json_schema()
+        """The schema that the validator checks against."""
+        # without use_default, fastjsonschema does not insert the defaults of the schema into checked documents
+        self._validate: Callable[[Any], Any] = fastjsonschema.compile(self.schema, use_default=False)
+        self._exception_class: Any = fastjsonschema.JsonSchemaValueException
+
+    def is_valid(self, document: Any) -> bool:
+        """Whether a JSON document matches the schema."""
+        return self.error(document) is None
+
+    def error(self, document: Any) -> Optional[SchemaError]:
+        """The first violation of the schema in a JSON document, or None if the document is valid."""
+        try:
+            self._validate(unwrap_root(document) if isinstance(document, dict) else document)
+        except self._exception_class as e:
+            path = "".join(f"/{_escape(str(token))}" for token in e.path[1:])
+            return SchemaError(path, e.message.removeprefix(f"{e.name} "))
+        return None
+
+    def validate(self, document: Any) -> None:
+        """Raises a `SchemaValidationError` if a JSON document does not match the schema."""
+        error = self.error(document)
+        if error is not None:
+            raise SchemaValidationError(error)
+
+    def check_file(self, path: Union[str, os.PathLike], *, compression: Optional[Compression] = None) -> Optional[SchemaError]:
+        """The first violation of the schema in a possibly compressed JSON file, see `error`."""
+        with open_text(path, "r", compression=compression) as f:
+            document = json.load(f)
+        return self.error(document)
+
+
+@lru_cache(maxsize=None)
+def validator(kind: SchemaKind = "deserialization") -> SchemaValidator:
+    """The validator of the cached `json_schema`, compiled once per process."""
+    return SchemaValidator(json_schema(kind))
+
+
+def _fastjsonschema() -> Any:
+    try:
+        import fastjsonschema  # type: ignore[import-not-found, import-untyped, unused-ignore]
+    except ImportError as e:
+        raise MissingValidatorError(
+            "The schema validator requires the fastjsonschema package, install it with 'pip install fastjsonschema'."
+        ) from e
+    return fastjsonschema
+
+
+def _schema_version() -> str:
+    return str(Metadata.__dataclass_fields__["aveas_schema_version"].default)
+
+
+@lru_cache(maxsize=None)
+def _schema_text(kind: SchemaKind, directory: str, schema_version: str) -> str:
+    path = Path(directory) / f"schema-{kind}-{schema_version}.json"
+    try:
+        return path.read_text()
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    generate = deserialization_schema if kind == "deserialization" else serialization_schema
+    schema = generate(AveasOpenLabel, aliaser=apischema.utils.to_snake_case, version=JsonSchemaVersion.DRAFT_7)
+    text = json.dumps(_allow_null_literals(schema))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+        with os.fdopen(file_descriptor, "w") as f:
+            f.write(text)
+        os.replace(temporary_path, path)
+    except OSError:  # the schema is still cached in memory
+        pass
+    return text
+
+
+def _allow_null_literals(schema: Any) -> Any:
+    """A copy of ``schema`` in which ``null`` is added to the ``const`` and ``enum`` of nullable subschemas.
+
+    ``{"type": "null"}`` is also moved to the front of every ``anyOf``, as ``fastjsonschema`` checks the alternatives
+    in order and most optional values of documents are ``null``.
+    """
+    schema = copy.deepcopy(schema)
+    _add_null_to_literals(schema)
+    return schema
+
+
+def _add_null_to_literals(schema: Any) -> None:
+    if isinstance(schema, list):
+        for subschema in schema:
+            _add_null_to_literals(subschema)
+        return
+    if not isinstance(schema, dict):
+        return
+    for keyword, subschema in schema.items():
+        if keyword not in ("const", "enum", "default"):
+            _add_null_to_literals(subschema)
+    if isinstance(schema.get("type"), list) and "null" in schema["type"]:
+        if "const" in schema:
+            schema["enum"] = [schema.pop("const"), None]
+        elif "enum" in schema and None not in schema["enum"]:
+            schema["enum"].append(None)
+    if _NULL_SCHEMA in schema.get("anyOf", ()):
+        schema["anyOf"] = [_NULL_SCHEMA, *(subschema for subschema in schema["anyOf"] if subschema != _NULL_SCHEMA)]
+
+
+def _escape(name: str) -> str:
+    return name.replace("~", "~0").replace("/", "~1")
@@ -0,0 +1,168 @@
+"""Serialization of the individual top-level sections of an `AveasOpenLabel`
+
+``AveasOpenLabel.to_dict`` and ``AveasOpenLabel.from_dict`` always convert the whole document at once.
+The functions in this module convert a single section (e.g. ``metadata`` or ``objects``) or a single `Frame` instead,
+producing exactly the same dicts as the corresponding part of ``AveasOpenLabel.to_dict``.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Union, get_type_hints
+
+import apischema
+from uai_openlabel import FrameInterval, Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization import profiling
+
+SECTIONS: tuple[str, ...] = tuple(f.name for f in fields(AveasOpenLabel))
+"""The names of all top-level sections of an `AveasOpenLabel`, in the order in which ``AveasOpenLabel.to_dict`` writes them."""
+
+ROOT_KEY = "openlabel"
+"""The root key that wraps every OpenLABEL JSON document."""
+
+DELTA_FRAMES_MEMBER = "delta_frames"
+"""The top-level member that holds the frames of delta-encoded files, see `aveas_openlabel.serialization.delta`."""
+
+
+class UnknownSectionError(KeyError):
+    """Exception that is raised when a section name is not a field of `AveasOpenLabel`."""
+
+    def __init__(self, section: str):
+        super().__init__(f"{section} is not a top-level section of AveasOpenLabel. Valid sections are {list(SECTIONS)}.")
+
+
+class DeltaFramesError(ValueError):
+    """Exception that is raised by readers that cannot expand the frames of delta-encoded files."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            f"The frames of the document are delta-encoded in {DELTA_FRAMES_MEMBER!r}. Read it with "
+            "aveas_openlabel.serialization.compression.load or aveas_openlabel.serialization.delta.DeltaFile."
+        )
+
+
+@lru_cache(maxsize=None)
+def section_type(section: str) -> Any:
+    """The type annotation of the top-level section ``section`` of `AveasOpenLabel`."""
+    if section not in SECTIONS:
+        raise UnknownSectionError(section)
+    return get_type_hints(AveasOpenLabel)[section]
+
+
+def serialize_section(section: str, value: Any, *, exclude_none: bool = False, exclude_defaults: bool = False) -> Any:
+    """Serializes the value of a single top-level section as ``AveasOpenLabel.to_dict`` would."""
+    return apischema.serialize(
+        section_type(section),
+        value,
+        aliaser=apischema.utils.to_snake_case,
+        additional_properties=True,
+        exclude_none=exclude_none,
+        exclude_defaults=exclude_defaults,
+    )
+
+
+def deserialize_section(section: str, data: Any) -> Any:
+    """Deserializes the JSON content of a single top-level section as ``AveasOpenLabel.from_dict`` would."""
+    return apischema.deserialize(
+        section_type(section),
+        data,
+        aliaser=apischema.utils.to_snake_case,
+        additional_properties=True,
+    )
+
+
+def serialize_frame(frame: Frame, *, exclude_none: bool = False, exclude_defaults: bool = False) -> dict[str, Any]:
+    """Serializes a single `Frame` as it would appear inside ``AveasOpenLabel.frames``."""
+    serialized: dict[str, Any] = apischema.serialize(
+        Frame,
+        frame,
+        aliaser=apischema.utils.to_snake_case,
+        additional_properties=True,
+        exclude_none=exclude_none,
+        exclude_defaults=exclude_defaults,
+    )
+    return serialized
+
+
+def deserialize_frame(data: dict[str, Any]) -> Frame:
+    """Deserializes the JSON content of a single frame."""
+    frame: Frame = apischema.deserialize(
+        Frame,
+        data,
+        aliaser=apischema.utils.to_snake_case,
+        additional_properties=True,
+    )
+    return frame
+
+
+def deserialize_document(sections: Mapping[str, Any]) -> AveasOpenLabel:
+    """Deserializes the JSON content of top-level sections by section, e.g. of an unwrapped document.
+
+    Sections that are not given are None, members that are not sections of `AveasOpenLabel` are ignored.
+    The frames are deserialized one at a time. Every section and every frame is recorded as a phase of the active
+    `aveas_openlabel.serialization.profiling.Profiler`, if any.
+    """
+    values: dict[str, Any] = {}
+    for section, value in sections.items():
+        if section not in SECTIONS:
+            continue
+        if section == "frames" and value is not None:
+            frames = {}
+            for frame_uid, serialized_frame in value.items():
+                with profiling.phase("deserialize", section, frame_uid):
+                    frames[Uid(frame_uid)] = deserialize_frame(serialized_frame)
+            values[section] = frames
+            continue
+        with profiling.phase("deserialize", section):
+            values[section] = deserialize_section(section, value)
+    return AveasOpenLabel(**values)
+
+
+def unwrap_root(kvs: dict[str, Any]) -> dict[str, Any]:
+    """Removes the ``openlabel`` root key from a document if present, mirroring ``AveasOpenLabel.from_dict``."""
+    if list(kvs.keys()) == [ROOT_KEY]:
+        unwrapped: dict[str, Any] = kvs[ROOT_KEY]
+        return unwrapped
+    return kvs
+
+
+def frame_intervals_from_uids(frame_uids: Iterable[Union[Uid, int, str]]) -> list[FrameInterval]:
+    """Summarizes numeric frame uids as a list of contiguous, sorted frame intervals.
+
+    Frame uids that are not numeric (e.g. UUIDs) cannot be part of an interval and are ignored.
+    """
+    frame_numbers = sorted({int(uid) for uid in frame_uids if str(uid).lstrip("-").isdigit()})
+    frame_intervals: list[FrameInterval] = []
+    for frame_number in frame_numbers:
+        if frame_intervals and frame_intervals[-1].frame_end == frame_number - 1:
+            frame_intervals[-1].frame_end = frame_number
+        else:
+            frame_intervals.append(FrameInterval(frame_start=frame_number, frame_end=frame_number))
+    return frame_intervals
+
+
+def merge_frame_intervals(frame_intervals: Iterable[FrameInterval]) -> list[FrameInterval]:
+    """Sorts frame intervals with numeric bounds and merges the ones that overlap or are adjacent."""
+    merged: list[FrameInterval] = []
+    for interval in sorted(frame_intervals, key=lambda i: (int(i.frame_start), int(i.frame_end))):
+        if merged and int(interval.frame_start) <= int(merged[-1].frame_end) + 1:
+            merged[-1].frame_end = max(int(merged[-1].frame_end), int(interval.frame_end))
+        else:
+            merged.append(FrameInterval(frame_start=int(interval.frame_start), frame_end=int(interval.frame_end)))
+    return merged
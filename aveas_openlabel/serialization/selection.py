@@ -0,0 +1,213 @@
+"""Partial loading of frame ranges and object subsets
+
+A `Selection` describes the part of a recording that is needed, e.g. for training-data extraction:
+a range of frame uids, a range of timestamps, a set of object uids and a set of classification types.
+`parse_selection` applies it while a document is being read. Frames outside the frame range are skipped by the
+tokenizer without being decoded, all other filters are applied to the decoded JSON before any dataclass is created.
+
+>>> from aveas_openlabel.serialization.compression import load
+>>> from aveas_openlabel.serialization.selection import Selection
+>>> pedestrians = load("path/to/input.json", selection=Selection(frame_range=(100, 199), object_types=["human"]))
+
+The result is a valid `AveasOpenLabel` whose ``frame_intervals`` and the frame intervals of its objects and events
+describe the selected frames. Events whose role A participant has been filtered out are removed.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from dataclasses import dataclass
+from typing import Any, Collection, Optional
+
+from uai_openlabel import FrameInterval
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.sections import (
+    DELTA_FRAMES_MEMBER,
+    SECTIONS,
+    DeltaFramesError,
+    deserialize_document,
+    frame_intervals_from_uids,
+    merge_frame_intervals,
+    section_type,
+    serialize_section,
+)
+from aveas_openlabel.serialization.tokenizer import is_null, scan_document
+
+_ROLE_A_NAME = "event_participant/role_a_id"
+_ROLE_B_NAME = "event_participants/role_b_ids"
+
+
+@dataclass
+class Selection:
+    """The frames and objects to load from a recording. Filters that are None select everything."""
+
+    frame_range: Optional[tuple[int, int]] = None
+    """The first and last frame uid to load, inclusive. Frames with non-numeric uids are not selected."""
+
+    time_range: Optional[tuple[float, float]] = None
+    """The inclusive range of frame timestamps to load. Frames without a numeric timestamp are not selected."""
+
+    object_uids: Optional[Collection[str]] = None
+    """The uids of the objects to load."""
+
+    object_types: Optional[Collection[str]] = None
+    """
+    The classification types of the objects to load, e.g. ``"vehicle/car"``.
+    A type also selects all of its subtypes, e.g. ``"vehicle"`` selects cars, trucks, vans and so on.
+    """
+
+    @property
+    def filters_frames(self) -> bool:
+        """Whether only some of the frames are selected."""
+        return self.frame_range is not None or self.time_range is not None
+
+    @property
+    def filters_objects(self) -> bool:
+        """Whether only some of the objects are selected."""
+        return self.object_uids is not None or self.object_types is not None
+
+    def selects_frame_uid(self, frame_uid: str) -> bool:
+        """Whether a frame uid is within `frame_range`."""
+        if self.frame_range is None:
+            return True
+        if not frame_uid.lstrip("-").isdigit():
+            return False
+        return self.frame_range[0] <= int(frame_uid) <= self.frame_range[1]
+
+    def selects_frame(self, serialized_frame: dict[str, Any]) -> bool:
+        """Whether the timestamp of a serialized frame is within `time_range`."""
+        if self.time_range is None:
+            return True
+        timestamp = (serialized_frame.get("frame_properties") or {}).get("timestamp")
+        if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+            return False
+        return self.time_range[0] <= timestamp <= self.time_range[1]
+
+    def selects_object(self, object_uid: str, serialized_object: dict[str, Any]) -> bool:
+        """Whether a serialized object has one of the `object_uids` and one of the `object_types`."""
+        if self.object_uids is not None and object_uid not in self.object_uids:
+            return False
+        if self.object_types is not None:
+            object_type = serialized_object.get("type", "")
+            return any(object_type == t or object_type.startswith(f"{t}/") for t in self.object_types)
+        return True
+
+
+def parse_selection(data: Any, selection: Selection, sections: Optional[Collection[str]] = None) -> AveasOpenLabel:
+    """Deserializes the selected frames and objects of an OpenLABEL JSON document.
+
+    :param data: The UTF-8 encoded document, e.g. ``bytes`` or an ``mmap.mmap``.
+    :param sections: The top-level sections to deserialize, see
+        `aveas_openlabel.serialization.tokenizer.parse_sections`. If None, all sections are deserialized.
+    :raises DeltaFramesError: If the frames of a delta-encoded document are requested or filtered.
+    """
+    requested = {"metadata", *(SECTIONS if sections is None else sections)}
+    for section in requested:
+        section_type(section)  # raises for unknown sections
+
+    with profiling.phase("parse"):
+        reads_frames = "frames" in requested or selection.filters_frames
+        byte_ranges, frame_byte_ranges = scan_document(data, frames=reads_frames)
+        if reads_frames and DELTA_FRAMES_MEMBER in byte_ranges:
+            raise DeltaFramesError()
+        raw = {
+            section: json.loads(data[start:end])
+            for section, (start, end) in byte_ranges.items()
+            if section in requested and section != "frames"
+        }
+
+    selected_object_uids: Optional[set[str]] = None
+    if selection.filters_objects:
+        objects_start, objects_end = byte_ranges.get("objects", (0, 0))
+        objects = raw["objects"] if "objects" in raw else json.loads(data[objects_start:objects_end] or b"null")
+        selected_object_uids = {uid for uid, obj in (objects or {}).items() if selection.selects_object(uid, obj)}
+        if raw.get("objects") is not None:
+            raw["objects"] = {uid: obj for uid, obj in raw["objects"].items() if uid in selected_object_uids}
+
+    frames: dict[str, dict[str, Any]] = {}
+    appearances: dict[str, list[str]] = {}
+    for frame_uid, (start, end) in frame_byte_ranges.items():
+        if not selection.selects_frame_uid(frame_uid):
+            continue
+        with profiling.phase("parse", "frames"):
+            frame = json.loads(data[start:end])
+        if not selection.selects_frame(frame):
+            continue
+        if frame.get("objects") is not None:
+            if selected_object_uids is not None:
+                frame["objects"] = {uid: o for uid, o in frame["objects"].items() if uid in selected_object_uids}
+            for object_uid in frame["objects"]:
+                appearances.setdefault(object_uid, []).append(frame_uid)
+        frames[frame_uid] = frame
+    if "frames" in requested and "frames" in byte_ranges:
+        raw["frames"] = None if is_null(data, byte_ranges["frames"]) else frames
+
+    if selection.filters_frames:
+        if "frame_intervals" in requested:
+            raw["frame_intervals"] = serialize_section("frame_intervals", frame_intervals_from_uids(frames))
+        for uid, obj in (raw.get("objects") or {}).items():
+            if obj.get("frame_intervals") is not None:
+                obj_intervals = frame_intervals_from_uids(appearances.get(uid, []))
+                obj["frame_intervals"] = serialize_section("frame_intervals", obj_intervals)
+        if raw.get("events") is not None:
+            selected_intervals = frame_intervals_from_uids(frames)
+            for event in raw["events"].values():
+                event["frame_intervals"] = _clip_frame_intervals(event.get("frame_intervals"), selected_intervals)
+            raw["events"] = {uid: event for uid, event in raw["events"].items() if event["frame_intervals"] != []}
+
+    if selected_object_uids is not None and raw.get("events") is not None:
+        raw["events"] = _filter_event_participants(raw["events"], selected_object_uids)
+
+    return deserialize_document(raw)
+
+
+def _clip_frame_intervals(
+    frame_intervals: Optional[list[dict[str, Any]]], selected: list[FrameInterval]
+) -> Optional[list[dict[str, Any]]]:
+    """Restricts serialized frame intervals to the selected frame intervals by intersecting their bounds."""
+    if frame_intervals is None:
+        return None
+    clipped = [
+        FrameInterval(
+            frame_start=max(int(interval["frame_start"]), int(window.frame_start)),
+            frame_end=min(int(interval["frame_end"]), int(window.frame_end)),
+        )
+        for interval in frame_intervals
+        for window in selected
+        if int(interval["frame_start"]) <= int(window.frame_end) and int(interval["frame_end"]) >= int(window.frame_start)
+    ]
+    serialized: list[dict[str, Any]] = serialize_section("frame_intervals", merge_frame_intervals(clipped))
+    return serialized
+
+
+def _filter_event_participants(events: dict[str, Any], object_uids: set[str]) -> dict[str, Any]:
+    """Removes events whose role A participant is not selected and unselected role B participants.
+
+    The role B attribute is kept with an empty list when none of its participants is selected, like the role B
+    attribute of an event type without role B participants, because `aveas_openlabel.event.EventData` requires it.
+    """
+    filtered = {}
+    for event_uid, event in events.items():
+        event_data = event.get("event_data") or {}
+        role_a = [text["val"] for text in event_data.get("text") or [] if text.get("name") == _ROLE_A_NAME]
+        if any(uid not in object_uids for uid in role_a):
+            continue
+        for vec in event_data.get("vec") or []:
+            if vec.get("name") == _ROLE_B_NAME:
+                vec["val"] = [uid for uid in vec["val"] if uid in object_uids]
+        filtered[event_uid] = event
+    return filtered
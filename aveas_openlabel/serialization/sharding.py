@@ -0,0 +1,316 @@
+"""Sharded storage of long AVEAS OpenLABEL recordings
+
+A single OpenLABEL file of an hour-long drive is too large to move around and too slow to open.
+The sharded layout splits a scenario into a directory with a manifest and several frame shards:
+
+- ``manifest.json`` holds all sections except ``frames``, e.g. ``metadata``, ``objects``, ``contexts``, ``events``,
+  ``streams`` and ``coordinate_systems``, as well as a `ShardInfo` for every shard.
+- ``frames-00000.json``, ``frames-00001.json``, ... each hold the frames of a contiguous range of frame numbers.
+
+>>> from aveas_openlabel.serialization.sharding import ShardedScenario, write_sharded
+>>> write_sharded(openlabel, "path/to/scenario", frames_per_shard=1000)
+>>> scenario = ShardedScenario("path/to/scenario")
+>>> openlabel = scenario.load(frame_range=(2000, 2499))  # only opens frames-00002.json
+
+`ShardedScenario.load` only opens the shards that overlap the requested frame or time range.
+`write_sharded` serializes and writes the shards in parallel worker processes.
+Frame uids are kept as they are, e.g. ``"007"``. Scenarios with non-numeric frame uids, e.g. UUIDs, are sharded in
+the order of their frames, and their frames can only be selected by time range.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from uai_openlabel import Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization.compression import Compression, open_text
+from aveas_openlabel.serialization.interning import StringPool
+from aveas_openlabel.serialization.sections import (
+    ROOT_KEY,
+    SECTIONS,
+    deserialize_frame,
+    frame_intervals_from_uids,
+    serialize_frame,
+    serialize_section,
+)
+
+MANIFEST_FILE_NAME = "manifest.json"
+"""The name of the manifest file in a sharded scenario directory."""
+
+_SHARD_EXTENSIONS: dict[Compression, str] = {
+    Compression.NONE: ".json",
+    Compression.GZIP: ".json.gz",
+    Compression.XZ: ".json.xz",
+    Compression.ZSTD: ".json.zst",
+}
+_SHARD_FILE_NAME = re.compile(r"frames-\d{5}\.json(\.gz|\.xz|\.zst)?")
+
+
+@dataclass
+class ShardInfo:
+    """The description of a single frame shard in the manifest."""
+
+    file: str
+    """The file name of the shard, relative to the scenario directory."""
+
+    frame_start: Optional[int]
+    """The smallest numeric frame uid in the shard as number, None if no frame uid is numeric."""
+
+    frame_end: Optional[int]
+    """The largest numeric frame uid in the shard as number, inclusive. None if no frame uid is numeric."""
+
+    frame_count: int
+    """The number of frames in the shard. Smaller than the length of the frame range if frame numbers are missing."""
+
+    timestamp_start: Optional[float] = None
+    """The smallest numeric frame timestamp in the shard, if any frame has one."""
+
+    timestamp_end: Optional[float] = None
+    """The largest numeric frame timestamp in the shard, if any frame has one."""
+
+    def overlaps(
+        self,
+        frame_range: Optional[tuple[int, int]] = None,
+        time_range: Optional[tuple[float, float]] = None,
+    ) -> bool:
+        """Whether the shard may contain frames within both of the inclusive ranges that are given."""
+        if frame_range is not None:
+            if self.frame_start is None or self.frame_end is None:
+                return False
+            if self.frame_end < frame_range[0] or self.frame_start > frame_range[1]:
+                return False
+        if time_range is not None:
+            if self.timestamp_start is None or self.timestamp_end is None:
+                return False
+            if self.timestamp_end < time_range[0] or self.timestamp_start > time_range[1]:
+                return False
+        return True
+
+
+def write_sharded(
+    openlabel: AveasOpenLabel,
+    directory: Union[str, os.PathLike],
+    *,
+    frames_per_shard: int = 1000,
+    max_workers: Optional[int] = None,
+    compression: Compression = Compression.NONE,
+    level: Optional[int] = None,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> list[ShardInfo]:
+    """Writes ``openlabel`` as a sharded scenario into ``directory``, which is created if necessary.
+
+    Frames are sorted by frame number if all frame uids are numeric, and split into shards of at most
+    ``frames_per_shard`` frames. The shards are serialized and written by a pool of ``max_workers`` processes,
+    ``max_workers=1`` writes them sequentially in the calling process.
+    Shards of a scenario that was written into ``directory`` before are removed.
+
+    :param compression: Compression of the shards, see `aveas_openlabel.serialization.compression.Compression`.
+        The manifest is never compressed.
+    :return: The shards that have been written, in order of their frame numbers.
+    """
+    if frames_per_shard < 1:
+        raise ValueError(f"frames_per_shard must be positive, got {frames_per_shard}.")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    frames = [(str(frame_uid), frame) for frame_uid, frame in (openlabel.frames or {}).items()]
+    if all(_frame_number(frame_uid) is not None for frame_uid, _ in frames):
+        frames.sort(key=lambda item: int(item[0]))
+    chunks = _chunks(frames, frames_per_shard)
+    shard_arguments = (
+        (
+            directory / f"frames-{index:05d}{_SHARD_EXTENSIONS[compression]}",
+            chunk,
+            compression,
+            level,
+            exclude_none,
+            exclude_defaults,
+        )
+        for index, chunk in enumerate(chunks)
+    )
+
+    if max_workers == 1 or len(frames) <= frames_per_shard:
+        shards = [_write_shard(*arguments) for arguments in shard_arguments]
+    else:
+        executor: Executor
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            shards = list(executor.map(_write_shard, *zip(*shard_arguments)))
+
+    header = {}
+    for section in SECTIONS:
+        value = getattr(openlabel, section)
+        # the frames are in the shards, only missing or empty frames are written to the manifest
+        if (section == "frames" and value) or (value is None and (exclude_none or exclude_defaults)):
+            continue
+        if section == "frame_intervals" and value is None and frames:
+            value = frame_intervals_from_uids(frame_uid for frame_uid, _ in frames)
+        header[section] = serialize_section(section, value, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+
+    manifest = {ROOT_KEY: header, "shards": [asdict(shard) for shard in shards]}
+    temporary_path = directory / f"{MANIFEST_FILE_NAME}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(temporary_path, directory / MANIFEST_FILE_NAME)
+
+    shard_files = {shard.file for shard in shards}
+    for path in directory.glob("frames-*"):
+        if _SHARD_FILE_NAME.fullmatch(path.name) and path.name not in shard_files:
+            path.unlink()
+    return shards
+
+
+class ShardedScenario:
+    """A sharded scenario directory written by `write_sharded`.
+
+    Only the manifest is read when the scenario is opened, shards are read on demand.
+
+    :param intern_strings: Whether repeated strings and uids share one object across all frames and the `header`,
+        see `aveas_openlabel.serialization.interning`.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], *, intern_strings: bool = False):
+        self.directory = Path(directory)
+        """The scenario directory."""
+
+        with open(self.directory / MANIFEST_FILE_NAME) as f:
+            manifest = json.load(f)
+        self._header_dict: dict[str, Any] = manifest[ROOT_KEY]
+        self.shards: list[ShardInfo] = [ShardInfo(**shard) for shard in manifest["shards"]]
+        """All shards of the scenario, in order of their frame numbers."""
+        self._strings = StringPool() if intern_strings else None
+
+    @property
+    def header(self) -> AveasOpenLabel:
+        """All sections of the scenario except ``frames``."""
+        header = AveasOpenLabel.from_dict({ROOT_KEY: self._header_dict})
+        return header if self._strings is None else self._strings.intern_openlabel(header)
+
+    def shards_for(
+        self,
+        frame_range: Optional[tuple[int, int]] = None,
+        time_range: Optional[tuple[float, float]] = None,
+    ) -> list[ShardInfo]:
+        """The shards that overlap the inclusive frame and time ranges, see `ShardInfo.overlaps`."""
+        return [shard for shard in self.shards if shard.overlaps(frame_range, time_range)]
+
+    def iter_frames(
+        self,
+        frame_range: Optional[tuple[int, int]] = None,
+        time_range: Optional[tuple[float, float]] = None,
+    ) -> Iterator[tuple[Uid, Frame]]:
+        """Yields the frames within the inclusive frame and time ranges, reading one shard at a time.
+
+        If a frame range is given, frames with non-numeric uids are skipped.
+        If a time range is given, frames without a numeric timestamp are skipped.
+        """
+        for shard in self.shards_for(frame_range, time_range):
+            with open_text(self.directory / shard.file, "r") as f:
+                serialized_frames: dict[str, dict[str, Any]] = json.load(f)["frames"]
+            for frame_uid, serialized_frame in serialized_frames.items():
+                if frame_range is not None:
+                    frame_number = _frame_number(frame_uid)
+                    if frame_number is None or not frame_range[0] <= frame_number <= frame_range[1]:
+                        continue
+                frame = deserialize_frame(serialized_frame)
+                if self._strings is not None:
+                    frame = self._strings.intern_frame(frame)
+                if time_range is not None:
+                    timestamp = _numeric_timestamp(frame)
+                    if timestamp is None or not time_range[0] <= timestamp <= time_range[1]:
+                        continue
+                yield Uid(frame_uid), frame
+
+    def load(
+        self,
+        frame_range: Optional[tuple[int, int]] = None,
+        time_range: Optional[tuple[float, float]] = None,
+    ) -> AveasOpenLabel:
+        """Loads the header and the frames within the inclusive frame and time ranges.
+
+        If a range is given, the ``frame_intervals`` of the result describe the loaded frames.
+        The ``frames`` of a scenario that was written without frames are None.
+        """
+        openlabel = self.header
+        if not self.shards:
+            return openlabel
+        openlabel.frames = dict(self.iter_frames(frame_range, time_range))
+        if frame_range is not None or time_range is not None:
+            openlabel.frame_intervals = frame_intervals_from_uids(openlabel.frames.keys())
+        return openlabel
+
+
+def load_sharded(
+    directory: Union[str, os.PathLike],
+    *,
+    frame_range: Optional[tuple[int, int]] = None,
+    time_range: Optional[tuple[float, float]] = None,
+    intern_strings: bool = False,
+) -> AveasOpenLabel:
+    """Shortcut for `ShardedScenario.load`."""
+    return ShardedScenario(directory, intern_strings=intern_strings).load(frame_range, time_range)
+
+
+def _frame_number(frame_uid: str) -> Optional[int]:
+    return int(frame_uid) if frame_uid.lstrip("-").isdigit() else None
+
+
+def _numeric_timestamp(frame: Frame) -> Optional[float]:
+    if frame.frame_properties is None or isinstance(frame.frame_properties.timestamp, (str, type(None))):
+        return None
+    return float(frame.frame_properties.timestamp)
+
+
+def _chunks(frames: list[tuple[str, Frame]], size: int) -> Iterable[list[tuple[str, Frame]]]:
+    iterator = iter(frames)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _write_shard(
+    path: Path,
+    frames: list[tuple[str, Frame]],
+    compression: Compression,
+    level: Optional[int],
+    exclude_none: bool,
+    exclude_defaults: bool,
+) -> ShardInfo:
+    timestamps = [t for t in (_numeric_timestamp(frame) for _, frame in frames) if t is not None]
+    with open_text(path, "w", compression=compression, level=level) as f:
+        f.write('{"frames": {')
+        for index, (frame_uid, frame) in enumerate(frames):
+            serialized = serialize_frame(frame, exclude_none=exclude_none, exclude_defaults=exclude_defaults)
+            separator = ",\n" if index else "\n"
+            f.write(f"{separator}{json.dumps(frame_uid)}: {json.dumps(serialized)}")
+        f.write("\n}}\n")
+    frame_numbers = [n for n in (_frame_number(frame_uid) for frame_uid, _ in frames) if n is not None]
+    return ShardInfo(
+        file=path.name,
+        frame_start=min(frame_numbers, default=None),
+        frame_end=max(frame_numbers, default=None),
+        frame_count=len(frames),
+        timestamp_start=min(timestamps, default=None),
+        timestamp_end=max(timestamps, default=None),
+    )
@@ -0,0 +1,130 @@
+"""Frame intervals and summary statistics of objects, collected from serialized frames
+
+Writers that produce a scenario frame by frame, such as `aveas_openlabel.serialization.recorder.OnlineRecorder`
+and `aveas_openlabel.synthetic.SyntheticScenario`, collect an `ObjectStatistics` per object while writing the
+frames, and write them into the objects, which are written after the frames.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import copy
+import math
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+from uai_openlabel import FrameInterval, NumberData, Object, ObjectUid, Uid
+
+from aveas_openlabel.attributes.summary import (
+    Summary__Accel__Max,
+    Summary__Accel__Min,
+    Summary__Speed__Max,
+    Summary__Speed__Min,
+)
+from aveas_openlabel.serialization.sections import merge_frame_intervals
+
+_SUMMARY_ATTRIBUTE_NAMES = {"summary/speed/max", "summary/speed/min", "summary/accel/max", "summary/accel/min"}
+
+
+@dataclass
+class ObjectStatistics:
+    """Statistics of a single object, collected over all recorded frames.
+
+    The speed is the norm of the translational part of the `Velocity` attribute,
+    the acceleration is the forward (x) component of the `Acceleration` attribute.
+    """
+
+    frame_intervals: list[FrameInterval] = field(default_factory=list)
+    """The intervals of frames in which the object appears."""
+
+    speed_min: float = math.inf
+    """Minimum speed of the object in (m/s)."""
+
+    speed_max: float = -math.inf
+    """Maximum speed of the object in (m/s)."""
+
+    accel_min: float = math.inf
+    """Minimum acceleration of the object in (m/s^2)."""
+
+    accel_max: float = -math.inf
+    """Maximum acceleration of the object in (m/s^2)."""
+
+    def add_frame(self, frame_uid: Union[Uid, int, str], serialized_object_in_frame: dict[str, Any]) -> None:
+        """Updates the statistics with the serialized dynamic attributes of the object in one frame."""
+        if str(frame_uid).lstrip("-").isdigit():
+            frame_number = int(frame_uid)
+            last_interval = self.frame_intervals[-1] if self.frame_intervals else None
+            if last_interval is not None and last_interval.frame_end == frame_number - 1:
+                last_interval.frame_end = frame_number
+            else:
+                self.frame_intervals.append(FrameInterval(frame_start=frame_number, frame_end=frame_number))
+
+        object_data = serialized_object_in_frame.get("object_data") or {}
+        for attribute in object_data.get("vec") or []:
+            if attribute.get("name") == "velocity":
+                speed = math.hypot(*attribute["val"][:3])
+                self.speed_min = min(self.speed_min, speed)
+                self.speed_max = max(self.speed_max, speed)
+            elif attribute.get("name") == "acceleration":
+                acceleration = attribute["val"][0]
+                self.accel_min = min(self.accel_min, acceleration)
+                self.accel_max = max(self.accel_max, acceleration)
+
+    def finalize(self, scenario_object: Object) -> None:
+        """Writes the frame intervals and the summary attributes into the static attributes of ``scenario_object``.
+
+        Frame intervals that are already set are left untouched, summary attributes are replaced.
+        """
+        if scenario_object.frame_intervals is None:
+            scenario_object.frame_intervals = merge_frame_intervals(self.frame_intervals)
+
+        object_data = scenario_object.object_data
+        if object_data is None or self.speed_min > self.speed_max or self.accel_min > self.accel_max:
+            return
+        num: list[NumberData] = [a for a in object_data.num or [] if a.name not in _SUMMARY_ATTRIBUTE_NAMES]
+        num.extend(
+            [
+                Summary__Speed__Max(self.speed_max),
+                Summary__Speed__Min(self.speed_min),
+                Summary__Accel__Max(self.accel_max),
+                Summary__Accel__Min(self.accel_min),
+            ]
+        )
+        object_data.num = num
+
+
+def add_frame_to_statistics(
+    statistics: dict[ObjectUid, ObjectStatistics], frame_uid: Union[Uid, int, str], serialized_frame: dict[str, Any]
+) -> None:
+    """Updates the statistics of every object in a serialized frame, adding new objects to ``statistics``."""
+    for object_uid, serialized_object_in_frame in (serialized_frame.get("objects") or {}).items():
+        statistics.setdefault(ObjectUid(object_uid), ObjectStatistics()).add_frame(frame_uid, serialized_object_in_frame)
+
+
+def finalize_objects(
+    objects: Optional[dict[ObjectUid, Object]], statistics: dict[ObjectUid, ObjectStatistics]
+) -> Optional[dict[ObjectUid, Object]]:
+    """Copies of the objects with their statistics written into them, see `ObjectStatistics.finalize`.
+
+    The given objects are left unchanged, objects without statistics are not copied.
+    """
+    if objects is None:
+        return None
+    finalized_objects = {}
+    for object_uid, scenario_object in objects.items():
+        if object_uid in statistics:
+            scenario_object = copy.deepcopy(scenario_object)
+            statistics[object_uid].finalize(scenario_object)
+        finalized_objects[object_uid] = scenario_object
+    return finalized_objects
@@ -0,0 +1,161 @@
+"""An incremental tokenizer that locates the sections and frames of OpenLABEL JSON documents
+
+`scan_document` finds the byte ranges of the top-level sections and of the frames of a document without
+decoding their values. Nested objects and arrays are skipped with a regular expression that only stops
+at brackets outside of strings, so no Python objects are created for the skipped content.
+`parse_sections` uses it to materialize only some sections of a document,
+e.g. the ``metadata``, ``contexts`` and ``objects`` of a recording, while skipping its ``frames``.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import re
+from typing import Any, Collection, Optional
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.sections import (
+    DELTA_FRAMES_MEMBER,
+    ROOT_KEY,
+    DeltaFramesError,
+    deserialize_document,
+    section_type,
+)
+
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_TOKEN = re.compile(_STRING + rb"|[{}\[\],:]")
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_NO_BRACKETS = re.compile(rb'(?:[^"{}\[\]]+|' + _STRING + rb")*")
+
+ByteRange = tuple[int, int]
+"""A range of bytes in a file, from the start offset (inclusive) to the end offset (exclusive)."""
+
+
+class MalformedDocumentError(ValueError):
+    """Exception that is raised when a document is not a complete JSON object."""
+
+
+def scan_document(data: Any, *, frames: bool = True) -> tuple[dict[str, ByteRange], dict[str, ByteRange]]:
+    """Finds the byte ranges of the values of all top-level sections and of all frames of an OpenLABEL JSON document.
+
+    :param data: The UTF-8 encoded document, e.g. ``bytes`` or an ``mmap.mmap``.
+    :param frames: Whether to locate the single frames. If not, the ``frames`` section is skipped as a whole.
+    :return: The byte ranges of the sections by section name and of the frames by frame uid.
+        Documents with and without the ``openlabel`` root key are supported.
+    """
+    root_members, section_members, frame_members = _scan(data, frames)
+    if list(root_members) == [ROOT_KEY] and section_members:
+        return section_members, frame_members
+    return root_members, frame_members
+
+
+def is_null(data: Any, byte_range: ByteRange) -> bool:
+    """Whether the value in ``byte_range`` is ``null``, without copying the bytes of other values."""
+    start, end = byte_range
+    return end - start == 4 and data[start:end] == b"null"
+
+
+def parse_sections(data: Any, sections: Collection[str]) -> AveasOpenLabel:
+    """Deserializes only the given top-level sections of an OpenLABEL JSON document, all other sections are None.
+
+    The ``metadata`` section is required by `AveasOpenLabel` and therefore always deserialized.
+    Unrequested sections are skipped by `scan_document` without being decoded.
+
+    :param data: The UTF-8 encoded document, e.g. ``bytes`` or an ``mmap.mmap``.
+    :raises DeltaFramesError: If ``frames`` are requested from a delta-encoded document.
+    """
+    requested = {"metadata", *sections}
+    for section in requested:
+        section_type(section)  # raises for unknown sections
+
+    with profiling.phase("parse"):
+        byte_ranges, _ = scan_document(data, frames=False)
+        if "frames" in requested and DELTA_FRAMES_MEMBER in byte_ranges:
+            raise DeltaFramesError()
+        values = {section: json.loads(data[start:end]) for section, (start, end) in byte_ranges.items() if section in requested}
+    return deserialize_document(values)
+
+
+def _scan(data: Any, frames: bool) -> tuple[dict[str, ByteRange], dict[str, ByteRange], dict[str, ByteRange]]:
+    """Finds the members of the root object, of the ``openlabel`` object and, if ``frames`` is set, of the ``frames`` object.
+
+    Every open container is tracked as ``[is_object, members, expects_key, key, value_start]``.
+    Nested containers whose members are not recorded, e.g. the content of a frame, are skipped as a whole.
+    """
+    root_members: dict[str, ByteRange] = {}
+    section_members: dict[str, ByteRange] = {}
+    frame_members: dict[str, ByteRange] = {}
+    stack: list[list[Any]] = []
+
+    position = 0
+    while token := _TOKEN.search(data, position):
+        position = token.end()
+        char = data[token.start()]
+        container: list[Any] = stack[-1] if stack else []
+        members: Optional[dict[str, ByteRange]] = container[1] if stack else None
+
+        if char == 0x22:  # a string
+            if members is not None and container[2]:
+                container[3] = json.loads(token.group())
+                container[2] = False
+        elif char == 0x3A:  # ":"
+            if members is not None:
+                container[4] = _WHITESPACE.match(data, position).end()  # type: ignore[union-attr]
+        elif char in (0x7B, 0x5B):  # "{" or "["
+            child_members = None
+            if char == 0x7B:
+                if not stack:
+                    child_members = root_members
+                elif members is root_members and container[3] == ROOT_KEY:
+                    child_members = section_members
+                elif frames and (members is root_members or members is section_members) and container[3] == "frames":
+                    child_members = frame_members
+            if child_members is None and stack:
+                position = _skip_container(data, position)
+            else:
+                stack.append([char == 0x7B, child_members, char == 0x7B, None, None])
+        else:  # "}", "]" or ","
+            if not stack:
+                raise MalformedDocumentError(f"Unexpected {chr(char)} at offset {token.start()}.")
+            if members is not None and container[4] is not None:
+                end = token.start()
+                while data[end - 1] in b" \t\r\n":
+                    end -= 1
+                members[container[3]] = (container[4], end)
+                container[4] = None
+            if char == 0x2C:
+                container[2] = container[0]
+            else:
+                stack.pop()
+                if not stack:
+                    break
+
+    start = _WHITESPACE.match(data, 0).end()  # type: ignore[union-attr]
+    if stack or start == len(data) or data[start] != 0x7B:
+        raise MalformedDocumentError("The file is not a complete JSON object.")
+    return root_members, section_members, frame_members
+
+
+def _skip_container(data: Any, position: int) -> int:
+    """Returns the offset after the end of the object or array whose opening bracket ends at ``position``."""
+    depth = 1
+    while depth:
+        position = _NO_BRACKETS.match(data, position).end()  # type: ignore[union-attr]
+        if position == len(data):
+            raise MalformedDocumentError("The file is not a complete JSON object.")
+        depth += 1 if data[position] in b"{[" else -1
+        position += 1
+    return position
@@ -0,0 +1,221 @@
+"""Incremental writing of AVEAS OpenLABEL JSON files
+
+``AveasOpenLabel.to_dict`` builds the dict of the whole document before it can be written,
+so the dataclass tree and its serialized form have to be held in memory at the same time.
+`StreamingWriter` instead writes all sections except ``frames`` right away and then accepts one `Frame` at a time,
+so that producers of long recordings never need to hold more than a single frame.
+
+>>> from aveas_openlabel import AveasOpenLabel
+>>> from aveas_openlabel.serialization.writer import StreamingWriter
+>>> header = AveasOpenLabel.minimum_example()  # everything but the frames
+>>> with open("path/to/file.json", "w") as f, StreamingWriter(f, header) as writer:
+...     for frame_uid, frame in frame_source:  # e.g. a generator
+...         writer.write_frame(frame_uid, frame)
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from types import TracebackType
+from typing import Any, Collection, Iterable, Optional, TextIO, Union
+
+from uai_openlabel import Uid
+
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.sections import (
+    ROOT_KEY,
+    SECTIONS,
+    UnknownSectionError,
+    frame_intervals_from_uids,
+    serialize_frame,
+    serialize_section,
+)
+
+
+class WriterStateError(RuntimeError):
+    """Exception that is raised when a `StreamingWriter` is used after it has been closed."""
+
+
+class DuplicateFrameError(ValueError):
+    """Exception that is raised when the same frame uid is written twice."""
+
+    def __init__(self, frame_uid: str):
+        super().__init__(f"The frame {frame_uid} has already been written.")
+
+
+class StreamingWriter:
+    """Writes an AVEAS OpenLABEL JSON document to a text file handle, one frame at a time.
+
+    All sections of ``header`` except ``frames``, ``frame_intervals`` and the ``deferred_sections`` are written when
+    the writer is created. Frames of ``header``, if any, are written before any streamed frames.
+    If no frame is written and ``header.frames`` is None, ``frames`` is written as null, like ``AveasOpenLabel.to_dict``
+    does. ``frame_intervals`` and the ``deferred_sections`` are read from ``header`` and written when the writer
+    is closed, so they may still be filled in while frames are being written.
+    With ``compute_frame_intervals``, the frame intervals are computed from the written frame uids
+    if ``header.frame_intervals`` is not set by then.
+
+    The output is a regular OpenLABEL JSON document that can be read with ``AveasOpenLabel.from_dict``.
+    Each frame is written on a line of its own, which keeps partially written files recoverable.
+    Only the uids of the written frames are kept in memory.
+
+    ``frames_member`` is the name of the member that holds the frames, which is only changed by encodings that write
+    frames that are not regular OpenLABEL frames, see `aveas_openlabel.serialization.delta`.
+    """
+
+    def __init__(
+        self,
+        file: TextIO,
+        header: AveasOpenLabel,
+        *,
+        deferred_sections: Collection[str] = (),
+        exclude_none: bool = False,
+        exclude_defaults: bool = False,
+        compute_frame_intervals: bool = False,
+        frames_member: str = "frames",
+    ):
+        unknown_sections = set(deferred_sections) - set(SECTIONS)
+        if unknown_sections:
+            raise UnknownSectionError(unknown_sections.pop())
+
+        self._file = file
+        self._header = header
+        self._deferred_sections = {"frames", "frame_intervals", *deferred_sections}
+        self._exclude_none = exclude_none
+        self._exclude_defaults = exclude_defaults
+        self._compute_frame_intervals = compute_frame_intervals
+        self._frames_member = frames_member
+        self._written_frame_uids: set[str] = set()
+        self._has_members = False
+        self._frames_started = False
+        self._closed = False
+
+        self._file.write(f"{{{json.dumps(ROOT_KEY)}: {{")
+        for section in SECTIONS:
+            if section not in self._deferred_sections:
+                self._write_member(section, getattr(header, section))
+
+        if header.frames is not None:
+            self.start_frames()
+            self.write_frames(header.frames.items())
+
+    @property
+    def frame_count(self) -> int:
+        """The number of frames written so far."""
+        return len(self._written_frame_uids)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the document has been completed by `close`."""
+        return self._closed
+
+    def start_frames(self) -> None:
+        """Writes the start of the frames right away instead of with the first frame, so that ``frames`` is written
+        as an empty object instead of null if no frame follows, e.g. to complete the header of a recording.
+        """
+        if self._closed:
+            raise WriterStateError("Cannot write frames after the writer has been closed.")
+        if not self._frames_started:
+            self._file.write(f"{self._separator()}{json.dumps(self._frames_member)}: {{")
+            self._frames_started = True
+
+    def write_frame(self, frame_uid: Union[Uid, int, str], frame: Frame) -> None:
+        """Serializes ``frame`` and writes it directly to the file handle."""
+        with profiling.phase("serialize", "frames", str(frame_uid)):
+            serialized_frame = serialize_frame(frame, exclude_none=self._exclude_none, exclude_defaults=self._exclude_defaults)
+        self.write_serialized_frame(frame_uid, serialized_frame)
+
+    def write_frames(self, frames: Iterable[tuple[Union[Uid, int, str], Frame]]) -> None:
+        """Writes all ``(frame_uid, frame)`` pairs of an iterable, e.g. of a generator or of ``dict.items()``."""
+        for frame_uid, frame in frames:
+            self.write_frame(frame_uid, frame)
+
+    def write_serialized_frame(self, frame_uid: Union[Uid, int, str], serialized_frame: dict[str, Any]) -> None:
+        """Writes a frame that has already been converted to a dict, e.g. by `serialize_frame`."""
+        with profiling.phase("encode", "frames", str(frame_uid)):
+            encoded_frame = json.dumps(serialized_frame)
+        self.write_encoded_frame(frame_uid, encoded_frame)
+
+    def write_encoded_frame(self, frame_uid: Union[Uid, int, str], encoded_frame: str) -> None:
+        """Writes a frame that has already been encoded as JSON text, e.g. by ``json.dumps(serialize_frame(frame))``."""
+        if self._closed:
+            raise WriterStateError("Cannot write frames after the writer has been closed.")
+        key = str(frame_uid)
+        if key in self._written_frame_uids:
+            raise DuplicateFrameError(key)
+
+        self.start_frames()
+        separator = ",\n" if self._written_frame_uids else "\n"
+        with profiling.phase("write", "frames"):
+            self._file.write(f"{separator}{json.dumps(key)}: {encoded_frame}")
+        self._written_frame_uids.add(key)
+
+    def flush(self) -> None:
+        """Flushes the underlying file handle."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Writes the deferred sections and the end of the document. The file handle itself is not closed."""
+        if self._closed:
+            return
+        if self._frames_started:
+            self._file.write("\n}")
+        else:
+            self._write_member(self._frames_member, None)
+
+        for section in SECTIONS:
+            if section == "frames" or section not in self._deferred_sections:
+                continue
+            value = getattr(self._header, section)
+            if section == "frame_intervals" and value is None and self._compute_frame_intervals:
+                value = frame_intervals_from_uids(self._written_frame_uids)
+            self._write_member(section, value)
+
+        self._file.write("}}\n")
+        self._file.flush()
+        self._closed = True
+
+    def __enter__(self) -> "StreamingWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _write_member(self, section: str, value: Any) -> None:
+        if value is None and (self._exclude_none or self._exclude_defaults):
+            return
+        if value is None:
+            serialized = None
+        else:
+            with profiling.phase("serialize", section):
+                serialized = serialize_section(
+                    section, value, exclude_none=self._exclude_none, exclude_defaults=self._exclude_defaults
+                )
+        with profiling.phase("encode", section):
+            member = f"{self._separator()}{json.dumps(section)}: {json.dumps(serialized)}"
+        with profiling.phase("write", section):
+            self._file.write(member)
+
+    def _separator(self) -> str:
+        """The separator before the next member of the document, and marks that it has members."""
+        separator = ", " if self._has_members else ""
+        self._has_members = True
+        return separator
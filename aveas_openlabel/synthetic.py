@@ -0,0 +1,433 @@
+"""A seeded generator of synthetic AVEAS OpenLABEL scenarios for load and scale testing
+
+`SyntheticScenario` generates recordings with a configurable number of objects per classification,
+number of frames and frame rate. Every mandatory and optional attribute of the classification matrix is filled,
+i.e. every attribute type that the static and dynamic attribute containers of a classification can hold.
+Objects move along straight lanes with a smoothly varying speed, so that their bounding boxes, velocities,
+accelerations and road coordinates are consistent over time. All other attributes carry random values.
+
+>>> from aveas_openlabel.classifications.car import Car
+>>> from aveas_openlabel.classifications.human_pedestrian import HumanPedestrian
+>>> from aveas_openlabel.synthetic import SyntheticScenario
+>>> scenario = SyntheticScenario({Car: 20, HumanPedestrian: 5}, number_of_frames=90_000, frame_rate=25.0, seed=1)
+>>> scenario.write("path/to/file.json.zst")
+
+Frames are generated one at a time and written with `aveas_openlabel.serialization.writer.StreamingWriter`,
+so files of many GB can be generated with constant memory. The same seed always generates the same scenario.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import math
+import os
+import random
+import typing
+from dataclasses import MISSING, dataclass, fields
+from enum import Enum
+from typing import Any, Callable, Iterator, Mapping, Optional, Union
+
+import apischema
+from uai_openlabel import Object, ObjectInFrame, ObjectUid, Uid
+
+from aveas_openlabel.attributes.dimension import Dimensions__Size
+from aveas_openlabel.attributes.general import (
+    Acceleration,
+    BoundingBox,
+    IsRecorder,
+    Velocity,
+)
+from aveas_openlabel.attributes.interior import (
+    Interior__AcceleratorPedal,
+    Interior__BrakePedal,
+)
+from aveas_openlabel.attributes.open_drive import (
+    OpenDrive__LanePosition,
+    OpenDrive__LocalRoadCoordinates,
+)
+from aveas_openlabel.attributes.summary import (
+    Summary__Coordinates__ScenarioEnd,
+    Summary__Coordinates__ScenarioStart,
+)
+from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.classifications.registry import (
+    CLASSIFICATIONS,
+    UnknownClassificationError,
+    attribute_classes,
+)
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization.compression import Compression, open_text
+from aveas_openlabel.serialization.sections import (
+    deserialize_frame,
+    deserialize_section,
+    frame_intervals_from_uids,
+)
+from aveas_openlabel.serialization.statistics import (
+    ObjectStatistics,
+    add_frame_to_statistics,
+    finalize_objects,
+)
+from aveas_openlabel.serialization.writer import StreamingWriter
+
+ValueFactory = Callable[[random.Random], Any]
+"""A function that draws the serialized value of an attribute from a random number generator."""
+
+
+@dataclass
+class Kinematics:
+    """The size and typical speed of a classification."""
+
+    size: tuple[float, float, float]
+    """Length, width and height in (m)."""
+
+    speed_range: tuple[float, float]
+    """The range of the mean speed in (m/s)."""
+
+
+KINEMATICS: dict[str, Kinematics] = {
+    "animal": Kinematics((1.0, 0.4, 0.6), (0.5, 3.0)),
+    "vehicle/bicycle": Kinematics((1.8, 0.6, 1.7), (3.0, 8.0)),
+    "vehicle/bus": Kinematics((12.0, 2.55, 3.2), (6.0, 18.0)),
+    "vehicle/car": Kinematics((4.5, 1.8, 1.5), (8.0, 25.0)),
+    "human/pedestrian": Kinematics((0.5, 0.6, 1.75), (0.8, 1.8)),
+    "vehicle/mobility_device": Kinematics((1.0, 0.6, 1.2), (1.0, 6.0)),
+    "vehicle/motorcycle": Kinematics((2.2, 0.8, 1.4), (8.0, 30.0)),
+    "other": Kinematics((1.0, 1.0, 1.0), (0.0, 2.0)),
+    "pushable_pullable": Kinematics((1.0, 0.6, 1.0), (0.5, 1.5)),
+    "vehicle/railvehicle": Kinematics((30.0, 2.6, 3.5), (5.0, 20.0)),
+    "vehicle/trailer": Kinematics((8.0, 2.5, 3.5), (8.0, 22.0)),
+    "vehicle/truck": Kinematics((12.0, 2.5, 3.8), (8.0, 22.0)),
+    "vehicle/van": Kinematics((5.5, 2.0, 2.5), (8.0, 22.0)),
+}
+"""The kinematics of every classification type."""
+
+_LANE_WIDTH = 3.5
+_VALUE_RANGES: dict[type, tuple[float, float]] = {
+    Interior__AcceleratorPedal: (0.0, 1.0),
+    Interior__BrakePedal: (0.0, 1.0),
+    OpenDrive__LanePosition: (-0.5, 0.5),
+}
+_SERIALIZATION_OPTIONS: dict[str, Any] = {"aliaser": apischema.utils.to_snake_case, "additional_properties": True}
+
+
+@dataclass
+class Trajectory:
+    """The motion of an object along a straight lane.
+
+    The speed oscillates around ``mean_speed`` as ``mean_speed + amplitude * sin(omega * t + phase)``.
+    """
+
+    start: tuple[float, float]
+    """The x and y position at time 0 in (m)."""
+
+    heading: float
+    """The yaw angle of the lane in (rad)."""
+
+    mean_speed: float
+    """The mean speed in (m/s)."""
+
+    amplitude: float
+    """The amplitude of the speed oscillation in (m/s)."""
+
+    omega: float
+    """The angular frequency of the speed oscillation in (rad/s)."""
+
+    phase: float
+    """The phase of the speed oscillation in (rad)."""
+
+    def distance(self, t: float) -> float:
+        """The distance travelled until time ``t`` in (m)."""
+        return self.mean_speed * t + self.amplitude / self.omega * (
+            math.cos(self.phase) - math.cos(self.omega * t + self.phase)
+        )
+
+    def speed(self, t: float) -> float:
+        """The speed at time ``t`` in (m/s)."""
+        return self.mean_speed + self.amplitude * math.sin(self.omega * t + self.phase)
+
+    def acceleration(self, t: float) -> float:
+        """The longitudinal acceleration at time ``t`` in (m/s^2)."""
+        return self.amplitude * self.omega * math.cos(self.omega * t + self.phase)
+
+    def position(self, t: float) -> tuple[float, float]:
+        """The x and y position at time ``t`` in (m)."""
+        s = self.distance(t)
+        return self.start[0] + s * math.cos(self.heading), self.start[1] + s * math.sin(self.heading)
+
+
+@dataclass
+class _SyntheticObject:
+    uid: ObjectUid
+    in_frame_class: type[ObjectInFrame]
+    size: tuple[float, float, float]
+    trajectory: Trajectory
+    first_frame: int
+    last_frame: int
+    template: dict[str, Any]
+    """The serialized dynamic attributes, whose values are replaced in every frame."""
+    value_factories: list[tuple[str, int, type, ValueFactory]]
+    """Field name, index in the field and type of every dynamic attribute, with the factory of its value."""
+
+
+class SyntheticScenario:
+    """A reproducible synthetic scenario.
+
+    :param objects_per_classification: The number of objects of each classification, e.g. ``{Car: 20}``.
+        See `aveas_openlabel.classifications.registry.CLASSIFICATIONS` for all classifications. The first object is the recording vehicle and
+        appears in all frames, all other objects appear in a random contiguous range of frames.
+    :param number_of_frames: The number of frames, which are numbered from 0.
+    :param frame_rate: The number of frames per second, used for timestamps and motion.
+    :param seed: The seed of the random number generator.
+    """
+
+    def __init__(
+        self,
+        objects_per_classification: Mapping[type[Object], int],
+        *,
+        number_of_frames: int = 1000,
+        frame_rate: float = 25.0,
+        seed: int = 0,
+        exclude_none: bool = False,
+    ):
+        for classification in objects_per_classification:
+            if classification not in CLASSIFICATIONS:
+                raise UnknownClassificationError(classification)
+        if number_of_frames < 1 or frame_rate <= 0:
+            raise ValueError("number_of_frames and frame_rate must be positive.")
+
+        self.number_of_frames = number_of_frames
+        """The number of frames."""
+        self.frame_rate = frame_rate
+        """The number of frames per second."""
+        self.seed = seed
+        """The seed of the random number generator."""
+        self.exclude_none = exclude_none
+        """Whether attributes and sections that are None are left out of the serialized frames."""
+
+        rng = random.Random(seed)
+        self._object_uids = [ObjectUid(str(i)) for i in range(sum(objects_per_classification.values()))]
+        self._objects: list[_SyntheticObject] = []
+        self._serialized_objects: dict[str, Any] = {}
+        lane = 0
+        for classification, count in objects_per_classification.items():
+            for _ in range(count):
+                self._add_object(rng, classification, lane)
+                lane += 1
+        self._frame_rng_seed = rng.getrandbits(64)
+
+    def header(self) -> AveasOpenLabel:
+        """All sections of the scenario except ``frames``. The summary attributes of the objects are not set yet."""
+        header = AveasOpenLabel.minimum_example()
+        header.objects = deserialize_section("objects", self._serialized_objects)
+        return header
+
+    def serialized_frames(self) -> Iterator[tuple[Uid, dict[str, Any]]]:
+        """Generates the frames in their serialized form, as ``AveasOpenLabel.to_dict`` would write them."""
+        rng = random.Random(self._frame_rng_seed)
+        frame_template = apischema.serialize(Frame, Frame(), exclude_none=self.exclude_none, **_SERIALIZATION_OPTIONS)
+        for frame_number in range(self.number_of_frames):
+            t = frame_number / self.frame_rate
+            objects = {}
+            for synthetic_object in self._objects:
+                if synthetic_object.first_frame <= frame_number <= synthetic_object.last_frame:
+                    objects[synthetic_object.uid] = self._serialize_object_in_frame(rng, synthetic_object, t)
+            frame = dict(frame_template)
+            frame["frame_properties"] = self._serialize_frame_properties(t)
+            frame["objects"] = objects
+            yield Uid(str(frame_number)), frame
+
+    def frames(self) -> Iterator[tuple[Uid, Frame]]:
+        """Generates the frames as `Frame` dataclasses."""
+        for frame_uid, serialized_frame in self.serialized_frames():
+            yield frame_uid, deserialize_frame(serialized_frame)
+
+    def build(self) -> AveasOpenLabel:
+        """Generates the whole scenario in memory, including the summary attributes of its objects."""
+        header = self.header()
+        statistics: dict[ObjectUid, ObjectStatistics] = {}
+        frames = {}
+        for frame_uid, serialized_frame in self.serialized_frames():
+            add_frame_to_statistics(statistics, frame_uid, serialized_frame)
+            frames[frame_uid] = deserialize_frame(serialized_frame)
+        header.objects = finalize_objects(header.objects, statistics)
+        header.frames = frames
+        header.frame_intervals = frame_intervals_from_uids(frames)
+        return header
+
+    def write(
+        self,
+        path: Union[str, os.PathLike],
+        *,
+        compression: Optional[Compression] = None,
+        level: Optional[int] = None,
+    ) -> None:
+        """Generates the scenario and writes it frame by frame to a possibly compressed file.
+
+        The objects are written after the frames, so that their summary attributes can be computed from the frames.
+        """
+        header = self.header()
+        statistics: dict[ObjectUid, ObjectStatistics] = {}
+        with open_text(path, "w", compression=compression, level=level) as f:
+            writer = StreamingWriter(
+                f, header, deferred_sections=("objects",), exclude_none=self.exclude_none, compute_frame_intervals=True
+            )
+            for frame_uid, serialized_frame in self.serialized_frames():
+                add_frame_to_statistics(statistics, frame_uid, serialized_frame)
+                writer.write_serialized_frame(frame_uid, serialized_frame)
+            header.objects = finalize_objects(header.objects, statistics)
+            writer.close()
+
+    def _add_object(self, rng: random.Random, classification: type[Object], lane: int) -> None:
+        uid = self._object_uids[len(self._objects)]
+        object_type = _default(classification, "type")
+        kinematics = KINEMATICS[object_type]
+        length, width, height = (round(s * rng.uniform(0.9, 1.1), 3) for s in kinematics.size)
+        size = (length, width, height)
+        heading = 0.0 if lane % 2 == 0 else math.pi
+        mean_speed = rng.uniform(*kinematics.speed_range)
+        trajectory = Trajectory(
+            start=(rng.uniform(0.0, 200.0), lane * _LANE_WIDTH),
+            heading=heading,
+            mean_speed=mean_speed,
+            amplitude=0.1 * mean_speed,
+            omega=2 * math.pi / rng.uniform(5.0, 20.0),
+            phase=rng.uniform(0.0, 2 * math.pi),
+        )
+        if self._objects:
+            first_frame = rng.randrange(0, max(1, self.number_of_frames // 2))
+            last_frame = rng.randrange(first_frame, self.number_of_frames)
+        else:
+            first_frame, last_frame = 0, self.number_of_frames - 1
+
+        object_data: dict[str, list[dict[str, Any]]] = {}
+        for field_name, attribute_class in attribute_classes(classification):
+            value = self._value_factory(attribute_class)(rng)
+            if attribute_class is IsRecorder:
+                value = not self._objects
+            elif attribute_class is Dimensions__Size:
+                value = list(size)
+            elif attribute_class is Summary__Coordinates__ScenarioStart:
+                value = [*trajectory.position(first_frame / self.frame_rate), 0.0]
+            elif attribute_class is Summary__Coordinates__ScenarioEnd:
+                value = [*trajectory.position(last_frame / self.frame_rate), 0.0]
+            object_data.setdefault(field_name, []).append(_serialize_attribute(attribute_class, value))
+        self._serialized_objects[uid] = {
+            "name": f"{object_type}_{uid}",
+            "type": object_type,
+            "object_data": object_data,
+        }
+
+        in_frame_class = CLASSIFICATIONS[classification]
+        data: dict[str, list[dict[str, Any]]] = {}
+        value_factories = []
+        for field_name, attribute_class in attribute_classes(in_frame_class):
+            factory = self._value_factory(attribute_class)
+            value_factories.append((field_name, len(data.get(field_name, [])), attribute_class, factory))
+            data.setdefault(field_name, []).append(_serialize_attribute(attribute_class, factory(rng)))
+        # Round trip as `deserialize_frame` would, to obtain all keys of the serialized form
+        in_frame = apischema.deserialize(ObjectInFrame, {"object_data": data}, **_SERIALIZATION_OPTIONS)
+        template = apischema.serialize(ObjectInFrame, in_frame, exclude_none=self.exclude_none, **_SERIALIZATION_OPTIONS)
+        self._objects.append(
+            _SyntheticObject(uid, in_frame_class, size, trajectory, first_frame, last_frame, template, value_factories)
+        )
+
+    def _serialize_object_in_frame(self, rng: random.Random, synthetic_object: _SyntheticObject, t: float) -> dict[str, Any]:
+        trajectory = synthetic_object.trajectory
+        object_data = dict(synthetic_object.template["object_data"])
+        for field_name in {name for name, _, _, _ in synthetic_object.value_factories}:
+            object_data[field_name] = list(object_data[field_name])
+
+        for field_name, index, attribute_class, factory in synthetic_object.value_factories:
+            if attribute_class is BoundingBox:
+                length, width, height = synthetic_object.size
+                x, y = trajectory.position(t)
+                value: Any = [round(x, 3), round(y, 3), height / 2, 0.0, 0.0, trajectory.heading, length, width, height]
+            elif attribute_class is Velocity:
+                value = [round(trajectory.speed(t), 3), 0.0, 0.0, 0.0, 0.0, 0.0]
+            elif attribute_class is Acceleration:
+                value = [round(trajectory.acceleration(t), 3), 0.0, 0.0, 0.0, 0.0, 0.0]
+            elif attribute_class is OpenDrive__LocalRoadCoordinates:
+                value = [round(trajectory.distance(t), 3), 0.0]
+            else:
+                value = factory(rng)
+            object_data[field_name][index] = {**object_data[field_name][index], "val": value}
+        return {**synthetic_object.template, "object_data": object_data}
+
+    def _serialize_frame_properties(self, t: float) -> dict[str, Any]:
+        return (
+            {"timestamp": round(t, 6)} if self.exclude_none else {"timestamp": round(t, 6), "streams": None, "transforms": None}
+        )
+
+    def _value_factory(self, attribute_class: type) -> ValueFactory:
+        if attribute_class in _VALUE_RANGES:
+            low, high = _VALUE_RANGES[attribute_class]
+            return lambda rng: round(rng.uniform(low, high), 3)
+        factory = _value_factory(typing.get_type_hints(attribute_class)["val"], self._object_uids)
+        if attribute_class.__name__.endswith("__Uncertainties"):
+            return lambda rng: _normalized(factory(rng))
+        if attribute_class.__name__.endswith("__UStdDev"):
+            return lambda rng: _scaled(factory(rng), 0.05)
+        return factory
+
+
+def _value_factory(hint: Any, object_uids: list[ObjectUid]) -> ValueFactory:
+    """Compiles the type of an attribute value into a function that draws random serialized values."""
+    origin = typing.get_origin(hint)
+    arguments = typing.get_args(hint)
+    if origin is Union:
+        return _value_factory(arguments[0], object_uids)
+    if origin is typing.Literal:
+        return lambda rng: arguments[0]
+    if origin is tuple:
+        if len(arguments) == 2 and arguments[1] is Ellipsis:
+            element_factory = _value_factory(arguments[0], object_uids)
+            return lambda rng: [element_factory(rng)]
+        element_factories = [_value_factory(argument, object_uids) for argument in arguments]
+        return lambda rng: [factory(rng) for factory in element_factories]
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        choices = [member.value for member in hint]
+        return lambda rng: rng.choice(choices)
+    if hint is bool:
+        return lambda rng: rng.random() < 0.5
+    if hint is int:
+        return lambda rng: rng.randint(0, 5)
+    if hint is float:
+        return lambda rng: round(rng.uniform(0.0, 10.0), 3)
+    if isinstance(hint, type) and issubclass(hint, Uid):
+        return lambda rng: str(rng.choice(object_uids))
+    if hint is str:
+        return lambda rng: str(rng.randint(1, 100))
+    raise TypeError(f"Cannot generate values of type {hint}.")
+
+
+def _normalized(values: list[float]) -> list[float]:
+    total = sum(values)
+    return [v / total for v in values]
+
+
+def _scaled(value: Any, factor: float) -> Any:
+    if isinstance(value, list):
+        return [round(v * factor, 4) for v in value]
+    return round(value * factor, 4)
+
+
+def _default(cls: type, field_name: str) -> Any:
+    return next(f.default for f in fields(cls) if f.name == field_name and f.default is not MISSING)
+
+
+def _serialize_attribute(attribute_class: type, value: Any) -> dict[str, Any]:
+    attribute_class(val=value)  # runs the validation of the attribute
+    serialized = {f.name: f.default for f in fields(attribute_class) if f.default is not MISSING and f.default is not None}
+    serialized["val"] = value
+    return {k: v.value if isinstance(v, Enum) else v for k, v in serialized.items()}
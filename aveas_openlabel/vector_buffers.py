@@ -0,0 +1,287 @@
+"""Storage of the vector attributes of frames in contiguous buffers of floats
+
+Every ``val`` of a `aveas_openlabel.attributes.general.BoundingBox`, `aveas_openlabel.attributes.general.Velocity`
+or any other vector attribute is a tuple of Python floats, which takes about 30 bytes per value, and scattering
+them over millions of tuples makes them slow to analyze as a whole.
+
+A `VectorStore` moves the values of the vector attributes of the objects in frames into one contiguous buffer
+of 64 bit floats per attribute name, and replaces each ``val`` with a `VectorView` into its buffer:
+
+>>> from aveas_openlabel.vector_buffers import VectorStore
+>>> store = VectorStore.pack(openlabel)  # modifies the document in place
+>>> boxes = store["bounding_box"]
+>>> boxes.column(0)  # the x coordinates of all bounding boxes
+array('d', [...])
+>>> boxes.frame_uids[0], boxes.object_uids[0], boxes.row(0)
+('0', '0', VectorView([...]))
+>>> boxes.to_numpy()  # an array of shape (rows, 9) that shares the memory of the buffer
+>>> openlabel.to_dict()  # equal to the result before it was packed
+
+Views behave like the tuples that they replace, e.g. they can be indexed, iterated and compared with tuples.
+Assigning to an item of a view writes to the buffer. Documents and frames with views are serialized like those
+with tuples, e.g. by ``to_dict`` of `aveas_openlabel.AveasOpenLabel` or `aveas_openlabel.serialization.compression.dump`,
+which read the values straight from the buffers. apischema only serializes tuples as the values of cuboids, so
+importing this module registers a serializer for cuboids that accepts any sequence of numbers instead.
+Neither the serialized form nor the JSON schema of cuboids changes.
+
+The buffers are ``array.array`` objects of the standard library. NumPy is optional, `VectorBuffer.to_numpy` requires it.
+"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, Union, get_type_hints, overload
+
+import apischema
+from apischema.conversions import Conversion
+from apischema.json_schema import serialization_schema
+from apischema.metadata import required
+from uai_openlabel import (
+    AttributeName,
+    Attributes,
+    CoordinateSystemUid,
+    Number,
+    ThreeDBoundingBoxEuler,
+    ThreeDBoundingBoxQuaternion,
+    no_default,
+)
+
+from aveas_openlabel.frame import Frame
+
+if TYPE_CHECKING:
+    from aveas_openlabel.aveas_openlabel import AveasOpenLabel
+
+VECTOR_FIELDS = ("cuboid", "vec")
+"""The fields of object data whose attributes are moved into buffers."""
+
+
+class MissingNumpyError(ImportError):
+    """Exception that is raised when `VectorBuffer.to_numpy` is called but NumPy is not installed."""
+
+
+class VectorView(Sequence[float]):
+    """The value of a vector attribute, a row of a `VectorBuffer`."""
+
+    __slots__ = ("_start", "_values", "_width")
+
+    def __init__(self, buffer: "VectorBuffer", row: int):
+        self._values = buffer.values
+        self._start = row * buffer.width
+        self._width = buffer.width
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[float, ...]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, tuple[float, ...]]:
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        return self._values[self._start + self._index(index)]
+
+    def __setitem__(self, index: int, value: float) -> None:
+        self._values[self._start + self._index(index)] = value
+
+    def __len__(self) -> int:
+        return self._width
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._values[self._start : self._start + self._width])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (VectorView, tuple, list)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]  # mutable, unlike the tuples that views replace
+
+    def __repr__(self) -> str:
+        return f"VectorView({list(self)})"
+
+    def _index(self, index: int) -> int:
+        if not -self._width <= index < self._width:
+            raise IndexError("VectorView index out of range")
+        return index % self._width
+
+
+class VectorBuffer:
+    """The values of all vector attributes of one name, one row of `width` floats per attribute."""
+
+    def __init__(self, name: str, width: int):
+        self.name = name
+        """The name of the attributes, e.g. ``"bounding_box"``."""
+        self.width = width
+        """The number of values of each attribute, e.g. 9 for bounding boxes."""
+        self.values = array("d")
+        """The values of all rows, one after the other."""
+        self.frame_uids: list[str] = []
+        """The uid of the frame of each row."""
+        self.object_uids: list[str] = []
+        """The uid of the object of each row."""
+
+    def __len__(self) -> int:
+        """The number of rows."""
+        return len(self.frame_uids)
+
+    def append(self, frame_uid: str, object_uid: str, values: Sequence[float]) -> VectorView:
+        """Adds a row and returns a view of it.
+
+        Fails with a ``BufferError`` while an array returned by `to_numpy` still exists, because adding rows may
+        move the values to a larger block of memory.
+        """
+        if len(values) != self.width:
+            raise ValueError(f"{self.name} has {self.width} values per row, not {len(values)}.")
+        self.values.extend(values)
+        self.frame_uids.append(frame_uid)
+        self.object_uids.append(object_uid)
+        return VectorView(self, len(self.frame_uids) - 1)
+
+    def row(self, index: int) -> VectorView:
+        """A view of a row, e.g. of the attribute of ``frame_uids[index]`` and ``object_uids[index]``."""
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"{self.name} has no row {index}.")
+        return VectorView(self, index % len(self))
+
+    def column(self, index: int) -> "array[float]":
+        """A copy of one value of all rows, e.g. the x coordinates of all bounding boxes."""
+        if not 0 <= index < self.width:
+            raise IndexError(f"{self.name} has no column {index}.")
+        return self.values[index :: self.width]
+
+    def to_numpy(self) -> Any:
+        """A NumPy array of shape ``(len(self), width)`` that shares the memory of the buffer, so that changes
+        to one are visible in the other.
+        """
+        try:
+            import numpy  # type: ignore[import-not-found, unused-ignore]
+        except ImportError as e:
+            raise MissingNumpyError(
+                "VectorBuffer.to_numpy requires the numpy package, install it with 'pip install numpy'."
+            ) from e
+        return numpy.frombuffer(self.values, dtype=numpy.float64).reshape(-1, self.width)
+
+
+class VectorStore(Mapping[str, VectorBuffer]):
+    """The buffers of the vector attributes of the frames of a document by attribute name, see the module documentation.
+
+    Only attributes with a name and only floats are moved into buffers, and all values of a name have to have
+    the length of the first one. Other values, e.g. of vectors of strings, are kept as tuples.
+    """
+
+    def __init__(self) -> None:
+        self._buffers: dict[str, VectorBuffer] = {}
+
+    @classmethod
+    def pack(cls, openlabel: "AveasOpenLabel") -> "VectorStore":
+        """Moves the vector attributes of all frames of a document into the buffers of a new store."""
+        store = cls()
+        for frame_uid, frame in (openlabel.frames or {}).items():
+            store.pack_frame(frame_uid, frame)
+        return store
+
+    def pack_frame(self, frame_uid: str, frame: Frame) -> Frame:
+        """Moves the vector attributes of a frame into the buffers in place and returns it, e.g. for every frame
+        of a streaming reader.
+        """
+        for object_uid, object_in_frame in (frame.objects or {}).items():
+            object_data = object_in_frame.object_data
+            for field_name in VECTOR_FIELDS:
+                for attribute in getattr(object_data, field_name, None) or ():
+                    val = attribute.val
+                    if val.__class__ is not tuple or attribute.name is None or not _only_floats(val):
+                        continue
+                    buffer = self._buffers.get(attribute.name)
+                    if buffer is None:
+                        buffer = self._buffers[attribute.name] = VectorBuffer(attribute.name, len(val))
+                    elif buffer.width != len(val):
+                        continue
+                    attribute.val = buffer.append(frame_uid, object_uid, val)
+        return frame
+
+    def __getitem__(self, name: str) -> VectorBuffer:
+        return self._buffers[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._buffers)
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+
+def unpack(openlabel: "AveasOpenLabel") -> "AveasOpenLabel":
+    """Replaces all views in the frames of a document by tuples in place and returns it."""
+    for frame in (openlabel.frames or {}).values():
+        for attribute in _views(frame):
+            attribute.val = tuple(attribute.val)
+    return openlabel
+
+
+def _only_floats(values: tuple[Any, ...]) -> bool:
+    return all(value.__class__ is float for value in values)
+
+
+def _views(frame: Frame, field_names: Sequence[str] = VECTOR_FIELDS) -> Iterator[Any]:
+    """The attributes of the objects of a frame whose values are views."""
+    for object_in_frame in (frame.objects or {}).values():
+        for field_name in field_names:
+            for attribute in getattr(object_in_frame.object_data, field_name, None) or ():
+                if isinstance(attribute.val, VectorView):
+                    yield attribute
+
+
+def _val_schema(cuboid_class: type) -> apischema.schemas.Schema:
+    """The JSON schema of the ``val`` of a cuboid class, to keep it in the serialization schema of the sequences."""
+    val_schema = serialization_schema(get_type_hints(cuboid_class)["val"])
+    return apischema.schema(extra={key: value for key, value in val_schema.items() if key != "$schema"}, override=True)
+
+
+@dataclass
+class _SerializedThreeDBoundingBoxEuler:
+    """The fields of ``uai_openlabel.ThreeDBoundingBoxEuler`` that are serialized, with any sequence as ``val``."""
+
+    val: Sequence[Number] = field(
+        default_factory=lambda: no_default(field="ThreeDBoundingBoxEuler.val"),
+        metadata=required | _val_schema(ThreeDBoundingBoxEuler),
+    )
+    attributes: Optional[Attributes] = field(default=None)
+    coordinate_system: Optional[CoordinateSystemUid] = field(default=None)
+    name: AttributeName = field(default_factory=lambda: no_default(field="ThreeDBoundingBoxEuler.name"), metadata=required)
+
+
+@dataclass
+class _SerializedThreeDBoundingBoxQuaternion:
+    """The fields of ``uai_openlabel.ThreeDBoundingBoxQuaternion`` that are serialized, with any sequence as ``val``."""
+
+    val: Sequence[Number] = field(
+        default_factory=lambda: no_default(field="ThreeDBoundingBoxQuaternion.val"),
+        metadata=required | _val_schema(ThreeDBoundingBoxQuaternion),
+    )
+    attributes: Optional[Attributes] = field(default=None)
+    coordinate_system: Optional[CoordinateSystemUid] = field(default=None)
+    name: AttributeName = field(default_factory=lambda: no_default(field="ThreeDBoundingBoxQuaternion.name"), metadata=required)
+
+
+def _serialized_cuboid(cuboid: Any) -> Any:
+    """Serializes a cuboid by its fields as if it were an instance of the target class of its conversion."""
+    return cuboid
+
+
+apischema.serializer(Conversion(_serialized_cuboid, source=ThreeDBoundingBoxEuler, target=_SerializedThreeDBoundingBoxEuler))
+apischema.serializer(
+    Conversion(_serialized_cuboid, source=ThreeDBoundingBoxQuaternion, target=_SerializedThreeDBoundingBoxQuaternion)
+)
@@ -0,0 +1,80 @@
+"""Runs the benchmark suite, see `benchmarks`"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import argparse
+import fnmatch
+import shutil
+import sys
+from typing import Optional
+
+from benchmarks.cases import BENCHMARKS, WORKLOADS
+from benchmarks.harness import (
+    Measurement,
+    format_table,
+    measure,
+    read_results,
+    write_results,
+)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Runs the AVEAS OpenLABEL benchmark suite.")
+    parser.add_argument("--workloads", nargs="*", choices=list(WORKLOADS), default=["small", "medium"])
+    parser.add_argument("--benchmarks", nargs="+", default=["*"], help="Names or glob patterns, e.g. 'load*'.")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of timed runs per benchmark.")
+    parser.add_argument("--no-memory", action="store_true", help="Skips the measurement of the peak memory usage.")
+    parser.add_argument("--output", help="The JSON file to write the results to.")
+    parser.add_argument("--baseline", help="A results file of an earlier run to compare against.")
+    args = parser.parse_args(argv)
+
+    benchmarks = [b for b in BENCHMARKS if any(fnmatch.fnmatch(b.name, pattern) for pattern in args.benchmarks)]
+    measurements: list[Measurement] = []
+    for benchmark in benchmarks:
+        if not benchmark.uses_workload:
+            measurements.append(
+                measure(benchmark.name, "-", benchmark.prepare(None), repeat=args.repeat, trace_memory=not args.no_memory)
+            )
+            print(f"{benchmark.name}: done", file=sys.stderr)
+
+    for workload_name in args.workloads:
+        workload = WORKLOADS[workload_name]()
+        try:
+            for benchmark in benchmarks:
+                if not benchmark.uses_workload:
+                    continue
+                function = benchmark.prepare(workload)
+                measurement = measure(
+                    benchmark.name,
+                    workload.name,
+                    function,
+                    repeat=args.repeat,
+                    frames=workload.number_of_frames,
+                    document_bytes=workload.document_bytes if benchmark.processes_document else None,
+                    trace_memory=not args.no_memory,
+                )
+                measurements.append(measurement)
+                print(f"{measurement.key}: done", file=sys.stderr)
+        finally:
+            shutil.rmtree(workload.directory, ignore_errors=True)
+
+    baseline = read_results(args.baseline) if args.baseline else None
+    print(format_table(measurements, baseline))
+    if args.output:
+        write_results(args.output, measurements)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""The workloads and benchmarks of the suite"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import subprocess
+import sys
+import tempfile
+import typing
+from collections import Counter
+from dataclasses import MISSING, dataclass, field, fields
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from apischema.json_schema import deserialization_schema, serialization_schema
+from uai_openlabel import Object
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.attributes.general import Acceleration, BoundingBox, Velocity
+from aveas_openlabel.bulk import FrameBuilder
+from aveas_openlabel.classifications.bicycle import Bicycle
+from aveas_openlabel.classifications.car import Car
+from aveas_openlabel.classifications.human_pedestrian import HumanPedestrian
+from aveas_openlabel.classifications.registry import (
+    CLASSIFICATIONS,
+    attribute_classes,
+)
+from aveas_openlabel.downsampling import downsample
+from aveas_openlabel.serialization.cache import OpenLabelCache
+from aveas_openlabel.serialization.clips import Clip, write_clips
+from aveas_openlabel.serialization.compression import dump, load
+from aveas_openlabel.serialization.delta import dump_delta
+from aveas_openlabel.serialization.diff import diff_files
+from aveas_openlabel.serialization.frame_index import IndexedFile, build_index
+from aveas_openlabel.serialization.merge import merge
+from aveas_openlabel.serialization.parallel import load_parallel
+from aveas_openlabel.serialization.schema import json_schema, validator
+from aveas_openlabel.serialization.sections import deserialize_frame
+from aveas_openlabel.synthetic import SyntheticScenario
+from aveas_openlabel.vector_buffers import VectorStore
+
+ATTRIBUTE_FIELDS = ("boolean", "cuboid", "num", "text", "vec")
+"""The fields of object data that hold AVEAS attributes."""
+
+
+@dataclass
+class Workload:
+    """A synthetic scenario that benchmarks run on, generated and written to a temporary file on first use."""
+
+    name: str
+    """The name of the workload, e.g. ``"medium"``."""
+
+    objects_per_classification: dict[type[Object], int]
+    """The number of objects of each classification, see `aveas_openlabel.synthetic.SyntheticScenario`."""
+
+    number_of_frames: int
+    """The number of frames of the scenario."""
+
+    directory: Path = field(default_factory=lambda: Path(tempfile.mkdtemp(prefix="aveas_openlabel_benchmarks_")))
+    """The directory that the scenario is written to."""
+
+    @cached_property
+    def openlabel(self) -> AveasOpenLabel:
+        """The scenario as dataclasses."""
+        return SyntheticScenario(self.objects_per_classification, number_of_frames=self.number_of_frames).build()
+
+    @cached_property
+    def path(self) -> Path:
+        """The scenario as plain JSON file."""
+        path = self.directory / f"{self.name}.json"
+        dump(self.openlabel, path)
+        return path
+
+    @cached_property
+    def document(self) -> dict[str, Any]:
+        """The scenario as JSON document, as returned by ``json.load``."""
+        with open(self.path) as f:
+            document: dict[str, Any] = json.load(f)
+        return document
+
+    @property
+    def document_bytes(self) -> int:
+        """The size of the JSON file."""
+        return self.path.stat().st_size
+
+
+WORKLOADS: dict[str, Callable[[], Workload]] = {
+    "small": lambda: Workload("small", {Car: 4, HumanPedestrian: 2, Bicycle: 2}, number_of_frames=100),
+    "medium": lambda: Workload("medium", {classification: 2 for classification in CLASSIFICATIONS}, number_of_frames=1000),
+    "large": lambda: Workload("large", {classification: 4 for classification in CLASSIFICATIONS}, number_of_frames=5000),
+}
+"""The workloads by name. Every classification appears in the medium and large workloads."""
+
+
+@dataclass
+class Benchmark:
+    """A benchmarked operation.
+
+    ``prepare`` receives the workload, does all untimed preparation and returns the function to be timed.
+    For benchmarks that do not depend on a workload, it receives None.
+    """
+
+    name: str
+    """The name of the benchmark, e.g. ``"from_dict"``."""
+
+    prepare: Callable[[Optional[Workload]], Callable[[], Any]]
+    """Prepares the timed function for a workload."""
+
+    uses_workload: bool = True
+    """Whether the benchmark runs once per workload or once in total."""
+
+    processes_document: bool = True
+    """Whether the benchmark reads or writes the whole JSON document, which makes MB/s meaningful."""
+
+
+def _from_dict(workload: Optional[Workload]) -> Callable[[], Any]:
+    document = _workload(workload).document
+    return lambda: AveasOpenLabel.from_dict(document)
+
+
+def _to_dict(workload: Optional[Workload]) -> Callable[[], Any]:
+    openlabel = _workload(workload).openlabel
+    return lambda: openlabel.to_dict()
+
+
+def _load(workload: Optional[Workload]) -> Callable[[], Any]:
+    path = _workload(workload).path
+    return lambda: load(path)
+
+
+def _load_interned(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Loads the workload with shared strings, see `aveas_openlabel.serialization.interning`."""
+    path = _workload(workload).path
+    return lambda: load(path, intern_strings=True)
+
+
+def _dump(workload: Optional[Workload]) -> Callable[[], Any]:
+    openlabel = _workload(workload).openlabel
+    path = _workload(workload).directory / "dump.json"
+    return lambda: dump(openlabel, path)
+
+
+def _load_cached(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Loads from a warm `aveas_openlabel.serialization.cache.OpenLabelCache`, i.e. hashes the file and unpickles the entry."""
+    path = _workload(workload).path
+    cache = OpenLabelCache(_workload(workload).directory / "cache")
+    cache.load(path)
+    return lambda: cache.load(path)
+
+
+def _load_delta(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Loads a delta-encoded copy of the workload, see `aveas_openlabel.serialization.delta`."""
+    path = _workload(workload).directory / "delta.json"
+    dump_delta(_workload(workload).openlabel, path)
+    return lambda: load(path)
+
+
+def _merge(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Merges two copies of the workload, whose frames and events collide, see `aveas_openlabel.serialization.merge`.
+    The throughput refers to one copy.
+    """
+    path = _workload(workload).path
+    output = _workload(workload).directory / "merged.json"
+    return lambda: merge([path, path], output)
+
+
+def _clips(indexed: bool) -> Callable[[Optional[Workload]], Callable[[], Any]]:
+    """Writes clips of 50 frames starting every 100 frames, see `aveas_openlabel.serialization.clips`,
+    from the loaded document or from the file through its prebuilt frame index. The synthetic workloads have no events.
+    """
+
+    def prepare(workload: Optional[Workload]) -> Callable[[], Any]:
+        openlabel = _workload(workload).openlabel
+        clips = [Clip(f"clip-{start}", start, start + 49) for start in range(0, len(openlabel.frames or {}), 100)]
+        directory = _workload(workload).directory / "clips"
+        if not indexed:
+            return lambda: write_clips(openlabel, clips, directory)
+
+        index = build_index(_workload(workload).path)
+
+        def write() -> Any:
+            with IndexedFile(_workload(workload).path, index) as recording:
+                return write_clips(recording, clips, directory)
+
+        return write
+
+    return prepare
+
+
+def _diff_files(identical: bool) -> Callable[[Optional[Workload]], Callable[[], Any]]:
+    """Compares the workload file with a copy, see `aveas_openlabel.serialization.diff`. The frames of an identical
+    copy are skipped by their hashes, those of a copy written with ``exclude_none`` are all parsed and compared.
+    """
+
+    def prepare(workload: Optional[Workload]) -> Callable[[], Any]:
+        path = _workload(workload).path
+        copy = _workload(workload).directory / f"copy-{identical}.json"
+        dump(_workload(workload).openlabel, copy, exclude_none=not identical)
+        return lambda: list(diff_files(path, copy))
+
+    return prepare
+
+
+def _load_parallel(max_workers: int) -> Callable[[Optional[Workload]], Callable[[], Any]]:
+    def prepare(workload: Optional[Workload]) -> Callable[[], Any]:
+        path = _workload(workload).path
+        return lambda: load_parallel(path, max_workers=max_workers)
+
+    return prepare
+
+
+def _import(statement: str) -> Callable[[Optional[Workload]], Callable[[], Any]]:
+    """Runs ``statement`` in a new interpreter, i.e. measures the start-up time of a tool that uses the library."""
+
+    def prepare(workload: Optional[Workload]) -> Callable[[], Any]:
+        return lambda: subprocess.run([sys.executable, "-c", statement], check=True)
+
+    return prepare
+
+
+def _json_schema(workload: Optional[Workload]) -> Callable[[], Any]:
+    return lambda: (serialization_schema(AveasOpenLabel), deserialization_schema(AveasOpenLabel))
+
+
+def _json_schema_cached(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Returns copies of the schemas from the in-memory cache of `aveas_openlabel.serialization.schema.json_schema`."""
+    json_schema("serialization"), json_schema("deserialization")
+    return lambda: (json_schema("serialization"), json_schema("deserialization"))
+
+
+def _schema_validate(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Checks the document with the precompiled `aveas_openlabel.serialization.schema.SchemaValidator`."""
+    document = _workload(workload).document
+    schema_validator = validator()
+    return lambda: schema_validator.is_valid(document)
+
+
+def _validate(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Constructs the typed object data of every object and frame object, which runs the ``EachAttributeOnlyOnceEnforcer``.
+
+    The attribute dataclasses are constructed during the preparation, so that only the object data containers and
+    their validation are timed.
+    """
+    document = _workload(workload).document["openlabel"]
+    classifications = {_default(classification, "type"): classification for classification in CLASSIFICATIONS}
+
+    containers: list[tuple[type, dict[str, Any]]] = []
+    for serialized_object in document["objects"].values():
+        classification = classifications[serialized_object["type"]]
+        containers.append(_typed_object_data(classification, serialized_object["object_data"]))
+    for frame in document["frames"].values():
+        for object_uid, serialized_object_in_frame in frame["objects"].items():
+            in_frame_class = CLASSIFICATIONS[classifications[document["objects"][object_uid]["type"]]]
+            containers.append(_typed_object_data(in_frame_class, serialized_object_in_frame["object_data"]))
+
+    def validate() -> None:
+        for object_data_class, attributes in containers:
+            object_data_class(**attributes)
+
+    return validate
+
+
+def _frames(buffers: bool) -> Callable[[Optional[Workload]], Callable[[], Any]]:
+    """Decodes and deserializes all frames, with the vector attributes as tuples or in the buffers of a
+    `aveas_openlabel.vector_buffers.VectorStore`. The peak memory per frame is what keeping all frames in memory costs.
+
+    Frames are decoded from JSON text, so that the deserialized frames own their floats, like loaded documents do.
+    """
+
+    def prepare(workload: Optional[Workload]) -> Callable[[], Any]:
+        frames = {uid: json.dumps(frame) for uid, frame in _workload(workload).document["openlabel"]["frames"].items()}
+        if not buffers:
+            return lambda: [deserialize_frame(json.loads(frame)) for frame in frames.values()]
+
+        def deserialize() -> Any:
+            store = VectorStore()
+            return store, [store.pack_frame(uid, deserialize_frame(json.loads(frame))) for uid, frame in frames.items()]
+
+        return deserialize
+
+    return prepare
+
+
+def _downsample(aggregate: bool) -> Callable[[Optional[Workload]], Callable[[], Any]]:
+    """Downsamples the workload by a factor of 10 with `aveas_openlabel.downsampling.downsample`."""
+
+    def prepare(workload: Optional[Workload]) -> Callable[[], Any]:
+        openlabel = _workload(workload).openlabel
+        return lambda: downsample(openlabel, 10, aggregate=aggregate)
+
+    return prepare
+
+
+def _bulk_frames(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Builds the serialized frames with a `aveas_openlabel.bulk.FrameBuilder` from arrays of the bounding boxes,
+    velocities and accelerations of the frames of the workload.
+    """
+    document = _workload(workload).document["openlabel"]
+    object_uids = list(document["objects"])
+    arrays: dict[type, list[list[Any]]] = {BoundingBox: [], Velocity: [], Acceleration: []}
+    present = []
+    for frame in document["frames"].values():
+        values: dict[str, list[Any]] = {_default(cls, "name"): [None] * len(object_uids) for cls in arrays}
+        for object_uid, object_in_frame in frame["objects"].items():
+            for field_name in ("cuboid", "vec"):
+                for attribute in object_in_frame["object_data"][field_name] or []:
+                    if attribute["name"] in values:
+                        values[attribute["name"]][object_uids.index(object_uid)] = attribute["val"]
+        for cls, array in arrays.items():
+            array.append(values[_default(cls, "name")])
+        present.append([object_uid in frame["objects"] for object_uid in object_uids])
+    classifications = [document["objects"][object_uid]["type"] for object_uid in object_uids]
+    timestamps = [frame["frame_properties"]["timestamp"] for frame in document["frames"].values()]
+
+    def build() -> Any:
+        builder = FrameBuilder(object_uids, classifications, arrays, timestamps=timestamps, present=present)
+        return list(builder.serialized_frames())
+
+    return build
+
+
+def _access(workload: Optional[Workload]) -> Callable[[], Any]:
+    """Typical analytics access patterns: the position and speed of every object in every frame, and static lookups."""
+    openlabel = _workload(workload).openlabel
+
+    def access() -> tuple[Any, ...]:
+        objects = openlabel.objects or {}
+        recorders = [
+            uid
+            for uid, o in objects.items()
+            if o.object_data and any(a.name == "is_recorder" and a.val for a in o.object_data.boolean or [])
+        ]
+        types = {uid: o.type for uid, o in objects.items()}
+        positions: dict[str, list[tuple[float, float]]] = {uid: [] for uid in objects}
+        speeds: dict[str, list[float]] = {uid: [] for uid in objects}
+        for frame in (openlabel.frames or {}).values():
+            for object_uid, object_in_frame in (frame.objects or {}).items():
+                object_data = object_in_frame.object_data
+                if object_data.cuboid:
+                    val = object_data.cuboid[0].val
+                    positions[object_uid].append((val[0], val[1]))  # type: ignore[index]
+                for vec in object_data.vec or []:
+                    if vec.name == "velocity":
+                        speeds[object_uid].append(vec.val[0])  # type: ignore[arg-type]
+        return recorders, types, positions, speeds
+
+    return access
+
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark("from_dict", _from_dict),
+    Benchmark("to_dict", _to_dict),
+    Benchmark("load", _load),
+    Benchmark("load_interned", _load_interned),
+    Benchmark("dump", _dump),
+    Benchmark("load_delta", _load_delta),
+    Benchmark("load_cached", _load_cached),
+    Benchmark("merge", _merge),
+    Benchmark("diff_files/identical", _diff_files(identical=True)),
+    Benchmark("diff_files/reformatted", _diff_files(identical=False)),
+    Benchmark("clips/document", _clips(indexed=False), processes_document=False),
+    Benchmark("clips/indexed", _clips(indexed=True), processes_document=False),
+    *[Benchmark(f"load_parallel/{max_workers}", _load_parallel(max_workers)) for max_workers in (1, 2, 4, 8)],
+    Benchmark("import/python", _import("pass"), uses_workload=False, processes_document=False),
+    Benchmark("import/aveas_openlabel", _import("import aveas_openlabel"), uses_workload=False, processes_document=False),
+    Benchmark(
+        "import/AveasOpenLabel",
+        _import("from aveas_openlabel import AveasOpenLabel"),
+        uses_workload=False,
+        processes_document=False,
+    ),
+    Benchmark(
+        "import/classification",
+        _import("from aveas_openlabel.classifications import Car"),
+        uses_workload=False,
+        processes_document=False,
+    ),
+    Benchmark("json_schema", _json_schema, uses_workload=False, processes_document=False),
+    Benchmark("json_schema_cached", _json_schema_cached, uses_workload=False, processes_document=False),
+    Benchmark("schema_validate", _schema_validate),
+    Benchmark("validate", _validate, processes_document=False),
+    Benchmark("access", _access, processes_document=False),
+    Benchmark("bulk_frames", _bulk_frames, processes_document=False),
+    Benchmark("downsample/decimate", _downsample(aggregate=False), processes_document=False),
+    Benchmark("downsample/aggregate", _downsample(aggregate=True), processes_document=False),
+    Benchmark("frames/tuples", _frames(buffers=False), processes_document=False),
+    Benchmark("frames/vector_buffers", _frames(buffers=True), processes_document=False),
+]
+"""All benchmarks of the suite."""
+
+
+def _workload(workload: Optional[Workload]) -> Workload:
+    assert workload is not None
+    return workload
+
+
+def _default(cls: type, field_name: str) -> Any:
+    return next(f.default for f in fields(cls) if f.name == field_name)
+
+
+def _typed_object_data(classification: type, serialized_object_data: dict[str, Any]) -> tuple[type, dict[str, Any]]:
+    """The object data class of a classification and the typed attributes to construct it with.
+
+    Attributes are matched to their classes by name. Classes that share a name are matched in the order of
+    `aveas_openlabel.classifications.registry.attribute_classes`, which is the order in which the synthetic scenarios write them.
+    """
+    object_data_class: type = typing.get_type_hints(classification)["object_data"]
+    attribute_classes_by_name: dict[str, list[type]] = {}
+    for _, attribute_class in attribute_classes(classification):
+        attribute_classes_by_name.setdefault(_default(attribute_class, "name"), []).append(attribute_class)
+
+    attributes: dict[str, Any] = {}
+    for object_data_field in fields(object_data_class):
+        if object_data_field.name not in ATTRIBUTE_FIELDS:
+            continue
+        occurrences: Counter[str] = Counter()
+        values = []
+        for serialized_attribute in serialized_object_data.get(object_data_field.name) or []:
+            name = serialized_attribute["name"]
+            values.append(attribute_classes_by_name[name][occurrences[name]](val=serialized_attribute["val"]))
+            occurrences[name] += 1
+        attributes[object_data_field.name] = values if values or object_data_field.default is MISSING else None
+    return object_data_class, attributes
@@ -0,0 +1,209 @@
+"""Timing, memory measurement and machine-readable results of benchmark runs"""
+
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+RESULTS_VERSION = 1
+"""Version of the results file format."""
+
+
+@dataclass
+class Measurement:
+    """The timing and memory usage of one benchmark on one workload."""
+
+    benchmark: str
+    """The name of the benchmark, e.g. ``"from_dict"``."""
+
+    workload: str
+    """The name of the workload, e.g. ``"medium"``, or ``"-"`` for benchmarks that do not depend on a workload."""
+
+    repeat: int
+    """The number of timed runs."""
+
+    best_seconds: float
+    """The fastest of the timed runs."""
+
+    median_seconds: float
+    """The median of the timed runs."""
+
+    peak_memory_bytes: Optional[int]
+    """The peak of the memory allocated by Python during an additional, untimed run, as traced by ``tracemalloc``.
+
+    Memory allocated in worker processes is not included. None if the memory was not measured."""
+
+    frames: Optional[int] = None
+    """The number of frames processed per run, if the benchmark processes frames."""
+
+    document_bytes: Optional[int] = None
+    """The size of the JSON document processed per run, if the benchmark processes a document."""
+
+    @property
+    def frames_per_second(self) -> Optional[float]:
+        """The throughput in frames per second, based on the fastest run."""
+        return self.frames / self.best_seconds if self.frames is not None and self.best_seconds > 0 else None
+
+    @property
+    def megabytes_per_second(self) -> Optional[float]:
+        """The throughput in MB (10⁶ bytes) of JSON per second, based on the fastest run."""
+        return (
+            self.document_bytes / 1e6 / self.best_seconds if self.document_bytes is not None and self.best_seconds > 0 else None
+        )
+
+    @property
+    def peak_memory_bytes_per_frame(self) -> Optional[float]:
+        """The peak memory divided by the number of frames, e.g. the cost of keeping a frame in memory."""
+        return self.peak_memory_bytes / self.frames if self.peak_memory_bytes is not None and self.frames else None
+
+    @property
+    def key(self) -> str:
+        """Identifies the measurement across runs."""
+        return f"{self.benchmark}[{self.workload}]"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "frames_per_second": self.frames_per_second,
+            "megabytes_per_second": self.megabytes_per_second,
+            "peak_memory_bytes_per_frame": self.peak_memory_bytes_per_frame,
+        }
+
+
+def measure(
+    benchmark: str,
+    workload: str,
+    function: Callable[[], Any],
+    *,
+    repeat: int = 3,
+    frames: Optional[int] = None,
+    document_bytes: Optional[int] = None,
+    trace_memory: bool = True,
+) -> Measurement:
+    """Runs ``function`` ``repeat`` times for the timing, and once more with ``tracemalloc`` for the peak memory.
+
+    Tracing slows Python down by a factor of about five, ``trace_memory=False`` skips the additional run.
+
+    The garbage collector is run before every run, so that garbage of earlier runs is not collected during a timed run.
+    """
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return Measurement(
+        benchmark=benchmark,
+        workload=workload,
+        repeat=repeat,
+        best_seconds=min(durations),
+        median_seconds=statistics.median(durations),
+        peak_memory_bytes=peak_memory,
+        frames=frames,
+        document_bytes=document_bytes,
+    )
+
+
+def environment() -> dict[str, Any]:
+    """Describes the machine and the code that the benchmarks ran on."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+
+def write_results(path: Union[str, os.PathLike], measurements: list[Measurement]) -> None:
+    """Writes the measurements and the `environment` to a JSON file."""
+    content = {
+        "version": RESULTS_VERSION,
+        "environment": environment(),
+        "results": [measurement.to_dict() for measurement in measurements],
+    }
+    with open(path, "w") as f:
+        json.dump(content, f, indent=2)
+
+
+def read_results(path: Union[str, os.PathLike]) -> dict[str, dict[str, Any]]:
+    """Reads the measurements of a results file written by `write_results`, by `Measurement.key`."""
+    with open(path) as f:
+        content = json.load(f)
+    if content.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a benchmark results file of version {RESULTS_VERSION}.")
+    return {f"{result['benchmark']}[{result['workload']}]": result for result in content["results"]}
+
+
+def format_table(measurements: list[Measurement], baseline: Optional[dict[str, dict[str, Any]]] = None) -> str:
+    """Formats the measurements as a text table, with the speedup over a baseline run if given."""
+    header = ["benchmark", "best [s]", "median [s]", "frames/s", "MB/s", "peak [MB]", "peak [kB/frame]"]
+    if baseline is not None:
+        header.append("speedup")
+    rows = [header]
+    for m in measurements:
+        row = [
+            m.key,
+            f"{m.best_seconds:.4f}",
+            f"{m.median_seconds:.4f}",
+            f"{m.frames_per_second:,.0f}" if m.frames_per_second is not None else "-",
+            f"{m.megabytes_per_second:.1f}" if m.megabytes_per_second is not None else "-",
+            f"{m.peak_memory_bytes / 1e6:.1f}" if m.peak_memory_bytes is not None else "-",
+            f"{m.peak_memory_bytes_per_frame / 1e3:.1f}" if m.peak_memory_bytes_per_frame is not None else "-",
+        ]
+        if baseline is not None:
+            previous = baseline.get(m.key)
+            row.append(f"{previous['best_seconds'] / m.best_seconds:.2f}x" if previous and m.best_seconds > 0 else "-")
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        "  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths))) for row in rows
+    ]
+    return "\n".join(lines)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
@@ -0,0 +1,148 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from uai_openlabel import FrameInterval, ObjectUid, Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.attributes.dimension import Dimensions__Size
+from aveas_openlabel.attributes.general import (
+    Acceleration,
+    BoundingBox,
+    IsRecorder,
+    Velocity,
+)
+from aveas_openlabel.attributes.lights import Lights__Brake
+from aveas_openlabel.attributes.open_drive import (
+    OpenDrive__LocalRoadCoordinates,
+    OpenDrive__RoadId,
+)
+from aveas_openlabel.attributes.road import (
+    Road__Classification,
+    Road__ClassificationValue,
+    Road__NumberLanes__Left__Legal,
+    Road__NumberLanes__Left__Physical,
+    Road__NumberLanes__Right__Legal,
+    Road__NumberLanes__Right__Physical,
+    Road__SpeedLimit,
+)
+from aveas_openlabel.attributes.summary import (
+    Summary__Accel__Max,
+    Summary__Accel__Min,
+    Summary__Speed__Max,
+    Summary__Speed__Min,
+)
+from aveas_openlabel.classifications.car import Car, CarInFrame
+from aveas_openlabel.classifications.human_pedestrian import (
+    HumanPedestrian,
+    HumanPedestrianInFrame,
+)
+from aveas_openlabel.event import (
+    Event,
+    EventData,
+    EventTypeValue,
+    RoleAParticipantID,
+    RoleBParticipantIDs,
+)
+from aveas_openlabel.frame import Frame, FrameProperties
+from aveas_openlabel.object_data.unattached import ObjectData__Unattached
+from aveas_openlabel.object_data.unsteerable_unattached import (
+    ObjectData__Unsteerable_Unattached,
+)
+from aveas_openlabel.object_in_frame_data.no_rider import ObjectInFrameData__NoRider
+from aveas_openlabel.object_in_frame_data.non_vehicle import (
+    ObjectInFrameData__NonVehicle,
+)
+
+CAR_UID = ObjectUid("0")
+PEDESTRIAN_UID = ObjectUid("1")
+
+
+def example_frame(frame_number: int) -> Frame:
+    """A frame containing a moving car and a pedestrian walking alongside it."""
+    car_x = 1.5 * frame_number
+    pedestrian_x = 0.1 * frame_number
+    car = CarInFrame(
+        object_data=ObjectInFrameData__NoRider(
+            boolean=[Lights__Brake(frame_number % 10 == 0)],
+            cuboid=[BoundingBox((car_x, 0.0, 0.7, 0.0, 0.0, 0.0, 4.5, 1.8, 1.4))],
+            num=[
+                Road__SpeedLimit(50),
+                Road__NumberLanes__Left__Legal(1),
+                Road__NumberLanes__Left__Physical(1),
+                Road__NumberLanes__Right__Legal(0),
+                Road__NumberLanes__Right__Physical(0),
+            ],
+            text=[Road__Classification(Road__ClassificationValue.STRAIGHT), OpenDrive__RoadId("7")],
+            vec=[
+                Velocity((15.0, 0.0, 0.0, 0.0, 0.0, 0.0)),
+                Acceleration((0.5, 0.0, 0.0, 0.0, 0.0, 0.0)),
+                OpenDrive__LocalRoadCoordinates((car_x, -1.75)),
+            ],
+        )
+    )
+    pedestrian = HumanPedestrianInFrame(
+        object_data=ObjectInFrameData__NonVehicle(
+            cuboid=[BoundingBox((pedestrian_x, 4.0, 0.9, 0.0, 0.0, 1.57, 0.5, 0.5, 1.8))],
+            num=[],
+            text=[],
+            vec=[
+                Velocity((1.0, 0.0, 0.0, 0.0, 0.0, 0.0)),
+                Acceleration((0.0, 0.0, 0.0, 0.0, 0.0, 0.0)),
+                OpenDrive__LocalRoadCoordinates((pedestrian_x, 4.0)),
+            ],
+        )
+    )
+    return Frame(
+        frame_properties=FrameProperties(timestamp=frame_number * 0.04),
+        objects={CAR_UID: car, PEDESTRIAN_UID: pedestrian},
+    )
+
+
+def example_scenario(number_of_frames: int = 5) -> AveasOpenLabel:
+    """A small but complete scenario with two objects, an event and `number_of_frames` frames."""
+    openlabel = AveasOpenLabel.minimum_example()
+    openlabel.objects = {
+        CAR_UID: Car(
+            name="ego",
+            object_data=ObjectData__Unattached(
+                boolean=[IsRecorder(True)],
+                num=[Summary__Speed__Max(15.0), Summary__Speed__Min(15.0), Summary__Accel__Max(0.5), Summary__Accel__Min(0.5)],
+                text=[],
+                vec=[Dimensions__Size((4.5, 1.8, 1.4))],
+            ),
+        ),
+        PEDESTRIAN_UID: HumanPedestrian(
+            name="pedestrian",
+            object_data=ObjectData__Unsteerable_Unattached(
+                boolean=[IsRecorder(False)],
+                num=[Summary__Speed__Max(1.0), Summary__Speed__Min(1.0), Summary__Accel__Max(0.0), Summary__Accel__Min(0.0)],
+                text=[],
+                vec=[Dimensions__Size((0.5, 0.5, 1.8))],
+            ),
+        ),
+    }
+    openlabel.events = {
+        Uid("0"): Event(
+            event_data=EventData(
+                text=[RoleAParticipantID(CAR_UID)],
+                vec=[RoleBParticipantIDs([PEDESTRIAN_UID])],
+            ),
+            name="following0",
+            frame_intervals=[FrameInterval(frame_start=1, frame_end=min(3, number_of_frames - 1))],
+            type=EventTypeValue.FOLLOWING,
+        )
+    }
+    openlabel.frames = {Uid(str(frame_number)): example_frame(frame_number) for frame_number in range(number_of_frames)}
+    openlabel.frame_intervals = [FrameInterval(frame_start=0, frame_end=number_of_frames - 1)]
+    return openlabel
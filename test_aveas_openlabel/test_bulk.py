@@ -0,0 +1,124 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from uai_openlabel import Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.attributes.general import BoundingBox, Velocity
+from aveas_openlabel.attributes.interior import Interior__BrakePedal
+from aveas_openlabel.attributes.open_drive import OpenDrive__LanePosition
+from aveas_openlabel.bulk import FrameBuilder
+from aveas_openlabel.classifications.car import Car
+from aveas_openlabel.classifications.human_pedestrian import HumanPedestrian
+from aveas_openlabel.classifications.registry import UnknownClassificationError
+from aveas_openlabel.serialization.compression import load
+
+
+def _box(frame: int, object: int) -> list[float]:
+    return [float(frame), float(object), 0.5, 0.0, 0.0, 0.0, 4.5, 1.8, 1.5]
+
+
+BOXES = [[_box(frame, object) for object in range(2)] for frame in range(3)]
+VELOCITIES = [[[float(frame), 0.0, 0.0, 0.0, 0.0, 0.0], None] for frame in range(3)]
+LANE_POSITIONS = [[0.1 * frame, -0.1 * frame] for frame in range(3)]
+
+
+def _builder(**kwargs: Any) -> FrameBuilder:
+    return FrameBuilder(
+        [7, 8],
+        [Car, "human/pedestrian"],
+        {BoundingBox: BOXES, Velocity: VELOCITIES, OpenDrive__LanePosition: LANE_POSITIONS},
+        **kwargs,
+    )
+
+
+def test_frames_hold_the_values_of_the_arrays() -> None:
+    builder = _builder(timestamps=[0.0, 0.04, 0.08], present=[[True, True], [True, False], [False, True]])
+    frames = dict(builder.frames())
+
+    assert builder.number_of_frames == 3 and list(frames) == ["0", "1", "2"]
+    assert [list(frame.objects or {}) for frame in frames.values()] == [["7", "8"], ["7"], ["8"]]
+    assert [frame.frame_properties.timestamp for frame in frames.values()] == [0.0, 0.04, 0.08]  # type: ignore[union-attr]
+
+    car = (frames[Uid("1")].objects or {})[Uid("7")].object_data
+    assert [a.val for a in car.cuboid or ()] == [tuple(_box(1, 0))]
+    assert [(a.name, a.val) for a in car.vec or ()] == [("velocity", (1.0, 0.0, 0.0, 0.0, 0.0, 0.0))]
+    assert [(a.name, a.val) for a in car.num or ()] == [("open_drive/lane_position", 0.1)]
+    pedestrian = (frames[Uid("2")].objects or {})[Uid("8")].object_data
+    assert pedestrian.vec is None and [a.val for a in pedestrian.num or ()] == [-0.2]
+
+
+def test_serialized_frames_match_the_dataclasses() -> None:
+    builder = _builder(frame_uids=[10, 11, 12])
+    openlabel = builder.build(AveasOpenLabel.minimum_example())
+
+    assert json.loads(json.dumps(openlabel.to_dict()))["openlabel"]["frames"] == json.loads(
+        json.dumps(dict(builder.serialized_frames()))
+    )
+    assert [(i.frame_start, i.frame_end) for i in openlabel.frame_intervals or ()] == [(10, 12)]
+
+
+@pytest.mark.parametrize("exclude_none", [False, True])
+def test_write(tmp_path: Path, exclude_none: bool) -> None:
+    builder = _builder(timestamps=[0.0, 0.04, 0.08], exclude_none=exclude_none)
+    builder.write(tmp_path / "scenario.json.gz", AveasOpenLabel.minimum_example())
+
+    assert load(tmp_path / "scenario.json.gz").to_dict() == builder.build(AveasOpenLabel.minimum_example()).to_dict()
+
+
+def test_numpy_arrays() -> None:
+    numpy = pytest.importorskip("numpy")
+    builder = FrameBuilder(
+        ["1", "2"],
+        [Car, HumanPedestrian],
+        {BoundingBox: numpy.array(BOXES)},
+        present=numpy.array([[True, False], [True, True], [False, True]]),
+    )
+    frames = dict(builder.serialized_frames())
+    assert frames["1"]["objects"]["2"]["object_data"]["cuboid"][0]["val"] == _box(1, 1)
+    assert list(frames["2"]["objects"]) == ["2"]
+
+
+def test_invalid_arrays(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="2 object uids but 1 classifications"):
+        FrameBuilder([1, 2], [Car], {BoundingBox: BOXES})
+    with pytest.raises(ValueError, match="timestamps has 2 frames, expected 3"):
+        FrameBuilder([1, 2], [Car, Car], {BoundingBox: BOXES}, timestamps=[0.0, 0.1])
+    with pytest.raises(ValueError, match="cannot hold Interior__BrakePedal"):
+        FrameBuilder([1, 2], [Car, HumanPedestrian], {Interior__BrakePedal: [[0.5, 0.5]]})
+    with pytest.raises(UnknownClassificationError):
+        FrameBuilder([1], [AveasOpenLabel], {BoundingBox: [[_box(0, 0)]]})  # type: ignore[list-item]
+    with pytest.raises(ValueError, match="is not the type of any"):
+        FrameBuilder([1], ["vehicle/spaceship"], {BoundingBox: [[_box(0, 0)]]})
+    with pytest.raises(ValueError, match="val can only be between"):
+        FrameBuilder([1], [Car], {OpenDrive__LanePosition: [[1.0]]})
+
+    builder = FrameBuilder([1, 2], [Car, Car], {BoundingBox: [BOXES[0], BOXES[1][:1], [[0.0], _box(2, 1)]]})
+    with pytest.raises(ValueError, match="bounding_box has 1 objects in frame 1"):
+        list(builder.serialized_frames())
+    builder = FrameBuilder([1], [Car], {OpenDrive__LanePosition: [[0.1], [1.0]]})
+    assert len(list(builder.serialized_frames())) == 2  # only the first value is validated
+    with pytest.raises(ValueError, match="val can only be between"):
+        list(builder.serialized_frames(validate=True))
+    with pytest.raises(ValueError, match="val can only be between"):
+        builder.write(tmp_path / "invalid.json", AveasOpenLabel.minimum_example(), validate=True)
+
+    builder = FrameBuilder([1, 2], [Car, Car], {BoundingBox: [BOXES[0], [[0.0], _box(1, 1)]]})
+    with pytest.raises(ValueError, match="bounding_box of object 1 in frame 1 has 1 values"):
+        list(builder.serialized_frames())
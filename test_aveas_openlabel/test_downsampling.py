@@ -0,0 +1,132 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from uai_openlabel import FrameInterval, Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.attributes.interior import Interior__SteeringAngle
+from aveas_openlabel.downsampling import Downsampler, downsample
+from aveas_openlabel.serialization.compression import load
+from aveas_openlabel.serialization.sections import serialize_section
+from test_aveas_openlabel.example_scenario import (
+    CAR_UID,
+    PEDESTRIAN_UID,
+    example_scenario,
+)
+
+
+def _scenario() -> AveasOpenLabel:
+    """Ten frames, the pedestrian is missing from frames 4 to 7 and the event spans frames 1 to 5."""
+    openlabel = example_scenario(number_of_frames=10)
+    for frame_number in range(4, 8):
+        del (openlabel.frames or {})[Uid(str(frame_number))].objects[PEDESTRIAN_UID]  # type: ignore[union-attr]
+    for obj in (openlabel.objects or {}).values():
+        obj.frame_intervals = [FrameInterval(frame_start=0, frame_end=9)]
+    (openlabel.events or {})[Uid("0")].frame_intervals = [FrameInterval(frame_start=1, frame_end=5)]
+    return openlabel
+
+
+def _intervals(frame_intervals: object) -> list[tuple[int, int]]:
+    return [(i["frame_start"], i["frame_end"]) for i in serialize_section("frame_intervals", frame_intervals)]
+
+
+def _values(openlabel: AveasOpenLabel, frame_uid: str, field_name: str, name: str) -> object:
+    object_data = (openlabel.frames or {})[Uid(frame_uid)].objects[CAR_UID].object_data  # type: ignore[index]
+    return next(attribute.val for attribute in getattr(object_data, field_name) if attribute.name == name)
+
+
+@pytest.mark.parametrize("aggregate", [False, True])
+def test_frame_intervals_are_rewritten(aggregate: bool) -> None:
+    openlabel = _scenario()
+    original = openlabel.to_dict()
+    downsampled = downsample(openlabel, 4, aggregate=aggregate)
+
+    assert list(downsampled.frames or {}) == ["0", "1", "2"]
+    assert [frame.frame_properties.timestamp for frame in (downsampled.frames or {}).values()] == [  # type: ignore[union-attr]
+        0.0,
+        0.16,
+        0.32,
+    ]
+    assert _intervals(downsampled.frame_intervals) == [(0, 2)]
+    assert _intervals((downsampled.objects or {})[CAR_UID].frame_intervals) == [(0, 2)]
+    assert _intervals((downsampled.objects or {})[PEDESTRIAN_UID].frame_intervals) == [(0, 0), (2, 2)]
+    assert _intervals((downsampled.events or {})[Uid("0")].frame_intervals) == [(0, 1)]
+    assert openlabel.to_dict() == original
+
+
+def test_events_without_frame_intervals_are_kept() -> None:
+    openlabel = _scenario()
+    (openlabel.events or {})[Uid("0")].frame_intervals = None  # type: ignore[assignment]
+    downsampled = downsample(openlabel, 4)
+
+    assert (downsampled.events or {})[Uid("0")] is (openlabel.events or {})[Uid("0")]
+
+
+def test_every_nth_frame_is_kept() -> None:
+    openlabel = _scenario()
+    downsampled = downsample(openlabel, 4)
+
+    assert [downsampled.frames[Uid(str(i))] for i in range(3)] == [  # type: ignore[index]
+        (openlabel.frames or {})[Uid(str(i))] for i in (0, 4, 8)
+    ]
+
+
+def test_attributes_are_aggregated() -> None:
+    openlabel = _scenario()
+    downsampled = downsample(openlabel, 4, aggregate=True)
+
+    assert _values(downsampled, "0", "vec", "open_drive/local_road_coordinates") == pytest.approx((2.25, -1.75))
+    assert _values(downsampled, "2", "vec", "open_drive/local_road_coordinates") == pytest.approx((12.75, -1.75))
+    assert _values(downsampled, "0", "num", "road/speed_limit") == 50
+    assert _values(downsampled, "0", "boolean", "lights/brake") is True
+    assert _values(downsampled, "1", "boolean", "lights/brake") is False
+    assert _values(downsampled, "0", "cuboid", "bounding_box")[0] == 4.5  # type: ignore[index]
+    assert _values(downsampled, "0", "text", "used_road_link") == "7"
+
+    last = downsample(openlabel, 4, aggregate=True, booleans="last")
+    assert _values(last, "0", "boolean", "lights/brake") is False
+
+
+def test_integer_and_special_values_are_not_averaged() -> None:
+    openlabel = _scenario()
+    for frame_number, frame in enumerate((openlabel.frames or {}).values()):
+        num: Any = frame.objects[CAR_UID].object_data.num  # type: ignore[index]
+        num[0].val = 0.0 if frame_number % 2 else 50.0  # no speed limit in every other frame
+        num[1].val = -1 if frame_number < 3 else frame_number // 3  # the number of lanes is not available at first
+        num.append(Interior__SteeringAngle(0.1 * frame_number))
+    downsampled = downsample(openlabel, 4, aggregate=True)
+
+    assert _values(downsampled, "0", "num", "road/number_lanes/left/legal") == 1
+    assert _values(downsampled, "1", "num", "road/number_lanes/left/legal") == 2
+    assert _values(downsampled, "0", "num", "road/speed_limit") == 0.0
+    assert _values(downsampled, "0", "num", "interior/steering_angle") == pytest.approx(0.15)
+    assert isinstance(_values(downsampled, "1", "num", "road/number_lanes/left/legal"), int)
+
+
+def test_write(tmp_path: Path) -> None:
+    openlabel = _scenario()
+    Downsampler(3, aggregate=True).write(tmp_path / "downsampled.json.gz", openlabel, (openlabel.frames or {}).items())
+
+    assert load(tmp_path / "downsampled.json.gz").to_dict() == downsample(openlabel, 3, aggregate=True).to_dict()
+
+
+def test_invalid_parameters() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        Downsampler(0)
+    with pytest.raises(ValueError, match="'any' or 'last'"):
+        Downsampler(2, booleans="all")  # type: ignore[arg-type]
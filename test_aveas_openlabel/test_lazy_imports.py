@@ -0,0 +1,93 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import ast
+import importlib
+import inspect
+import json
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+LAZY_PACKAGES = ["classifications", "attributes", "contexts", "object_data", "object_in_frame_data"]
+
+
+def _modules_after(statement: str) -> set[str]:
+    """The modules that are imported by running ``statement`` in a new interpreter."""
+    script = f"import sys; {statement}; import json; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+    return set(json.loads(output))
+
+
+def test_importing_the_package_imports_no_dataclasses() -> None:
+    modules = _modules_after("import aveas_openlabel, aveas_openlabel.classifications, aveas_openlabel.attributes")
+
+    assert "uai_openlabel" not in modules
+    assert "apischema" not in modules
+    assert not {m for m in modules if m.startswith("aveas_openlabel.")} - {
+        "aveas_openlabel.lazy_imports",
+        "aveas_openlabel.classifications",
+        "aveas_openlabel.attributes",
+    }
+
+
+def test_names_are_imported_on_first_access() -> None:
+    modules = _modules_after("from aveas_openlabel.classifications import Car")
+
+    assert "aveas_openlabel.classifications.car" in modules
+    assert "aveas_openlabel.classifications.bus" not in modules
+    assert "aveas_openlabel.aveas_openlabel" not in modules
+
+
+@pytest.mark.parametrize("package_name", LAZY_PACKAGES)
+def test_packages_export_all_classes_of_their_submodules(package_name: str) -> None:
+    package = importlib.import_module(f"aveas_openlabel.{package_name}")
+    classes = {}
+    for submodule in pkgutil.iter_modules(package.__path__):
+        module = importlib.import_module(f"{package.__name__}.{submodule.name}")
+        for name, value in vars(module).items():
+            if inspect.isclass(value) and value.__module__ == module.__name__ and not name.startswith("_"):
+                classes[name] = value
+
+    assert sorted(package.__all__) == sorted(classes)
+    assert {name: getattr(package, name) for name in package.__all__} == classes
+    assert set(package.__all__) <= set(dir(package))
+
+
+@pytest.mark.parametrize("package_name", ["aveas_openlabel", *(f"aveas_openlabel.{p}" for p in LAZY_PACKAGES)])
+def test_lazy_imports_match_the_type_checking_imports(package_name: str) -> None:
+    package = importlib.import_module(package_name)
+    tree = ast.parse(Path(str(package.__file__)).read_text(encoding="utf-8"))
+    imports = {}
+    for node in tree.body:
+        if isinstance(node, ast.If) and isinstance(node.test, ast.Name) and node.test.id == "TYPE_CHECKING":
+            for statement in node.body:
+                assert isinstance(statement, ast.ImportFrom)
+                for alias in statement.names:
+                    assert alias.asname is None
+                    imports[alias.name] = statement.module
+
+    assert package._LAZY_IMPORTS == imports
+    assert sorted(package.__all__) == sorted(imports)
+
+
+def test_unknown_names_raise_attribute_errors() -> None:
+    import aveas_openlabel.classifications
+
+    with pytest.raises(AttributeError, match="Unicorn"):
+        aveas_openlabel.classifications.Unicorn
+    assert not hasattr(aveas_openlabel.classifications, "__wrapped__")
@@ -0,0 +1,62 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from aveas_openlabel.serialization.binary import (
+    binary_to_json,
+    decode,
+    dump_binary,
+    encode,
+    json_to_binary,
+    load_binary,
+)
+from test_aveas_openlabel.example_scenario import example_scenario
+
+pytest.importorskip("msgpack")
+
+
+@pytest.mark.parametrize("exclude_none", [False, True])
+def test_dump_and_load_binary_round_trip(tmp_path: Path, exclude_none: bool) -> None:
+    scenario = example_scenario(number_of_frames=10)
+    path = tmp_path / "scenario.olmp"
+    dump_binary(scenario, path, exclude_none=exclude_none)
+
+    assert json.dumps(load_binary(path).to_dict()) == json.dumps(scenario.to_dict())
+    expected = json.loads(json.dumps(scenario.to_dict(exclude_none=exclude_none)))
+    assert decode(path.read_bytes()) == expected
+    assert path.stat().st_size < len(json.dumps(expected))
+
+
+def test_float_arrays_are_packed_losslessly() -> None:
+    document = {"val": [0.1, -2.5, 1e-300], "ints": [0, 1, 2], "mixed": [1, 2.5], "single": [0.5]}
+    decoded = decode(encode(document))
+
+    assert json.dumps(decoded) == json.dumps(document)
+    assert [type(v) for v in decoded["ints"]] == [int, int, int]
+
+
+def test_conversion_to_and_from_json(tmp_path: Path) -> None:
+    json_path = tmp_path / "scenario.json"
+    json_path.write_text(json.dumps(example_scenario().to_dict()))
+    binary_path = tmp_path / "scenario.olmp.gz"
+    round_trip_path = tmp_path / "round_trip.json"
+
+    json_to_binary(json_path, binary_path, compression=None)
+    binary_to_json(binary_path, round_trip_path)
+
+    assert round_trip_path.read_text() == json_path.read_text()
@@ -0,0 +1,105 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from aveas_openlabel.serialization.cache import ENTRY_SUFFIX, OpenLabelCache
+from aveas_openlabel.serialization.compression import dump
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+def _entries(directory: Path) -> list[Path]:
+    return sorted(directory.glob(f"*{ENTRY_SUFFIX}"))
+
+
+def test_second_load_is_served_from_the_cache(tmp_path: Path) -> None:
+    scenario = example_scenario(number_of_frames=5)
+    dump(scenario, tmp_path / "scenario.json.gz")
+    cache = OpenLabelCache(tmp_path / "cache")
+
+    first = cache.load(tmp_path / "scenario.json.gz")
+    shutil.copy(tmp_path / "scenario.json.gz", tmp_path / "copy.json.gz")
+    second = cache.load(tmp_path / "copy.json.gz")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert json.dumps(second.to_dict()) == json.dumps(first.to_dict()) == json.dumps(scenario.to_dict())
+    assert tmp_path / "scenario.json.gz" in cache
+    assert len(_entries(tmp_path / "cache")) == 1
+
+
+def test_changed_content_is_a_miss(tmp_path: Path) -> None:
+    cache = OpenLabelCache(tmp_path / "cache")
+    dump(example_scenario(number_of_frames=3), tmp_path / "scenario.json")
+    cache.load(tmp_path / "scenario.json")
+
+    dump(example_scenario(number_of_frames=4), tmp_path / "scenario.json")
+    loaded = cache.load(tmp_path / "scenario.json")
+
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert loaded.frames is not None and len(loaded.frames) == 4
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    cache = OpenLabelCache(tmp_path / "cache")
+    paths, entries = [], []
+    for number_of_frames in (1, 2, 3):
+        paths.append(tmp_path / f"scenario_{number_of_frames}.json")
+        dump(example_scenario(number_of_frames=number_of_frames), paths[-1])
+        cache.load(paths[-1])
+        entries.append(tmp_path / "cache" / f"{cache.key(paths[-1])}{ENTRY_SUFFIX}")
+        os.utime(entries[-1], ns=(10**9, 10**9))
+    cache.load(paths[0])  # marks the first entry as more recently used than the second one
+    os.utime(entries[2], ns=(2 * 10**9, 2 * 10**9))
+
+    cache.max_bytes = entries[0].stat().st_size + entries[2].stat().st_size
+    cache.evict()
+
+    assert [path in cache for path in paths] == [True, False, True]
+    assert cache.size <= cache.max_bytes
+
+
+def test_damaged_entries_are_misses(tmp_path: Path) -> None:
+    dump(example_scenario(number_of_frames=2), tmp_path / "scenario.json")
+    cache = OpenLabelCache(tmp_path / "cache")
+    cache.load(tmp_path / "scenario.json")
+    (entry,) = _entries(tmp_path / "cache")
+    entry.write_bytes(entry.read_bytes()[:100])
+
+    loaded = cache.load(tmp_path / "scenario.json")
+
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert loaded.frames is not None and len(loaded.frames) == 2
+
+
+def _load_frame_count(cache_directory: Path, path: Path) -> int:
+    openlabel = OpenLabelCache(cache_directory, max_bytes=1).load(path)
+    return len(openlabel.frames or {})
+
+
+def test_concurrent_processes_share_a_cache(tmp_path: Path) -> None:
+    paths = []
+    for number_of_frames in (2, 3, 4):
+        paths.append(tmp_path / f"scenario_{number_of_frames}.json")
+        dump(example_scenario(number_of_frames=number_of_frames), paths[-1])
+
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        frame_counts = list(executor.map(_load_frame_count, [tmp_path / "cache"] * 12, paths * 4))
+
+    assert frame_counts == [2, 3, 4] * 4
+    assert len(_entries(tmp_path / "cache")) >= 1
+    assert not list((tmp_path / "cache").glob(".*.tmp"))
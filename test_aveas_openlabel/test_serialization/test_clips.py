@@ -0,0 +1,140 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+from uai_openlabel import ContextUid, FrameInterval, Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.contexts.scenario_context import (
+    ScenarioContext,
+    ScenarioContextData,
+)
+from aveas_openlabel.contexts.scenario_context_data import (
+    Scenario__MaximumVehicleSpeed,
+    Scenario__MaximumVehicleSpeed__Frame,
+    Scenario__MinimumVehicleSpeed,
+    Scenario__MinimumVehicleSpeed__Frame,
+)
+from aveas_openlabel.serialization.clips import Clip, event_clips, write_clips
+from aveas_openlabel.serialization.compression import load
+from aveas_openlabel.serialization.frame_index import IndexedFile
+from aveas_openlabel.serialization.sections import serialize_frame, serialize_section
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+def _scenario() -> AveasOpenLabel:
+    """Ten frames with an event from frame 3 to 5 and the minimum and maximum speed in frames 2 and 8."""
+    openlabel = example_scenario(number_of_frames=10)
+    for obj in (openlabel.objects or {}).values():
+        obj.frame_intervals = [FrameInterval(frame_start=0, frame_end=9)]
+    (openlabel.events or {})[Uid("0")].frame_intervals = [FrameInterval(frame_start=3, frame_end=5)]
+    openlabel.contexts = {
+        ContextUid("0"): ScenarioContext(
+            context_data=ScenarioContextData(
+                boolean=[],
+                num=[Scenario__MinimumVehicleSpeed(1.0), Scenario__MaximumVehicleSpeed(15.0)],
+                text=[Scenario__MinimumVehicleSpeed__Frame("2"), Scenario__MaximumVehicleSpeed__Frame("8")],
+                vec=[],
+            )
+        )
+    }
+    return openlabel
+
+
+def _intervals(frame_intervals: object) -> list[tuple[int, int]]:
+    return [(i["frame_start"], i["frame_end"]) for i in serialize_section("frame_intervals", frame_intervals)]
+
+
+def _context_attributes(openlabel: AveasOpenLabel) -> dict[str, object]:
+    context_data = serialize_section("contexts", openlabel.contexts)["0"]["context_data"]
+    return {attribute["name"]: attribute["val"] for attributes in context_data.values() for attribute in attributes}
+
+
+def test_event_clips() -> None:
+    clips = event_clips(_scenario().events, padding_before=1, padding_after=2)
+
+    assert clips == [Clip("event-0", frame_start=2, frame_end=7, object_uids={"0", "1"}, event_uids=["0"])]
+    assert event_clips(_scenario().events, participants_only=False) == [Clip("event-0", frame_start=3, frame_end=5)]
+
+
+def test_clips_are_valid_files(tmp_path: Path) -> None:
+    openlabel = _scenario()
+    clips = [*event_clips(openlabel.events, padding_before=1, padding_after=1), Clip("tail", frame_start=6, frame_end=12)]
+    paths = write_clips(openlabel, clips, tmp_path, suffix=".json.gz")
+    event_clip, tail = (load(path) for path in paths)
+
+    assert paths == [tmp_path / "event-0.json.gz", tmp_path / "tail.json.gz"]
+    assert list(event_clip.frames or {}) == ["0", "1", "2", "3", "4"]
+    assert serialize_frame((event_clip.frames or {})[Uid("1")]) == serialize_frame((openlabel.frames or {})[Uid("3")])
+    assert _intervals(event_clip.frame_intervals) == [(0, 4)]
+    assert [_intervals(obj.frame_intervals) for obj in (event_clip.objects or {}).values()] == [[(0, 4)], [(0, 4)]]
+    assert [_intervals(event.frame_intervals) for event in (event_clip.events or {}).values()] == [[(1, 3)]]
+    assert _context_attributes(event_clip) == {
+        "scenario/minimum_vehicle_speed": 1.0,
+        "scenario/minimum_vehicle_speed/frame": "0",
+    }
+
+    assert list(tail.frames or {}) == ["0", "1", "2", "3"]
+    assert _intervals(tail.frame_intervals) == [(0, 3)]
+    assert tail.events == {}
+    assert _context_attributes(tail) == {
+        "scenario/maximum_vehicle_speed": 15.0,
+        "scenario/maximum_vehicle_speed/frame": "2",
+    }
+
+
+def test_clips_contain_only_their_objects(tmp_path: Path) -> None:
+    (path,) = write_clips(_scenario(), [Clip("pedestrian", frame_start=0, frame_end=9, object_uids=["1"])], tmp_path)
+    clip = load(path)
+
+    assert list(clip.objects or {}) == ["1"]
+    assert all(list(frame.objects or {}) == ["1"] for frame in (clip.frames or {}).values())
+    assert clip.events == {}  # the role A participant of the event is not part of the clip
+
+
+def test_clips_keep_an_empty_role_b_attribute(tmp_path: Path) -> None:
+    (path,) = write_clips(_scenario(), [Clip("car", frame_start=0, frame_end=9, object_uids=["0"])], tmp_path)
+    clip = load(path)
+
+    assert [list(vec.val) for event in (clip.events or {}).values() for vec in event.event_data.vec] == [[]]
+
+
+def test_clips_without_none(tmp_path: Path) -> None:
+    clips = [Clip("all", frame_start=2, frame_end=5), Clip("pedestrian", frame_start=0, frame_end=9, object_uids=["1"])]
+    paths = write_clips(_scenario(), clips, tmp_path, exclude_none=True)
+
+    assert all("null" not in path.read_text() for path in paths)
+
+
+def test_clips_of_an_indexed_file(tmp_path: Path) -> None:
+    openlabel = _scenario()
+    (tmp_path / "scenario.json").write_text(json.dumps(openlabel.to_dict()))
+    clips = [*event_clips(openlabel.events), Clip("empty", frame_start=20, frame_end=29)]
+
+    expected = [load(path).to_dict() for path in write_clips(openlabel, clips, tmp_path / "in_memory")]
+    with IndexedFile(tmp_path / "scenario.json") as indexed:
+        indexed_paths = write_clips(indexed, clips, tmp_path / "indexed")
+
+    assert [load(path).to_dict() for path in indexed_paths] == expected
+    assert load(indexed_paths[1]).frames == {}
+
+
+def test_invalid_clips(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="unique"):
+        write_clips(_scenario(), [Clip("a", 0, 1), Clip("a", 2, 3)], tmp_path)
+    with pytest.raises(ValueError, match="ends before it starts"):
+        write_clips(_scenario(), [Clip("a", 3, 2)], tmp_path)
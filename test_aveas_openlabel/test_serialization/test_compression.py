@@ -0,0 +1,106 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization.compression import (
+    Compression,
+    MissingCodecError,
+    detect_compression,
+    dump,
+    load,
+)
+from aveas_openlabel.serialization.delta import dump_delta
+from aveas_openlabel.serialization.parallel import dump_parallel
+from aveas_openlabel.serialization.sections import (
+    UnknownSectionError,
+    serialize_section,
+)
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+@pytest.mark.parametrize(
+    "file_name,compression",
+    [
+        ["scenario.json", Compression.NONE],
+        ["scenario.json.gz", Compression.GZIP],
+        ["scenario.json.xz", Compression.XZ],
+        ["scenario.json.zst", Compression.ZSTD],
+    ],
+)
+def test_dump_and_load_round_trip(tmp_path: Path, file_name: str, compression: Compression) -> None:
+    scenario = example_scenario(number_of_frames=20)
+    path = tmp_path / file_name
+    try:
+        dump(scenario, path, level=1)
+    except MissingCodecError:
+        pytest.skip("zstandard is not installed")
+
+    assert detect_compression(path) is compression
+    loaded = load(path)
+    assert json.dumps(loaded.to_dict()) == json.dumps(scenario.to_dict())
+    if compression is not Compression.NONE:
+        assert path.stat().st_size < len(json.dumps(scenario.to_dict())) / 5
+
+
+@pytest.mark.parametrize("write", [dump, dump_parallel, dump_delta])
+@pytest.mark.parametrize(
+    "openlabel",
+    [
+        AveasOpenLabel.minimum_example(),
+        replace(AveasOpenLabel.minimum_example(), frames={}),
+        replace(example_scenario(number_of_frames=3), frame_intervals=None),
+    ],
+    ids=["without_frames", "with_no_frames", "without_frame_intervals"],
+)
+def test_round_trip_keeps_missing_sections(tmp_path: Path, write: Callable[..., None], openlabel: AveasOpenLabel) -> None:
+    path = tmp_path / "scenario.json.gz"
+    write(openlabel, path)
+
+    loaded = load(path)
+    assert loaded.to_dict() == openlabel.to_dict()
+    assert (loaded.frames is None, loaded.frame_intervals) == (openlabel.frames is None, openlabel.frame_intervals)
+    kwargs: dict[str, Any] = {"exclude_none": True}
+    write(openlabel, path, **kwargs)
+    assert load(path).to_dict(**kwargs) == openlabel.to_dict(**kwargs)
+
+
+def test_compression_is_detected_from_magic_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "misnamed.json"
+    dump(example_scenario(), path, compression=Compression.GZIP)
+
+    assert detect_compression(path) is Compression.GZIP
+    assert load(path).frames is not None
+
+
+@pytest.mark.parametrize("file_name", ["scenario.json", "scenario.json.gz"])
+def test_load_selected_sections(tmp_path: Path, file_name: str) -> None:
+    scenario = example_scenario()
+    path = tmp_path / file_name
+    dump(scenario, path)
+
+    loaded = load(path, sections=["contexts", "objects"])
+    assert loaded.frames is None and loaded.events is None
+    assert loaded.metadata == scenario.metadata
+    assert json.dumps(serialize_section("objects", loaded.objects)) == json.dumps(
+        serialize_section("objects", scenario.objects)
+    )
+    with pytest.raises(UnknownSectionError):
+        load(path, sections=["unknown"])
@@ -0,0 +1,154 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Union
+
+import pytest
+from uai_openlabel import Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization.binary import json_to_binary, load_binary
+from aveas_openlabel.serialization.compression import dump, load, open_text
+from aveas_openlabel.serialization.delta import (
+    DELTA_FRAMES_MEMBER,
+    DeltaDecoder,
+    DeltaEncoder,
+    DeltaEncodingError,
+    DeltaFile,
+    dump_delta,
+)
+from aveas_openlabel.serialization.diff import diff_files
+from aveas_openlabel.serialization.frame_index import IndexedFile
+from aveas_openlabel.serialization.merge import merge
+from aveas_openlabel.serialization.parallel import load_parallel
+from aveas_openlabel.serialization.sections import DeltaFramesError
+from aveas_openlabel.serialization.selection import Selection
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+def _attribute(name: str, val: Any) -> dict[str, Any]:
+    return {"val": val, "name": name}
+
+
+def _frame(speed_limit: float, speed: float, *object_uids: str) -> dict[str, Any]:
+    object_data = {"num": [_attribute("road/speed_limit", speed_limit), _attribute("speed", speed)], "text": None}
+    return {"frame_properties": None, "objects": {uid: {"object_data": object_data} for uid in object_uids}}
+
+
+def test_only_changes_are_encoded() -> None:
+    frames = [
+        _frame(50.0, 10.0, "1"),
+        _frame(50.0, 11.0, "1", "2"),
+        _frame(50.0, 11.0, "1", "2"),
+        _frame(70.0, 11.0, "2"),
+        {"objects": {"2": {"object_data": {"num": [_attribute("road/speed_limit", 70.0)]}}}},
+    ]
+    encoder = DeltaEncoder()
+    encoded = [encoder.encode(frame) for frame in frames]
+
+    assert encoded[0] == frames[0]
+    assert encoded[1]["delta"] and encoded[1]["objects"] == {
+        "1": {"object_data": {"num": [None, _attribute("speed", 11.0)]}},
+        "2": frames[1]["objects"]["2"],
+    }
+    assert encoded[2]["objects"] == {"1": {"object_data": {}}, "2": {"object_data": {}}}
+    assert encoded[3]["objects"] == {"2": {"object_data": {"num": [_attribute("road/speed_limit", 70.0), None]}}}
+    assert encoded[4] == {"objects": {"2": {"object_data": {"num": [None], "text": None}}}, "delta": True}
+
+    decoder = DeltaDecoder()
+    decoded = [decoder.decode(frame) for frame in encoded]
+    assert decoded[:4] == frames[:4]
+    assert decoded[4] == {"objects": {"2": {"object_data": {"num": [_attribute("road/speed_limit", 70.0)], "text": None}}}}
+
+
+def test_keyframes() -> None:
+    encoder = DeltaEncoder(keyframe_interval=2)
+    encoded = [encoder.encode(_frame(50.0, 10.0, "1")) for _ in range(5)]
+    assert ["delta" in frame for frame in encoded] == [False, True, False, True, False]
+
+    with pytest.raises(DeltaEncodingError):
+        DeltaDecoder().decode(encoded[1])
+    with pytest.raises(ValueError):
+        DeltaEncoder(keyframe_interval=0)
+
+
+@pytest.mark.parametrize("file_name", ["scenario.json", "scenario.json.gz"])
+@pytest.mark.parametrize("exclude_none", [False, True])
+def test_round_trip(tmp_path: Path, file_name: str, exclude_none: bool) -> None:
+    openlabel = example_scenario(number_of_frames=10)
+    dump_delta(openlabel, tmp_path / file_name, keyframe_interval=4, exclude_none=exclude_none)
+
+    assert load(tmp_path / file_name).to_dict() == openlabel.to_dict()
+    with DeltaFile(tmp_path / file_name) as delta_file:
+        assert delta_file.load().to_dict() == openlabel.to_dict()
+
+
+def test_other_readers_see_no_frames(tmp_path: Path) -> None:
+    openlabel = example_scenario(number_of_frames=3)
+    dump_delta(openlabel, tmp_path / "scenario.json")
+
+    with open_text(tmp_path / "scenario.json", "r") as f:
+        document = json.load(f)
+    assert "frames" not in document["openlabel"] and len(document["openlabel"][DELTA_FRAMES_MEMBER]) == 3
+    assert AveasOpenLabel.from_dict(document).frames is None
+
+
+def test_parallel_and_binary_readers_expand_frames(tmp_path: Path) -> None:
+    openlabel = example_scenario(number_of_frames=3)
+    dump_delta(openlabel, tmp_path / "scenario.json")
+    json_to_binary(tmp_path / "scenario.json", tmp_path / "scenario.msgpack")
+
+    assert load_parallel(tmp_path / "scenario.json", max_workers=1).to_dict() == openlabel.to_dict()
+    assert load_binary(tmp_path / "scenario.msgpack").to_dict() == openlabel.to_dict()
+
+
+@pytest.mark.parametrize(
+    "read",
+    [
+        lambda path, _: load(path, sections=["objects", "frames"]),
+        lambda path, _: load(path, selection=Selection(frame_range=(0, 1))),
+        lambda path, _: IndexedFile(path),
+        lambda path, tmp_path: merge([path], tmp_path / "merged.json"),
+        lambda path, tmp_path: list(diff_files(path, path)),
+    ],
+)
+def test_frame_readers_reject_delta_frames(tmp_path: Path, read: Callable[[Path, Path], Any]) -> None:
+    dump_delta(example_scenario(number_of_frames=3), tmp_path / "scenario.json")
+
+    with pytest.raises(DeltaFramesError):
+        read(tmp_path / "scenario.json", tmp_path)
+    assert load(tmp_path / "scenario.json", sections=["objects"]).objects is not None
+
+
+def test_delta_file_expands_frames_lazily(tmp_path: Path) -> None:
+    openlabel = example_scenario(number_of_frames=10)
+    dump(openlabel, tmp_path / "regular.json")
+    dump_delta(openlabel, tmp_path / "scenario.json", keyframe_interval=3)
+    expected = load(tmp_path / "regular.json")
+    frames = expected.frames or {}
+
+    with DeltaFile(tmp_path / "scenario.json") as delta_file:
+        assert delta_file.frame_uids == list(frames)
+        assert delta_file.header() == replace(expected, frames=None)
+        frame_uids: list[Union[int, str]] = ["5", "6", "7", "2", "9", 0, "8"]
+        for frame_uid in frame_uids:
+            assert delta_file.frame(frame_uid) == frames[Uid(str(frame_uid))]
+        with pytest.raises(KeyError):
+            delta_file.frame("10")
+
+    with DeltaFile(tmp_path / "regular.json") as regular_file:
+        assert regular_file.frame("4") == frames[Uid("4")]
@@ -0,0 +1,96 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from pathlib import Path
+
+import pytest
+from uai_openlabel import FrameInterval, Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization.compression import dump
+from aveas_openlabel.serialization.diff import ChangeKind, diff, diff_files
+from test_aveas_openlabel.example_scenario import (
+    CAR_UID,
+    PEDESTRIAN_UID,
+    example_scenario,
+)
+
+
+def _changed() -> AveasOpenLabel:
+    """The example scenario with changed attributes, a removed object in a frame and an additional frame."""
+    openlabel = example_scenario(number_of_frames=6)
+    frames = openlabel.frames or {}
+    car = (frames[Uid("2")].objects or {})[CAR_UID].object_data
+    car.vec[0].val = (15.0 + 1e-9, 0.0, 0.0, 0.0, 0.0, 0.0)  # type: ignore[index]
+    car.cuboid[0].val = (3.5, 0.0, 0.7, 0.0, 0.0, 0.0, 4.5, 1.8, 1.4)  # type: ignore[index]
+    (frames[Uid("1")].objects or {})[CAR_UID].object_data.boolean = []
+    del (frames[Uid("4")].objects or {})[PEDESTRIAN_UID]
+    openlabel.frame_intervals = [FrameInterval(frame_start=0, frame_end=5)]
+    return openlabel
+
+
+EXPECTED = [
+    "changed frame_intervals",
+    "removed frames/1/objects/0/object_data/boolean/lights/brake",
+    "changed frames/2/objects/0/object_data/cuboid/bounding_box",
+    "removed frames/4/objects/1",
+    "added frames/5",
+]
+
+
+def test_diff() -> None:
+    changes = diff(example_scenario(), _changed(), abs_tol=1e-6)
+
+    assert [str(change) for change in changes] == EXPECTED
+    bounding_box = changes[2]
+    assert bounding_box.kind is ChangeKind.CHANGED
+    assert bounding_box.old["val"][0] == 3.0 and bounding_box.new["val"][0] == 3.5
+    assert "changed frames/2/objects/0/object_data/vec/velocity" in [
+        str(change) for change in diff(example_scenario(), _changed())
+    ]
+
+
+def test_diff_files(tmp_path: Path) -> None:
+    dump(example_scenario(), tmp_path / "old.json")
+    dump(_changed(), tmp_path / "new.json.gz", exclude_none=True)
+
+    changes = list(diff_files(tmp_path / "old.json", tmp_path / "new.json.gz", abs_tol=1e-6))
+
+    assert [str(change) for change in changes] == EXPECTED
+    assert changes[-1].new["objects"].keys() == {"0", "1"}
+
+
+def test_equal_documents(tmp_path: Path) -> None:
+    dump(example_scenario(), tmp_path / "old.json")
+    dump(example_scenario(), tmp_path / "new.json", exclude_none=True)
+
+    assert diff(example_scenario(), example_scenario()) == []
+    assert list(diff_files(tmp_path / "old.json", tmp_path / "new.json")) == []
+
+
+def test_attributes_are_aligned_by_name() -> None:
+    old, new = example_scenario(), example_scenario()
+    new_car = ((new.frames or {})[Uid("0")].objects or {})[CAR_UID].object_data
+    new_car.vec.reverse()  # type: ignore[union-attr]
+    new_car.num[0].val = 30  # type: ignore[index]
+    new_car.boolean[0].val = 1  # type: ignore[index]
+
+    (change,) = diff(old, new, abs_tol=100.0)  # bools are not numbers, but the order of attributes does not matter
+    assert change.path == ("frames", "0", "objects", "0", "object_data", "boolean", "lights/brake")
+    assert (change.old["val"], change.new["val"]) == (True, 1)
+
+
+def test_negative_tolerance() -> None:
+    with pytest.raises(ValueError, match="negative"):
+        diff(example_scenario(), example_scenario(), rel_tol=-1.0)
@@ -0,0 +1,70 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from uai_openlabel import Uid
+
+from aveas_openlabel.serialization.frame_index import (
+    INDEX_SUFFIX,
+    FrameIndexError,
+    FrameNotIndexedError,
+    IndexedFile,
+    build_index,
+    write_index,
+)
+from aveas_openlabel.serialization.sections import serialize_frame, serialize_section
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_frames_and_sections_are_read_by_byte_range(tmp_path: Path, indent: Optional[int]) -> None:
+    scenario = example_scenario(number_of_frames=10)
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(scenario.to_dict(), indent=indent))
+    index = write_index(path)
+    assert Path(f"{path}{INDEX_SUFFIX}").exists()
+    assert scenario.frames is not None
+
+    with IndexedFile(path) as indexed:
+        assert indexed.index == index
+        assert indexed.frame_uids == list(scenario.frames)
+        assert serialize_frame(indexed.frame("7")) == serialize_frame(scenario.frames[Uid("7")])
+        assert serialize_section("objects", indexed.section("objects")) == serialize_section("objects", scenario.objects)
+        assert indexed.section("frame_intervals") == scenario.frame_intervals
+        assert indexed.raw_section("events") == json.loads(json.dumps(serialize_section("events", scenario.events)))
+        assert indexed.raw_section("tags") is None
+        with pytest.raises(FrameNotIndexedError):
+            indexed.frame("10")
+
+
+def test_changed_file_is_detected(tmp_path: Path) -> None:
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(example_scenario().to_dict()))
+    write_index(path)
+    path.write_text(json.dumps(example_scenario(number_of_frames=6).to_dict()))
+
+    with pytest.raises(FrameIndexError):
+        IndexedFile(path)
+
+
+def test_incomplete_file_cannot_be_indexed(tmp_path: Path) -> None:
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(example_scenario().to_dict())[:-10])
+
+    with pytest.raises(FrameIndexError):
+        build_index(path)
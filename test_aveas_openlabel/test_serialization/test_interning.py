@@ -0,0 +1,100 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from uai_openlabel import Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.frame import Frame
+from aveas_openlabel.serialization.binary import dump_binary, load_binary
+from aveas_openlabel.serialization.compression import dump, load
+from aveas_openlabel.serialization.frame_index import IndexedFile
+from aveas_openlabel.serialization.interning import StringPool
+from aveas_openlabel.serialization.parallel import load_parallel
+from aveas_openlabel.serialization.selection import Selection
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+def _assert_shared(frames: list[Frame]) -> None:
+    """Asserts that the object uids and attribute names of all frames are the same objects."""
+    first, *others = frames
+    assert first.objects is not None
+    for frame in others:
+        assert frame.objects is not None
+        for (uid, object_in_frame), (other_uid, other_object_in_frame) in zip(first.objects.items(), frame.objects.items()):
+            assert other_uid is uid
+            assert type(other_uid) is Uid
+            for attribute, other_attribute in zip(
+                object_in_frame.object_data.num or [], other_object_in_frame.object_data.num or []
+            ):
+                assert other_attribute.name is attribute.name
+
+
+@pytest.mark.parametrize(
+    "load_function",
+    [
+        lambda path: load(path, intern_strings=True),
+        lambda path: load(path, selection=Selection(frame_range=(0, 9)), intern_strings=True),
+        lambda path: load_parallel(path, max_workers=1, chunk_size=2, intern_strings=True),
+    ],
+)
+def test_loaded_frames_share_strings(tmp_path: Path, load_function: Callable[[Path], AveasOpenLabel]) -> None:
+    scenario = example_scenario(number_of_frames=5)
+    dump(scenario, tmp_path / "scenario.json")
+
+    openlabel = load_function(tmp_path / "scenario.json")
+
+    assert openlabel.frames is not None and openlabel.objects is not None
+    _assert_shared(list(openlabel.frames.values()))
+    assert set(openlabel.objects) == set(next(iter(openlabel.frames.values())).objects or {})
+    assert json.dumps(openlabel.to_dict()) == json.dumps(scenario.to_dict())
+
+
+def test_strings_are_only_interned_on_request(tmp_path: Path) -> None:
+    dump(example_scenario(number_of_frames=2), tmp_path / "scenario.json")
+
+    openlabel = load(tmp_path / "scenario.json")
+
+    assert openlabel.frames is not None
+    first, second = (list(frame.objects or {}) for frame in openlabel.frames.values())
+    assert first == second and first[0] is not second[0]
+
+
+def test_binary_and_indexed_frames_share_strings(tmp_path: Path) -> None:
+    scenario = example_scenario(number_of_frames=3)
+    dump_binary(scenario, tmp_path / "scenario.msgpack")
+    dump(scenario, tmp_path / "scenario.json")
+
+    openlabel = load_binary(tmp_path / "scenario.msgpack", intern_strings=True)
+    assert openlabel.frames is not None
+    _assert_shared(list(openlabel.frames.values()))
+    with IndexedFile(tmp_path / "scenario.json", intern_strings=True) as indexed_file:
+        _assert_shared([indexed_file.frame(uid) for uid in indexed_file.frame_uids])
+
+
+def test_pool() -> None:
+    pool = StringPool()
+    name = "".join(["lights/", "brake"])
+    uid = Uid("".join(["12", "34"]))
+
+    assert pool.intern(name) is name
+    assert pool.intern("lights/brake") is name
+    assert pool.intern(uid) is uid
+    assert pool.intern(Uid("1234")) is uid
+    assert pool.intern("1234") is not uid  # plain strings and uids are kept apart
+    assert len(pool) == 3
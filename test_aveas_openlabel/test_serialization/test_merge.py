@@ -0,0 +1,105 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+from uai_openlabel import FrameInterval, Uid
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization.compression import dump, load
+from aveas_openlabel.serialization.merge import UidMapping, merge
+from aveas_openlabel.serialization.sections import serialize_frame, serialize_section
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+def _part(first_frame: int = 0) -> AveasOpenLabel:
+    openlabel = example_scenario(number_of_frames=5)
+    for obj in (openlabel.objects or {}).values():
+        obj.frame_intervals = [FrameInterval(frame_start=first_frame, frame_end=first_frame + 4)]
+    (openlabel.events or {})[Uid("0")].frame_intervals = [FrameInterval(frame_start=first_frame + 1, frame_end=first_frame + 3)]
+    openlabel.frames = {Uid(str(int(uid) + first_frame)): frame for uid, frame in (openlabel.frames or {}).items()}
+    openlabel.frame_intervals = [FrameInterval(frame_start=first_frame, frame_end=first_frame + 4)]
+    return openlabel
+
+
+def _intervals(frame_intervals: object) -> list[tuple[int, int]]:
+    return [(i["frame_start"], i["frame_end"]) for i in serialize_section("frame_intervals", frame_intervals)]
+
+
+@pytest.fixture
+def parts(tmp_path: Path) -> list[Path]:
+    paths = [tmp_path / "part-1.json", tmp_path / "part-2.json.gz"]
+    for path in paths:
+        dump(_part(), path)
+    return paths
+
+
+def test_colliding_frames_are_shifted(parts: list[Path], tmp_path: Path) -> None:
+    mappings = merge(parts, tmp_path / "merged.json")
+    merged = load(tmp_path / "merged.json")
+    part = _part()
+
+    assert mappings == [UidMapping(), UidMapping(frame_offset=5, events={"0": "1"})]
+    assert list(merged.frames or {}) == [str(i) for i in range(10)]
+    assert serialize_frame((merged.frames or {})[Uid("7")]) == serialize_frame((part.frames or {})[Uid("2")])
+    assert _intervals(merged.frame_intervals) == [(0, 9)]
+    assert list(merged.objects or {}) == ["0", "1"]
+    assert all(_intervals(obj.frame_intervals) == [(0, 9)] for obj in (merged.objects or {}).values())
+    events = merged.events or {}
+    assert list(events) == ["0", "1"]
+    assert [_intervals(event.frame_intervals) for event in events.values()] == [[(1, 3)], [(6, 8)]]
+    assert merged.metadata == part.metadata
+
+
+def test_objects_that_are_not_matched_get_new_uids(parts: list[Path], tmp_path: Path) -> None:
+    mappings = merge(parts, tmp_path / "merged.json.gz", match_objects=False)
+    merged = load(tmp_path / "merged.json.gz")
+
+    assert mappings[1].objects == {"0": "2", "1": "3"}
+    assert list(merged.objects or {}) == ["0", "1", "2", "3"]
+    assert _intervals((merged.objects or {})[Uid("2")].frame_intervals) == [(5, 9)]
+    assert [list(frame.objects or {}) for frame in (merged.frames or {}).values()] == [["0", "1"]] * 5 + [["2", "3"]] * 5
+    event_data = serialize_section("events", merged.events)["1"]["event_data"]
+    assert [text["val"] for text in event_data["text"]] == ["2"]
+    assert [list(vec["val"]) for vec in event_data["vec"]] == [["3"]]
+
+
+def test_consecutive_frame_numbers_are_kept(tmp_path: Path) -> None:
+    paths = [tmp_path / "part-1.json", tmp_path / "part-2.json"]
+    dump(_part(), paths[0])
+    dump(_part(first_frame=5), paths[1])
+
+    mappings = merge(paths, tmp_path / "merged.json")
+    merged = load(tmp_path / "merged.json")
+
+    assert mappings[1].frame_offset == 0
+    assert _intervals(merged.frame_intervals) == [(0, 9)]
+    assert [_intervals(event.frame_intervals) for event in (merged.events or {}).values()] == [[(1, 3)], [(6, 8)]]
+
+
+def test_single_input_is_copied(parts: list[Path], tmp_path: Path) -> None:
+    merge(parts[:1], tmp_path / "merged.json")
+
+    assert load(tmp_path / "merged.json").to_dict() == load(parts[0]).to_dict()
+    assert (
+        json.loads((tmp_path / "merged.json").read_text())["openlabel"]["frames"]
+        == json.loads(parts[0].read_text())["openlabel"]["frames"]
+    )
+
+
+def test_no_inputs(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="At least one input"):
+        merge([], tmp_path / "merged.json")
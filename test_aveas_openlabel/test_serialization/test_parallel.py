@@ -0,0 +1,41 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from aveas_openlabel.serialization.compression import dump
+from aveas_openlabel.serialization.parallel import dump_parallel, load_parallel
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+@pytest.mark.parametrize("file_name,max_workers", [["scenario.json", 1], ["scenario.json", 2], ["scenario.json.gz", 2]])
+def test_load_parallel(tmp_path: Path, file_name: str, max_workers: int) -> None:
+    scenario = example_scenario(number_of_frames=25)
+    path = tmp_path / file_name
+    dump(scenario, path)
+
+    loaded = load_parallel(path, max_workers=max_workers, chunk_size=4)
+    assert json.dumps(loaded.to_dict()) == json.dumps(scenario.to_dict())
+
+
+@pytest.mark.parametrize("max_workers,exclude_none", [[1, False], [2, False], [2, True]])
+def test_dump_parallel_is_byte_identical(tmp_path: Path, max_workers: int, exclude_none: bool) -> None:
+    scenario = example_scenario(number_of_frames=25)
+    dump(scenario, tmp_path / "sequential.json", exclude_none=exclude_none)
+    dump_parallel(scenario, tmp_path / "parallel.json", max_workers=max_workers, chunk_size=4, exclude_none=exclude_none)
+
+    assert (tmp_path / "parallel.json").read_bytes() == (tmp_path / "sequential.json").read_bytes()
@@ -0,0 +1,82 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from aveas_openlabel.serialization import profiling
+from aveas_openlabel.serialization.compression import dump, load
+from aveas_openlabel.serialization.profiling import Profiler
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+@pytest.mark.parametrize(
+    "sections,phases",
+    [
+        [None, ["read", "parse", "deserialize"]],
+        [["metadata", "objects", "frames"], ["parse", "deserialize"]],
+    ],
+)
+def test_profiled_load(tmp_path: Path, sections: list[str], phases: list[str]) -> None:
+    scenario = example_scenario(number_of_frames=12)
+    dump(scenario, tmp_path / "scenario.json")
+
+    with Profiler(slowest_frames=3) as profiler:
+        loaded = load(tmp_path / "scenario.json", sections=sections)
+    report = profiler.report()
+
+    assert json.dumps(loaded.to_dict()) == json.dumps(load(tmp_path / "scenario.json", sections=sections).to_dict())
+    assert list(report.phases) == phases
+    assert report.sections["frames"]["deserialize"].calls == 12
+    assert report.sections["objects"]["deserialize"].calls == 1
+    assert [t.seconds for t in report.slowest_frames] == sorted((t.seconds for t in report.slowest_frames), reverse=True)
+    assert len(report.slowest_frames) == 3
+    json.dumps(report.to_dict())
+
+
+def test_profiled_dump(tmp_path: Path) -> None:
+    scenario = example_scenario(number_of_frames=12)
+    dump(scenario, tmp_path / "unprofiled.json")
+
+    with Profiler() as profiler:
+        dump(scenario, tmp_path / "profiled.json")
+    report = profiler.report()
+
+    assert (tmp_path / "profiled.json").read_bytes() == (tmp_path / "unprofiled.json").read_bytes()
+    assert list(report.phases) == ["serialize", "encode", "write"]
+    assert report.sections["frames"]["serialize"].calls == 12
+    assert {t.phase for t in report.slowest_frames} <= {"serialize", "encode"}
+    assert "frames/serialize" in report.format()
+
+
+def test_nested_phases_are_attributed_to_the_enclosing_section() -> None:
+    with Profiler() as profiler:
+        with profiling.phase("deserialize", "frames", "0"):
+            example_scenario(number_of_frames=1)
+    report = profiler.report()
+
+    assert report.phases["validate"].calls > 0
+    assert report.sections["frames"]["validate"].calls == report.phases["validate"].calls
+    assert report.phases["deserialize"].seconds >= report.phases["validate"].seconds
+
+
+def test_profiling_is_only_active_inside_the_context() -> None:
+    profiler = Profiler()
+    with profiler:
+        assert profiling.active_profiler() is profiler
+    assert profiling.active_profiler() is None
+    example_scenario(number_of_frames=1)
+    assert profiler.report().phases == {}
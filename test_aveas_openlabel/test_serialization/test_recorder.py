@@ -0,0 +1,107 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import copy
+import json
+import shutil
+import time
+from pathlib import Path
+
+from uai_openlabel import FrameInterval
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization.recorder import (
+    RECOVERY_SUFFIX,
+    OnlineRecorder,
+    recover,
+)
+from test_aveas_openlabel.example_scenario import (
+    CAR_UID,
+    PEDESTRIAN_UID,
+    example_frame,
+    example_scenario,
+)
+
+
+def _summary_values(openlabel: AveasOpenLabel) -> dict[str, float]:
+    assert openlabel.objects is not None
+    object_data = openlabel.objects[CAR_UID].object_data
+    assert object_data is not None and object_data.num is not None
+    return {str(a.name): float(a.val) for a in object_data.num}
+
+
+def test_recorder_finalizes_objects_and_frame_intervals(tmp_path: Path) -> None:
+    scenario = example_scenario(number_of_frames=1)
+    assert scenario.objects is not None
+    pedestrian = scenario.objects.pop(PEDESTRIAN_UID)
+    scenario.frames = None
+    scenario.frame_intervals = None
+    original_objects = copy.deepcopy((scenario.objects, pedestrian))
+
+    path = tmp_path / "recording.json"
+    with OnlineRecorder(path, scenario, max_pending_frames=2) as recorder:
+        for frame_number in range(10):
+            recorder.record(frame_number, example_frame(frame_number))
+        recorder.add_object(PEDESTRIAN_UID, pedestrian)
+
+    assert (scenario.objects, pedestrian) == original_objects
+
+    assert not Path(f"{path}{RECOVERY_SUFFIX}").exists()
+    openlabel = AveasOpenLabel.from_dict(json.loads(path.read_text()))
+    assert openlabel.frames is not None and len(openlabel.frames) == 10
+    assert openlabel.frame_intervals == [FrameInterval(frame_start=0, frame_end=9)]
+    assert openlabel.objects is not None and set(openlabel.objects) == {CAR_UID, PEDESTRIAN_UID}
+    assert openlabel.objects[PEDESTRIAN_UID].frame_intervals == [FrameInterval(frame_start=0, frame_end=9)]
+    assert _summary_values(openlabel) == {
+        "summary/speed/max": 15.0,
+        "summary/speed/min": 15.0,
+        "summary/accel/max": 0.5,
+        "summary/accel/min": 0.5,
+    }
+
+
+def test_interrupted_recording_can_be_recovered(tmp_path: Path) -> None:
+    scenario = example_scenario(number_of_frames=1)
+    scenario.frames = None
+    scenario.frame_intervals = None
+
+    path = tmp_path / "recording.json"
+    crashed_path = tmp_path / "crashed.json"
+    with OnlineRecorder(path, scenario, flush_interval=0.0) as recorder:
+        for frame_number in range(5):
+            recorder.record(frame_number, example_frame(frame_number))
+
+        deadline = time.monotonic() + 10.0
+        while path.read_text().count("\n") < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Simulate a crash while the sixth frame was being written
+        shutil.copy(path, crashed_path)
+        shutil.copy(f"{path}{RECOVERY_SUFFIX}", f"{crashed_path}{RECOVERY_SUFFIX}")
+        shutil.copy(path, tmp_path / "without_checkpoint.json")
+        with open(crashed_path, "a") as f:
+            f.write(',\n"5": {"frame_properties": {"timest')
+
+    assert recover(crashed_path) == 5
+    assert recover(crashed_path) == 5
+    assert not Path(f"{crashed_path}{RECOVERY_SUFFIX}").exists()
+
+    openlabel = AveasOpenLabel.from_dict(json.loads(crashed_path.read_text()))
+    assert openlabel.frames is not None and list(openlabel.frames) == ["0", "1", "2", "3", "4"]
+    assert openlabel.frame_intervals == [FrameInterval(frame_start=0, frame_end=4)]
+    assert _summary_values(openlabel)["summary/speed/max"] == 15.0
+
+    assert recover(tmp_path / "without_checkpoint.json") == 5
+    without_checkpoint = AveasOpenLabel.from_dict(json.loads((tmp_path / "without_checkpoint.json").read_text()))
+    assert without_checkpoint.objects is None
+    assert without_checkpoint.frame_intervals == openlabel.frame_intervals
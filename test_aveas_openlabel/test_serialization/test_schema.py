@@ -0,0 +1,144 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import importlib.util
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from aveas_openlabel.classifications.car import Car
+from aveas_openlabel.classifications.human_pedestrian import HumanPedestrian
+from aveas_openlabel.metadata import Metadata
+from aveas_openlabel.serialization.compression import dump
+from aveas_openlabel.serialization.schema import (
+    SchemaError,
+    SchemaValidationError,
+    SchemaValidator,
+    _allow_null_literals,
+    _schema_text,
+    json_schema,
+    validator,
+)
+from aveas_openlabel.synthetic import SyntheticScenario
+from test_aveas_openlabel.example_scenario import example_scenario
+
+requires_fastjsonschema = pytest.mark.skipif(
+    importlib.util.find_spec("fastjsonschema") is None, reason="fastjsonschema is not installed"
+)
+
+
+def _document(number_of_frames: int = 5) -> dict[str, Any]:
+    document: dict[str, Any] = json.loads(json.dumps(example_scenario(number_of_frames=number_of_frames).to_dict()))
+    return document
+
+
+def test_schema_is_cached_on_disk(tmp_path: Path) -> None:
+    _schema_text.cache_clear()
+    schema = json_schema(cache_directory=tmp_path)
+    (cached,) = tmp_path.glob("schema-deserialization-*.json")
+    assert cached.name == f"schema-deserialization-{Metadata.__dataclass_fields__['aveas_schema_version'].default}.json"
+    assert json.loads(cached.read_text()) == schema
+
+    _schema_text.cache_clear()
+    cached.write_text(json.dumps({"title": "from disk"}))
+    assert json_schema(cache_directory=tmp_path) == {"title": "from disk"}
+
+    json_schema(cache_directory=tmp_path)["title"] = "modified"
+    assert json_schema(cache_directory=tmp_path) == {"title": "from disk"}
+    _schema_text.cache_clear()
+
+
+def test_null_is_allowed_in_a_copy_of_the_schema() -> None:
+    schema = {
+        "properties": {
+            "type": {"type": ["string", "null"], "enum": ["value"]},
+            "name": {"type": "string", "const": "a"},
+            "attributes": {"anyOf": [{"type": "object"}, {"type": "null"}]},
+        }
+    }
+    original = json.loads(json.dumps(schema))
+
+    assert _allow_null_literals(schema) == {
+        "properties": {
+            "type": {"type": ["string", "null"], "enum": ["value", None]},
+            "name": {"type": "string", "const": "a"},
+            "attributes": {"anyOf": [{"type": "null"}, {"type": "object"}]},
+        }
+    }
+    assert schema == original
+
+
+@requires_fastjsonschema
+@pytest.mark.parametrize("kind", ["deserialization", "serialization"])
+def test_documents_written_by_the_library_are_valid(kind: Any) -> None:
+    schema_validator = validator(kind)
+    assert schema_validator.error(_document()) is None
+    assert schema_validator.is_valid(_document()["openlabel"])
+    synthetic = SyntheticScenario({Car: 2, HumanPedestrian: 1}, number_of_frames=3, seed=1).build()
+    assert schema_validator.error(json.loads(json.dumps(synthetic.to_dict()))) is None
+
+
+@requires_fastjsonschema
+@pytest.mark.parametrize(
+    "modify,expected",
+    [
+        [
+            lambda openlabel: openlabel["metadata"].pop("opendrive"),
+            SchemaError("/metadata", "must contain ['opendrive'] properties"),
+        ],
+        [
+            lambda openlabel: openlabel["frames"]["1"].update(unknown=1),
+            SchemaError("/frames/1", "must not contain {'unknown'} properties"),
+        ],
+        [
+            lambda openlabel: openlabel["frames"]["2"]["objects"]["0"]["object_data"]["num"][0].update(val="fast"),
+            SchemaError("/frames/2/objects/0/object_data/num/0/val", "must be number"),
+        ],
+    ],
+)
+def test_errors_are_located(modify: Any, expected: SchemaError) -> None:
+    document = _document()
+    modify(document["openlabel"])
+
+    assert validator().error(document) == expected
+    assert not validator().is_valid(document)
+    with pytest.raises(SchemaValidationError) as error:
+        validator().validate(document)
+    assert error.value.error == expected
+
+
+@requires_fastjsonschema
+def test_check_file(tmp_path: Path) -> None:
+    dump(example_scenario(number_of_frames=3), tmp_path / "scenario.json.gz")
+    assert validator().check_file(tmp_path / "scenario.json.gz") is None
+
+
+@requires_fastjsonschema
+def test_documents_are_not_modified() -> None:
+    schema_validator = SchemaValidator(
+        {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {"tuple": {"type": "array", "items": [{"type": "integer"}, {"enum": ["a", "b"]}]}},
+            "required": ["tuple"],
+            "additionalProperties": {"type": "string", "default": "inserted"},
+        }
+    )
+    document = {"tuple": [0, "a"]}
+
+    assert schema_validator.is_valid(document)
+    assert document == {"tuple": [0, "a"]}
+    assert schema_validator.error({"tuple": [0, "c"]}) == SchemaError("/tuple/1", "must be one of ['a', 'b']")
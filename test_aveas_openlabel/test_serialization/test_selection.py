@@ -0,0 +1,114 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+import uuid
+from pathlib import Path
+from typing import Union
+
+import pytest
+
+from aveas_openlabel.serialization.compression import load
+from aveas_openlabel.serialization.sections import serialize_section
+from aveas_openlabel.serialization.selection import Selection
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+@pytest.fixture
+def scenario_path(tmp_path: Path) -> Path:
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(example_scenario(number_of_frames=10).to_dict()))
+    return path
+
+
+def test_frame_range_adjusts_frame_intervals(scenario_path: Path) -> None:
+    loaded = load(scenario_path, selection=Selection(frame_range=(2, 5)))
+
+    assert loaded.frames is not None and list(loaded.frames) == ["2", "3", "4", "5"]
+    assert serialize_section("frame_intervals", loaded.frame_intervals) == [{"frame_start": 2, "frame_end": 5}]
+    assert loaded.events is not None
+    assert serialize_section("frame_intervals", next(iter(loaded.events.values())).frame_intervals) == [
+        {"frame_start": 2, "frame_end": 3}
+    ]
+
+
+def test_time_range_drops_events_outside_of_it(scenario_path: Path) -> None:
+    loaded = load(scenario_path, selection=Selection(time_range=(0.2, 0.3)))  # frames are 0.04 s apart
+
+    assert loaded.frames is not None and list(loaded.frames) == ["5", "6", "7"]
+    assert loaded.events == {}
+
+
+def test_event_intervals_are_clipped_to_the_selected_frames(tmp_path: Path) -> None:
+    serialized = example_scenario(number_of_frames=10).to_dict()
+    del serialized["openlabel"]["frames"]["2"]
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(serialized))
+
+    loaded = load(path, selection=Selection(frame_range=(0, 9)))
+
+    assert loaded.events is not None
+    assert serialize_section("frame_intervals", next(iter(loaded.events.values())).frame_intervals) == [
+        {"frame_start": 1, "frame_end": 1},
+        {"frame_start": 3, "frame_end": 3},
+    ]
+
+
+def test_object_filters_keep_an_empty_role_b_attribute(scenario_path: Path) -> None:
+    loaded = load(scenario_path, selection=Selection(object_types=["vehicle"]))
+
+    assert loaded.events is not None
+    assert [list(vec.val) for event in loaded.events.values() for vec in event.event_data.vec] == [[]]
+
+
+@pytest.mark.parametrize(
+    "selection,object_uids,has_event",
+    [
+        [Selection(object_types=["vehicle"]), ["0"], True],
+        [Selection(object_types=["human/pedestrian"]), ["1"], False],
+        [Selection(object_uids=["0", "1"], object_types=["other"]), [], False],
+        [Selection(object_uids=["1"]), ["1"], False],
+    ],
+)
+def test_object_filters(scenario_path: Path, selection: Selection, object_uids: list[str], has_event: bool) -> None:
+    loaded = load(scenario_path, selection=selection)
+
+    assert loaded.objects is not None and list(loaded.objects) == object_uids
+    assert loaded.frames is not None and len(loaded.frames) == 10
+    assert all(list(frame.objects or {}) == object_uids for frame in loaded.frames.values())
+    assert loaded.events is not None and bool(loaded.events) == has_event
+
+
+def test_selection_with_selected_sections(scenario_path: Path) -> None:
+    loaded = load(scenario_path, sections=["objects"], selection=Selection(object_types=["vehicle"], frame_range=(0, 3)))
+
+    assert loaded.frames is None and loaded.frame_intervals is None
+    assert loaded.objects is not None and list(loaded.objects) == ["0"]
+
+
+def test_time_range_with_non_numeric_frame_uids(tmp_path: Path) -> None:
+    serialized = example_scenario(number_of_frames=10).to_dict()
+    frames = serialized["openlabel"]["frames"]
+    serialized["openlabel"]["frames"] = {_uuid(uid): frame for uid, frame in frames.items()}
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(serialized))
+
+    loaded = load(path, selection=Selection(time_range=(0.2, 0.3)))
+
+    assert loaded.frames is not None and list(loaded.frames) == [_uuid(5), _uuid(6), _uuid(7)]
+    assert loaded.events == {}
+
+
+def _uuid(number: Union[int, str]) -> str:
+    return str(uuid.UUID(int=int(number)))
@@ -0,0 +1,90 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+from uai_openlabel import Uid
+
+from aveas_openlabel.serialization.compression import Compression
+from aveas_openlabel.serialization.sharding import (
+    ShardedScenario,
+    load_sharded,
+    write_sharded,
+)
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_write_and_load_all_shards(tmp_path: Path, max_workers: int) -> None:
+    scenario = example_scenario(number_of_frames=25)
+    shards = write_sharded(scenario, tmp_path, frames_per_shard=10, max_workers=max_workers)
+
+    assert [(shard.frame_start, shard.frame_end, shard.frame_count) for shard in shards] == [
+        (0, 9, 10),
+        (10, 19, 10),
+        (20, 24, 5),
+    ]
+    assert json.dumps(load_sharded(tmp_path).to_dict()) == json.dumps(scenario.to_dict())
+
+
+def test_only_overlapping_shards_are_opened(tmp_path: Path) -> None:
+    write_sharded(example_scenario(number_of_frames=25), tmp_path, frames_per_shard=10, compression=Compression.GZIP)
+    (tmp_path / "frames-00000.json.gz").unlink()
+    scenario = ShardedScenario(tmp_path)
+
+    by_frames = scenario.load(frame_range=(12, 21))
+    assert by_frames.frames is not None and list(by_frames.frames) == [str(i) for i in range(12, 22)]
+    assert by_frames.frame_intervals is not None
+    assert [(i.frame_start, i.frame_end) for i in by_frames.frame_intervals] == [(12, 21)]
+
+    # example frames are 0.04 s apart
+    by_time = scenario.load(time_range=(0.5, 0.7))
+    assert by_time.frames is not None and list(by_time.frames) == [str(i) for i in range(13, 18)]
+    assert [shard.file for shard in scenario.shards_for(time_range=(0.5, 0.7))] == ["frames-00001.json.gz"]
+
+
+def test_frame_uids_are_kept(tmp_path: Path) -> None:
+    scenario = example_scenario(number_of_frames=3)
+    assert scenario.frames is not None
+    frames = list(scenario.frames.values())
+    scenario.frames = {Uid("7"): frames[0], Uid("007"): frames[1], Uid("5f0c2a1e-8d3b-4c7a-9e6f-1b2c3d4e5f60"): frames[2]}
+    scenario.frame_intervals = None
+    write_sharded(scenario, tmp_path / "mixed", frames_per_shard=2)
+
+    loaded = load_sharded(tmp_path / "mixed")
+    assert loaded.frames is not None and list(loaded.frames) == ["7", "007", "5f0c2a1e-8d3b-4c7a-9e6f-1b2c3d4e5f60"]
+    assert list(load_sharded(tmp_path / "mixed", frame_range=(7, 7)).frames or {}) == ["7", "007"]
+
+    scenario.frames = {Uid("007"): frames[0], Uid("7"): frames[1], Uid("6"): frames[2]}
+    write_sharded(scenario, tmp_path / "numeric", frames_per_shard=2)
+    assert list(load_sharded(tmp_path / "numeric").frames or {}) == ["6", "007", "7"]
+
+
+def test_rewriting_removes_stale_shards(tmp_path: Path) -> None:
+    write_sharded(example_scenario(number_of_frames=25), tmp_path, frames_per_shard=10)
+    write_sharded(example_scenario(number_of_frames=5), tmp_path, frames_per_shard=10)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["frames-00000.json", "manifest.json"]
+    assert len(load_sharded(tmp_path).frames or {}) == 5
+
+
+def test_scenario_without_frames(tmp_path: Path) -> None:
+    scenario = example_scenario(number_of_frames=1)
+    scenario.frames = None
+    write_sharded(scenario, tmp_path)
+
+    assert ShardedScenario(tmp_path).shards == []
+    assert load_sharded(tmp_path).frames is None
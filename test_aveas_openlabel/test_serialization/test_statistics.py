@@ -0,0 +1,44 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+from typing import Any
+
+from uai_openlabel import FrameInterval, ObjectUid
+
+from aveas_openlabel.serialization.statistics import (
+    ObjectStatistics,
+    add_frame_to_statistics,
+)
+
+
+def _frame(speed: float, acceleration: float) -> dict[str, Any]:
+    vec = [{"name": "velocity", "val": [speed, 0.0, 0.0]}, {"name": "acceleration", "val": [acceleration, 0.0, 0.0]}]
+    return {"objects": {"1": {"object_data": {"vec": vec}}}}
+
+
+def test_statistics_are_collected_over_frames() -> None:
+    statistics: dict[ObjectUid, ObjectStatistics] = {}
+    for frame_uid, speed, acceleration in [("0", 3.0, 0.5), ("1", 5.0, -1.0), ("3", 4.0, 0.0)]:
+        add_frame_to_statistics(statistics, frame_uid, _frame(speed, acceleration))
+
+    assert statistics == {
+        ObjectUid("1"): ObjectStatistics(
+            frame_intervals=[FrameInterval(frame_start=0, frame_end=1), FrameInterval(frame_start=3, frame_end=3)],
+            speed_min=3.0,
+            speed_max=5.0,
+            accel_min=-1.0,
+            accel_max=0.5,
+        )
+    }
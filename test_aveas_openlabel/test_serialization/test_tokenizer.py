@@ -0,0 +1,49 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+
+import pytest
+
+from aveas_openlabel.serialization.tokenizer import (
+    MalformedDocumentError,
+    scan_document,
+)
+
+
+def test_strings_with_brackets_and_escapes_are_skipped() -> None:
+    document = {
+        "openlabel": {
+            "metadata": {"name": 'a "quoted" {[ name', "list": [1, {"x": "]}"}]},
+            "frames": {"0": {"note": '\\"}'}, "1": {}},
+            "frame_intervals": None,
+        }
+    }
+    data = json.dumps(document, indent=1).encode()
+
+    sections, frames = scan_document(data)
+    assert {name: json.loads(data[start:end]) for name, (start, end) in sections.items()} == document["openlabel"]
+    assert {uid: json.loads(data[start:end]) for uid, (start, end) in frames.items()} == document["openlabel"]["frames"]
+    assert scan_document(data, frames=False)[1] == {}
+
+
+def test_document_without_root_key() -> None:
+    sections, _ = scan_document(b'{"metadata": {}, "objects": null}')
+    assert list(sections) == ["metadata", "objects"]
+
+
+@pytest.mark.parametrize("data", [b"", b"[]", b'{"openlabel": {"frames": {"0": {}}'])
+def test_malformed_documents(data: bytes) -> None:
+    with pytest.raises(MalformedDocumentError):
+        scan_document(data)
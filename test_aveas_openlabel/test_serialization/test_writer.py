@@ -0,0 +1,78 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import io
+import json
+
+import pytest
+from uai_openlabel import FrameInterval
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization.sections import frame_intervals_from_uids
+from aveas_openlabel.serialization.writer import (
+    DuplicateFrameError,
+    StreamingWriter,
+    WriterStateError,
+)
+from test_aveas_openlabel.example_scenario import example_frame, example_scenario
+
+
+@pytest.mark.parametrize("exclude_none", [False, True])
+def test_streamed_document_equals_to_dict(exclude_none: bool) -> None:
+    scenario = example_scenario(number_of_frames=5)
+    frames = scenario.frames
+    assert frames is not None
+    scenario.frames = None
+
+    buffer = io.StringIO()
+    with StreamingWriter(buffer, scenario, exclude_none=exclude_none) as writer:
+        writer.write_frames((uid, frame) for uid, frame in frames.items())
+    assert writer.frame_count == 5
+
+    scenario.frames = frames
+    assert json.loads(buffer.getvalue()) == json.loads(json.dumps(scenario.to_dict(exclude_none=exclude_none)))
+
+
+def test_streamed_document_is_readable_and_has_computed_frame_intervals() -> None:
+    buffer = io.StringIO()
+    with StreamingWriter(buffer, AveasOpenLabel.minimum_example(), exclude_none=True, compute_frame_intervals=True) as writer:
+        for frame_number in [0, 1, 2, 5, 6]:
+            writer.write_frame(frame_number, example_frame(frame_number))
+
+    openlabel = AveasOpenLabel.from_dict(json.loads(buffer.getvalue()))
+    assert openlabel.frames is not None
+    assert list(openlabel.frames.keys()) == ["0", "1", "2", "5", "6"]
+    assert openlabel.frame_intervals == [
+        FrameInterval(frame_start=0, frame_end=2),
+        FrameInterval(frame_start=5, frame_end=6),
+    ]
+
+
+def test_writer_rejects_duplicate_frames_and_writes_after_close() -> None:
+    writer = StreamingWriter(io.StringIO(), AveasOpenLabel.minimum_example())
+    writer.write_frame(0, example_frame(0))
+    with pytest.raises(DuplicateFrameError):
+        writer.write_frame("0", example_frame(0))
+
+    writer.close()
+    with pytest.raises(WriterStateError):
+        writer.write_frame(1, example_frame(1))
+
+
+def test_frame_intervals_from_uids() -> None:
+    assert frame_intervals_from_uids([]) == []
+    assert frame_intervals_from_uids(["3", "1", "2", "10"]) == [
+        FrameInterval(frame_start=1, frame_end=3),
+        FrameInterval(frame_start=10, frame_end=10),
+    ]
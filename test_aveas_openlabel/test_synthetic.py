@@ -0,0 +1,85 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from uai_openlabel import Uid
+
+from aveas_openlabel.classifications.car import Car
+from aveas_openlabel.classifications.human_pedestrian import HumanPedestrian
+from aveas_openlabel.classifications.registry import (
+    CLASSIFICATIONS,
+    UnknownClassificationError,
+    attribute_classes,
+)
+from aveas_openlabel.serialization.compression import load
+from aveas_openlabel.synthetic import SyntheticScenario
+
+
+def test_written_scenario_equals_built_scenario(tmp_path: Path) -> None:
+    scenario = SyntheticScenario({Car: 3, HumanPedestrian: 2}, number_of_frames=20, seed=3)
+    scenario.write(tmp_path / "scenario.json.gz")
+
+    assert json.dumps(load(tmp_path / "scenario.json.gz").to_dict()) == json.dumps(scenario.build().to_dict())
+
+
+def test_scenarios_are_reproducible(tmp_path: Path) -> None:
+    for name, seed in [("a.json", 1), ("b.json", 1), ("c.json", 2)]:
+        SyntheticScenario({Car: 2}, number_of_frames=5, seed=seed).write(tmp_path / name)
+
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+    assert (tmp_path / "a.json").read_bytes() != (tmp_path / "c.json").read_bytes()
+
+
+def _attribute_names(object_data: Any) -> set[str]:
+    return {a.name for field in ("boolean", "cuboid", "num", "text", "vec") for a in getattr(object_data, field) or []}
+
+
+def _expected_attribute_names(classification: type) -> set[str]:
+    return {a.__dataclass_fields__["name"].default for _, a in attribute_classes(classification)}  # type: ignore[attr-defined]
+
+
+def test_every_attribute_of_the_classification_matrix_is_filled() -> None:
+    openlabel = SyntheticScenario({classification: 1 for classification in CLASSIFICATIONS}, number_of_frames=3).build()
+    assert openlabel.objects is not None and openlabel.frames is not None
+    first_frame: Any = openlabel.frames[Uid("0")]
+
+    for (classification, in_frame_class), (object_uid, scenario_object) in zip(
+        CLASSIFICATIONS.items(), openlabel.objects.items()
+    ):
+        assert _attribute_names(scenario_object.object_data) == _expected_attribute_names(classification)
+        assert _attribute_names(first_frame.objects[object_uid].object_data) == _expected_attribute_names(in_frame_class)
+
+
+def test_trajectories_are_consistent() -> None:
+    openlabel: Any = SyntheticScenario({Car: 1}, number_of_frames=50, frame_rate=10.0).build()
+
+    positions, speeds = [], []
+    for frame in openlabel.frames.values():
+        object_data = frame.objects["0"].object_data
+        positions.append(object_data.cuboid[0].val[0])
+        speeds.append(next(a.val[0] for a in object_data.vec if a.name == "velocity"))
+    for i in range(1, len(positions)):
+        assert positions[i] - positions[i - 1] == pytest.approx((speeds[i] + speeds[i - 1]) / 2 * 0.1, abs=0.01)
+
+    summary = {a.name: a.val for a in openlabel.objects["0"].object_data.num}
+    assert summary["summary/speed/max"] == max(speeds)
+
+
+def test_unknown_classification() -> None:
+    with pytest.raises(UnknownClassificationError):
+        SyntheticScenario({int: 1})  # type: ignore[dict-item]
@@ -0,0 +1,161 @@
+# Copyright © 2024 understandAI GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify,
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from typing import Any
+
+import pytest
+from apischema.json_schema import deserialization_schema, serialization_schema
+from uai_openlabel import ThreeDBoundingBoxEuler, ThreeDBoundingBoxQuaternion
+
+from aveas_openlabel import AveasOpenLabel
+from aveas_openlabel.serialization.compression import dump, load
+from aveas_openlabel.serialization.sections import serialize_frame
+from aveas_openlabel.serialization.writer import StreamingWriter
+from aveas_openlabel.vector_buffers import (
+    VectorBuffer,
+    VectorStore,
+    VectorView,
+    unpack,
+)
+from test_aveas_openlabel.example_scenario import example_scenario
+
+
+def _json(value: Any) -> Any:
+    return json.loads(json.dumps(value))
+
+
+def test_pack_moves_vectors_into_buffers() -> None:
+    openlabel = example_scenario(number_of_frames=5)
+    expected = openlabel.to_dict()
+    store = VectorStore.pack(openlabel)
+
+    assert {name: store[name].width for name in store} == {
+        "bounding_box": 9,
+        "velocity": 6,
+        "acceleration": 6,
+        "open_drive/local_road_coordinates": 2,
+    }
+    boxes = store["bounding_box"]
+    assert len(boxes) == sum(len(frame.objects or {}) for frame in (openlabel.frames or {}).values())
+    assert len(boxes.values) == 9 * len(boxes)
+
+    frame_uid, object_uid = boxes.frame_uids[3], boxes.object_uids[3]
+    (box,) = openlabel.frames[frame_uid].objects[object_uid].object_data.cuboid or ()  # type: ignore[index]
+    assert isinstance(box.val, VectorView)
+    assert box.val == boxes.row(3)
+    assert box.val[0] == boxes.column(0)[3]
+
+    assert openlabel.to_dict() == expected
+    assert isinstance(box.val, VectorView)
+    assert unpack(openlabel).to_dict() == expected
+
+
+def test_pack_a_loaded_document() -> None:
+    expected = _json(example_scenario(number_of_frames=3).to_dict())
+    openlabel = AveasOpenLabel.from_dict(expected)
+    store = VectorStore.pack(openlabel)
+
+    assert len(store["velocity"]) > 0
+    assert _json(openlabel.to_dict()) == expected
+    assert _json(openlabel.to_dict(exclude_none=True)) == _json(AveasOpenLabel.from_dict(expected).to_dict(exclude_none=True))
+
+
+def test_dump_a_packed_document(tmp_path: Any) -> None:
+    openlabel = example_scenario(number_of_frames=3)
+    expected = _json(openlabel.to_dict())
+    VectorStore.pack(openlabel)
+
+    dump(openlabel, tmp_path / "scenario.json.gz")
+
+    assert _json(load(tmp_path / "scenario.json.gz").to_dict()) == expected
+    object_in_frame = next(iter((next(iter((openlabel.frames or {}).values())).objects or {}).values()))
+    assert isinstance(object_in_frame.object_data.cuboid[0].val, VectorView)  # type: ignore[index]
+
+
+@pytest.mark.parametrize("cuboid_class", [ThreeDBoundingBoxEuler, ThreeDBoundingBoxQuaternion])
+def test_schema_of_serialized_cuboids_is_unchanged(cuboid_class: type) -> None:
+    # the serializer of cuboids that accepts views must keep the tuple schema of val, which deserialization still uses
+    schema = serialization_schema(cuboid_class)
+    assert schema["properties"]["val"] == deserialization_schema(cuboid_class)["properties"]["val"]
+    assert list(schema["properties"]) == ["val", "attributes", "coordinate_system", "name"]
+
+
+def test_serialize_frame_for_streaming_writers(tmp_path: Any) -> None:
+    openlabel = example_scenario(number_of_frames=3)
+    expected = _json(openlabel.to_dict())
+    frames = openlabel.frames or {}
+    openlabel.frames = None
+    store = VectorStore()
+
+    with open(tmp_path / "scenario.json", "w") as f, StreamingWriter(f, openlabel) as writer:
+        for frame_uid, frame in frames.items():
+            writer.write_serialized_frame(frame_uid, serialize_frame(store.pack_frame(frame_uid, frame)))
+
+    assert json.loads((tmp_path / "scenario.json").read_text()) == expected
+    object_in_frame = next(iter((next(iter(frames.values())).objects or {}).values()))
+    assert isinstance(object_in_frame.object_data.cuboid[0].val, VectorView)  # type: ignore[index]
+
+
+def test_views_behave_like_tuples() -> None:
+    buffer = VectorBuffer("velocity", 3)
+    first = buffer.append("0", "1", (1.0, 2.0, 3.0))
+    second = buffer.append("1", "1", (4.0, 5.0, 6.0))
+
+    assert first == (1.0, 2.0, 3.0) and (4.0, 5.0, 6.0) == second
+    assert first != second and first != (1.0, 2.0)
+    assert list(second) == [4.0, 5.0, 6.0] and len(second) == 3
+    assert second[-1] == 6.0 and second[1:] == (5.0, 6.0)
+    assert tuple(reversed(first)) == (3.0, 2.0, 1.0) and 2.0 in first and first.index(3.0) == 2
+    assert repr(first) == "VectorView([1.0, 2.0, 3.0])"
+    with pytest.raises(IndexError):
+        first[3]
+    with pytest.raises(TypeError):
+        hash(first)
+
+    second[0] = 7.0
+    assert buffer.column(0) == buffer.values[::3] and list(buffer.column(0)) == [1.0, 7.0]
+    assert buffer.row(-1) == (7.0, 5.0, 6.0)
+    with pytest.raises(ValueError):
+        buffer.append("2", "1", (1.0, 2.0))
+
+
+def test_only_float_vectors_of_one_length_are_packed() -> None:
+    openlabel = example_scenario(number_of_frames=1)
+    frame = next(iter((openlabel.frames or {}).values()))
+    objects = list((frame.objects or {}).values())
+    vectors = objects[-1].object_data.vec  # the first vectors of a name determine the length of its buffer
+    assert vectors is not None
+    vectors[0].val = ("a", "b")
+    vectors[1].val = (1.0,)
+
+    store = VectorStore.pack(openlabel)
+
+    assert vectors[0].val == ("a", "b") and vectors[1].val == (1.0,)
+    assert [len(store[str(vectors[i].name)]) for i in range(3)] == [len(objects) - 1, len(objects) - 1, len(objects)]
+
+
+def test_to_numpy_shares_the_buffer() -> None:
+    numpy = pytest.importorskip("numpy")
+    buffer = VectorBuffer("velocity", 2)
+    view = buffer.append("0", "1", (1.0, 2.0))
+    buffer.append("1", "1", (3.0, 4.0))
+
+    values = buffer.to_numpy()
+    assert values.shape == (2, 2)
+    values[0, 1] = 5.0
+    assert view == (1.0, 5.0)
+    assert numpy.array_equal(values[:, 0], buffer.column(0))
+    with pytest.raises(BufferError):
+        buffer.append("2", "1", (5.0, 6.0))